@@ -293,7 +293,7 @@ class HealthmateHealthManagerStack(Stack):
             handler="user.handler.lambda_handler",
             code=lambda_.Code.from_asset(lambda_code_path),
             timeout=Duration.seconds(30),
-            memory_size=256,
+            memory_size=1769,  # 1 vCPU相当。boto3の署名・リクエスト変換（CPU律速）を短縮
             environment={
                 "USERS_TABLE_NAME": self.users_table.table_name,
                 "HEALTHMATE_ENV": self.current_environment,
@@ -548,11 +548,12 @@ class HealthmateHealthManagerStack(Stack):
             handler="journal.handler.lambda_handler",
             code=lambda_.Code.from_asset(lambda_code_path),
             timeout=Duration.seconds(30),
-            memory_size=256,
+            memory_size=1024,  # vCPU割り当てを増やし、boto3の変換処理・コールドスタートを短縮
             environment={
                 "JOURNALS_TABLE_NAME": self.journals_table.table_name,
                 "HEALTHMATE_ENV": self.current_environment,
                 "LOG_LEVEL": self.log_controller.get_log_level(),
+                "EAGER_WARM": "1",  # INITフェーズでDynamoDB接続を確立
             },
             log_group=journal_log_group,  # ロググループを明示的に指定
         )
@@ -560,6 +561,25 @@ class HealthmateHealthManagerStack(Stack):
         # JournalLambdaにDynamoDBテーブルへのアクセス権限を付与
         self.journals_table.grant_read_write_data(self.journal_lambda)
 
+        # INITフェーズのウォームアップ（DescribeEndpoints）用の権限を付与
+        self.journal_lambda.add_to_role_policy(
+            iam.PolicyStatement(
+                effect=iam.Effect.ALLOW,
+                actions=["dynamodb:DescribeEndpoints"],
+                resources=["*"],  # DescribeEndpointsはリソースレベルの指定不可
+            )
+        )
+
+        # JournalLambdaのエイリアス（本番環境のみProvisioned Concurrencyでコールドスタートを回避）
+        # Gatewayはこのエイリアス経由で呼び出す
+        self.journal_lambda_alias = lambda_.Alias(
+            self,
+            "JournalLambdaAlias",
+            alias_name="live",
+            version=self.journal_lambda.current_version,
+            provisioned_concurrent_executions=2 if self.current_environment == "prod" else None,
+        )
+
 
 
         # ========================================
@@ -596,7 +616,7 @@ class HealthmateHealthManagerStack(Stack):
                     self.activity_lambda.function_arn,
                     self.body_measurement_lambda.function_arn,
                     self.health_concern_lambda.function_arn,
-                    self.journal_lambda.function_arn,
+                    self.journal_lambda_alias.function_arn,
                 ],
             )
         )
@@ -820,7 +840,7 @@ class HealthmateHealthManagerStack(Stack):
             target_configuration=bedrockagentcore.CfnGatewayTarget.TargetConfigurationProperty(
                 mcp=bedrockagentcore.CfnGatewayTarget.McpTargetConfigurationProperty(
                     lambda_=bedrockagentcore.CfnGatewayTarget.McpLambdaTargetConfigurationProperty(
-                        lambda_arn=self.journal_lambda.function_arn,
+                        lambda_arn=self.journal_lambda_alias.function_arn,
                         tool_schema=bedrockagentcore.CfnGatewayTarget.ToolSchemaProperty(
                             inline_payload=journal_mcp_schema
                         )
@@ -871,7 +891,7 @@ class HealthmateHealthManagerStack(Stack):
             action="lambda:InvokeFunction",
         )
 
-        self.journal_lambda.add_permission(
+        self.journal_lambda_alias.add_permission(
             "AllowAgentCoreGatewayInvoke",
             principal=iam.ServicePrincipal("bedrock-agentcore.amazonaws.com"),
             action="lambda:InvokeFunction",
@@ -15,7 +15,6 @@ AgentCore Gateway（MCP）から呼び出され、DynamoDBで活動記録のCRUD
 要件: 要件5-8（活動記録管理）、要件11（データ永続化）、要件12（エラーハンドリング）、要件13（ロギング）
 """
 
-import json
 import os
 import uuid
 import logging
@@ -24,6 +23,8 @@ from typing import Any, Dict, List, Literal
 import boto3
 from botocore.exceptions import ClientError
 
+from shared.crud import json_dumps
+
 # ログ設定
 log_level = os.environ.get("LOG_LEVEL", "INFO")
 logger = logging.getLogger(__name__)
@@ -75,7 +76,8 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Returns:
         MCP形式のレスポンス
     """
-    logger.debug(f"Received event: {json.dumps(event, default=str)}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Received event: %s", json_dumps(event))
 
     try:
         # AgentCore Gateway（MCP）形式のイベントを処理
@@ -190,9 +192,11 @@ def add_activities(parameters: Dict[str, Any]) -> Dict[str, Any]:
 
     now = datetime.now(timezone.utc).isoformat()
 
+    key = {"userId": user_id, "date": date}
+
     try:
         # 既存のレコードを取得
-        response = table.get_item(Key={"userId": user_id, "date": date})
+        response = table.get_item(Key=key)
 
         if "Item" in response:
             # 既存のレコードがある場合、活動リストに追加
@@ -200,7 +204,7 @@ def add_activities(parameters: Dict[str, Any]) -> Dict[str, Any]:
             existing_activities.extend(activities)
 
             table.update_item(
-                Key={"userId": user_id, "date": date},
+                Key=key,
                 UpdateExpression="SET activities = :activities, updatedAt = :updatedAt",
                 ExpressionAttributeValues={
                     ":activities": existing_activities,
@@ -277,9 +281,11 @@ def update_activity(parameters: Dict[str, Any]) -> Dict[str, Any]:
 
     now = datetime.now(timezone.utc).isoformat()
 
+    key = {"userId": user_id, "date": date}
+
     try:
         # 指定された日付のレコードを取得
-        response = table.get_item(Key={"userId": user_id, "date": date})
+        response = table.get_item(Key=key)
         
         if "Item" not in response:
             raise ValueError(f"No activities found for user: {user_id} on date: {date}")
@@ -311,7 +317,7 @@ def update_activity(parameters: Dict[str, Any]) -> Dict[str, Any]:
         
         # 更新されたリストを保存
         table.update_item(
-            Key={"userId": user_id, "date": date},
+            Key=key,
             UpdateExpression="SET activities = :activities, updatedAt = :updatedAt",
             ExpressionAttributeValues={
                 ":activities": activities,
@@ -383,14 +389,16 @@ def update_activities(parameters: Dict[str, Any]) -> Dict[str, Any]:
 
     now = datetime.now(timezone.utc).isoformat()
 
+    key = {"userId": user_id, "date": date}
+
     try:
         # 既存のレコードを取得
-        response = table.get_item(Key={"userId": user_id, "date": date})
+        response = table.get_item(Key=key)
 
         if "Item" in response:
             # 既存のレコードがある場合、活動リストを完全に置き換え
             table.update_item(
-                Key={"userId": user_id, "date": date},
+                Key=key,
                 UpdateExpression="SET activities = :activities, updatedAt = :updatedAt",
                 ExpressionAttributeValues={
                     ":activities": activities,
@@ -459,9 +467,11 @@ def delete_activity(parameters: Dict[str, Any]) -> Dict[str, Any]:
 
     now = datetime.now(timezone.utc).isoformat()
 
+    key = {"userId": user_id, "date": date}
+
     try:
         # 指定された日付のレコードを取得
-        response = table.get_item(Key={"userId": user_id, "date": date})
+        response = table.get_item(Key=key)
         
         if "Item" not in response:
             raise ValueError(f"No activities found for user: {user_id} on date: {date}")
@@ -485,12 +495,12 @@ def delete_activity(parameters: Dict[str, Any]) -> Dict[str, Any]:
         
         if len(activities) == 0:
             # すべての活動が削除された場合、レコード自体を削除
-            table.delete_item(Key={"userId": user_id, "date": date})
+            table.delete_item(Key=key)
             logger.debug(f"Deleted entire record (last activity removed)")
         else:
             # 更新されたリストを保存
             table.update_item(
-                Key={"userId": user_id, "date": date},
+                Key=key,
                 UpdateExpression="SET activities = :activities, updatedAt = :updatedAt",
                 ExpressionAttributeValues={
                     ":activities": activities,
@@ -539,8 +549,10 @@ def get_activities(parameters: Dict[str, Any]) -> Dict[str, Any]:
 
     logger.debug(f"Retrieving activities for user: {user_id} on date: {date}")
 
+    key = {"userId": user_id, "date": date}
+
     try:
-        response = table.get_item(Key={"userId": user_id, "date": date})
+        response = table.get_item(Key=key)
 
         if "Item" in response:
             activities = response["Item"].get("activities", [])
@@ -622,6 +634,7 @@ def get_activities_in_range(parameters: Dict[str, Any]) -> Dict[str, Any]:
             }
         )
 
+        # Queryの結果はソートキー（date）の昇順で返るため、再ソートは不要
         daily_activities = []
         total_activities = 0
         for item in response.get("Items", []):
@@ -633,9 +646,6 @@ def get_activities_in_range(parameters: Dict[str, Any]) -> Dict[str, Any]:
             })
             total_activities += len(activities)
 
-        # 日付順にソート
-        daily_activities.sort(key=lambda x: x["date"])
-
         logger.info(f"Retrieved activities for user: {user_id} - {len(daily_activities)} days, {total_activities} total activities")
         return {
             "success": True,
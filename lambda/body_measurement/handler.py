@@ -21,7 +21,7 @@ import json
 import os
 import logging
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Optional
 from decimal import Decimal
 import boto3
 from botocore.exceptions import ClientError
@@ -47,6 +47,16 @@ dynamodb = boto3.resource('dynamodb', config=config)
 table_name = os.environ.get('BODY_MEASUREMENTS_TABLE_NAME', 'healthmate-body-measurements')
 table = dynamodb.Table(table_name)
 
+# 低レベルクライアント（再計算用の読み取りで属性値の自動変換を省くため）
+# ※ dynamodb.meta.client はリソースの型変換が登録されているため別途作成する
+dynamodb_client = boto3.client('dynamodb', config=config)
+
+# 測定タイプ
+MEASUREMENT_TYPES = ('weight', 'height', 'body_fat_percentage')
+
+# 再計算時に両端から探索する際の1ページあたりの評価件数
+RECALC_QUERY_PAGE_SIZE = 10
+
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
@@ -292,14 +302,10 @@ def update_latest_oldest_records(user_id: str, new_measurement: Dict[str, Any],
         measurement_time: 測定時刻
     """
     try:
-        # 既存の測定記録があるかチェック
-        existing_measurements = get_all_user_measurements(user_id)
-        regular_measurements = [
-            r for r in existing_measurements 
-            if not r['measurementId'].endswith('#latest') and not r['measurementId'].endswith('#oldest')
-        ]
+        # 既存の測定記録があるかチェック（今追加したレコードを含むため2件目まで確認すれば十分）
+        regular_measurement_count = count_regular_measurements(user_id, up_to=2)
         
-        is_first_measurement = len(regular_measurements) <= 1  # 今追加したレコードを含む
+        is_first_measurement = regular_measurement_count <= 1
         
         if is_first_measurement:
             # 初回記録の場合、Latest と Oldest に同じデータを設定
@@ -376,7 +382,7 @@ def update_latest_record(user_id: str, new_measurement: Dict[str, Any], measurem
             IndexName='RecordTypeIndex',
             KeyConditionExpression='userId = :pk AND record_type = :rt',
             ExpressionAttributeValues={
-                ':pk': f'{user_id}',
+                ':pk': user_id,
                 ':rt': 'latest'
             }
         )
@@ -386,7 +392,7 @@ def update_latest_record(user_id: str, new_measurement: Dict[str, Any], measurem
         if not current_latest:
             # Latest レコードが存在しない場合は新規作成
             latest_record = {
-                'userId': f'{user_id}',
+                'userId': user_id,
                 'measurementId': 'MEASUREMENT#latest',
                 'record_type': 'latest',
                 **new_measurement,
@@ -441,7 +447,7 @@ def update_oldest_record(user_id: str, new_measurement: Dict[str, Any], measurem
             IndexName='RecordTypeIndex',
             KeyConditionExpression='userId = :pk AND record_type = :rt',
             ExpressionAttributeValues={
-                ':pk': f'{user_id}',
+                ':pk': user_id,
                 ':rt': 'oldest'
             }
         )
@@ -451,7 +457,7 @@ def update_oldest_record(user_id: str, new_measurement: Dict[str, Any], measurem
         if not current_oldest:
             # Oldest レコードが存在しない場合は新規作成
             oldest_record = {
-                'userId': f'{user_id}',
+                'userId': user_id,
                 'measurementId': 'MEASUREMENT#oldest',
                 'record_type': 'oldest',
                 **new_measurement,
@@ -505,19 +511,171 @@ def get_all_user_measurements(user_id: str) -> list:
         測定記録のリスト
     """
     try:
-        response = table.query(
-            KeyConditionExpression='userId = :pk',
-            ExpressionAttributeValues={
-                ':pk': f'{user_id}'
+        query_params = {
+            'KeyConditionExpression': 'userId = :pk',
+            'ExpressionAttributeValues': {
+                ':pk': user_id
             }
-        )
-        return response['Items']
+        }
+        
+        # 1MBを超えるパーティションでも全件取得できるようページングする
+        items = []
+        while True:
+            response = table.query(**query_params)
+            items.extend(response['Items'])
+            
+            last_evaluated_key = response.get('LastEvaluatedKey')
+            if not last_evaluated_key:
+                return items
+            query_params['ExclusiveStartKey'] = last_evaluated_key
         
     except Exception as e:
         logger.warning(f"Error getting user measurements: {str(e)}")
         return []
 
 
+def count_regular_measurements(user_id: str, up_to: int) -> int:
+    """
+    ユーザーの通常の測定記録数を上限付きで数える（Latest/Oldest レコードは除外）
+    
+    Args:
+        user_id: ユーザーID
+        up_to: 数える上限（到達した時点で読み取りを打ち切る）
+    
+    Returns:
+        測定記録数（最大でup_to）
+    """
+    query_params = {
+        'TableName': table_name,
+        'KeyConditionExpression': 'userId = :pk AND begins_with(measurementId, :prefix)',
+        'FilterExpression': 'attribute_not_exists(record_type)',
+        'Select': 'COUNT',
+        'ExpressionAttributeValues': {
+            ':pk': {'S': user_id},
+            ':prefix': {'S': 'MEASUREMENT#'}
+        },
+        'Limit': RECALC_QUERY_PAGE_SIZE
+    }
+    
+    count = 0
+    while True:
+        # 件数のみ必要なためアイテム本体は返さない
+        response = dynamodb_client.query(**query_params)
+        count += response['Count']
+        if count >= up_to:
+            return up_to
+        
+        last_evaluated_key = response.get('LastEvaluatedKey')
+        if not last_evaluated_key:
+            return count
+        query_params['ExclusiveStartKey'] = last_evaluated_key
+
+
+def find_extreme_measurement(user_id: str, measurement_type: str, newest: bool) -> Optional[Dict[str, Any]]:
+    """
+    指定した測定タイプを含む最新（または最古）の測定記録を取得
+    
+    measurementIdは MEASUREMENT#<measurement_time> 形式のため、ソートキー順は
+    測定時刻順と一致する。パーティション全体を読まずに端から順に探索する。
+    
+    Args:
+        user_id: ユーザーID
+        measurement_type: 測定タイプ（weight, height, body_fat_percentage）
+        newest: Trueの場合は最新、Falseの場合は最古の記録を取得
+    
+    Returns:
+        測定タイプの値とmeasurement_timeのみを含む記録（存在しない場合はNone）
+    """
+    query_params = {
+        'TableName': table_name,
+        'KeyConditionExpression': 'userId = :pk AND begins_with(measurementId, :prefix)',
+        # Latest/Oldest レコード（record_typeを持つ）は除外
+        'FilterExpression': 'attribute_exists(#mt) AND attribute_not_exists(record_type)',
+        'ProjectionExpression': '#mt, measurement_time',
+        'ExpressionAttributeNames': {'#mt': measurement_type},
+        'ExpressionAttributeValues': {
+            ':pk': {'S': user_id},
+            ':prefix': {'S': 'MEASUREMENT#'}
+        },
+        'ScanIndexForward': not newest,
+        'Limit': RECALC_QUERY_PAGE_SIZE
+    }
+    
+    while True:
+        # 射影した2属性のみを直接変換する（TypeDeserializerによる全属性の変換を省く）
+        response = dynamodb_client.query(**query_params)
+        if response['Items']:
+            item = response['Items'][0]
+            return {
+                measurement_type: Decimal(item[measurement_type]['N']),
+                'measurement_time': item['measurement_time']['S']
+            }
+        
+        last_evaluated_key = response.get('LastEvaluatedKey')
+        if not last_evaluated_key:
+            return None
+        query_params['ExclusiveStartKey'] = last_evaluated_key
+
+
+def find_extreme_measurements(user_id: str, newest: bool) -> Dict[str, Dict[str, Any]]:
+    """
+    各測定タイプの最新（または最古）の測定記録を取得
+    
+    Args:
+        user_id: ユーザーID
+        newest: Trueの場合は最新、Falseの場合は最古の記録を取得
+    
+    Returns:
+        測定タイプをキーとした測定記録の辞書（記録がないタイプは含まない）
+    """
+    extremes = {}
+    for measurement_type in MEASUREMENT_TYPES:
+        record = find_extreme_measurement(user_id, measurement_type, newest)
+        if record:
+            extremes[measurement_type] = record
+    return extremes
+
+
+def is_summary_record_affected(user_id: str, measurement_time: str, measurement_types: Iterable[str], newest: bool) -> bool:
+    """
+    変更された測定記録がLatest/Oldest レコードに影響するかを判定
+    
+    Latest レコードの last_<type>_update より厳密に古い（Oldestの場合は first_<type>_record
+    より厳密に新しい）記録の変更は、そのタイプの最新（最古）値に影響しない。
+    
+    Args:
+        user_id: ユーザーID
+        measurement_time: 変更された測定記録の測定時刻
+        measurement_types: 変更された測定タイプ
+        newest: Trueの場合はLatest、Falseの場合はOldest レコードを判定
+    
+    Returns:
+        再計算が必要な場合はTrue
+    """
+    record_type = 'latest' if newest else 'oldest'
+    response = table.get_item(
+        Key={
+            'userId': user_id,
+            'measurementId': f'MEASUREMENT#{record_type}'
+        }
+    )
+    summary_record = response.get('Item')
+    if not summary_record:
+        return True
+    
+    for measurement_type in measurement_types:
+        if newest:
+            boundary_time = summary_record.get(f'last_{measurement_type}_update')
+            if not boundary_time or measurement_time >= boundary_time:
+                return True
+        else:
+            boundary_time = summary_record.get(f'first_{measurement_type}_record')
+            if not boundary_time or measurement_time <= boundary_time:
+                return True
+    
+    return False
+
+
 def get_latest_measurements(parameters: Dict[str, Any]) -> Dict[str, Any]:
     """
     最新の測定値を取得
@@ -539,7 +697,7 @@ def get_latest_measurements(parameters: Dict[str, Any]) -> Dict[str, Any]:
             IndexName='RecordTypeIndex',
             KeyConditionExpression='userId = :pk AND record_type = :rt',
             ExpressionAttributeValues={
-                ':pk': f'{user_id}',
+                ':pk': user_id,
                 ':rt': 'latest'
             }
         )
@@ -599,7 +757,7 @@ def get_oldest_measurements(parameters: Dict[str, Any]) -> Dict[str, Any]:
             IndexName='RecordTypeIndex',
             KeyConditionExpression='userId = :pk AND record_type = :rt',
             ExpressionAttributeValues={
-                ':pk': f'{user_id}',
+                ':pk': user_id,
                 ':rt': 'oldest'
             }
         )
@@ -665,7 +823,7 @@ def get_measurement_history(parameters: Dict[str, Any]) -> Dict[str, Any]:
         response = table.query(
             KeyConditionExpression='userId = :pk AND measurementId BETWEEN :start_sk AND :end_sk',
             ExpressionAttributeValues={
-                ':pk': f'{user_id}',
+                ':pk': user_id,
                 ':start_sk': f'MEASUREMENT#{start_date}',
                 ':end_sk': f'MEASUREMENT#{end_date}Z'  # 終日を含むため
             },
@@ -757,7 +915,7 @@ def update_body_measurement(parameters: Dict[str, Any]) -> Dict[str, Any]:
         # 既存レコードの存在確認と取得
         response = table.get_item(
             Key={
-                'userId': f'{user_id}',
+                'userId': user_id,
                 'measurementId': f'MEASUREMENT#{measurement_id}'
             }
         )
@@ -768,7 +926,7 @@ def update_body_measurement(parameters: Dict[str, Any]) -> Dict[str, Any]:
         existing_record = response['Item']
         
         # レコードの所有権確認
-        if not existing_record['userId'] == f'{user_id}':
+        if not existing_record['userId'] == user_id:
             raise ValueError("この測定記録を更新する権限がありません")
         
         # レコードを更新
@@ -781,8 +939,9 @@ def update_body_measurement(parameters: Dict[str, Any]) -> Dict[str, Any]:
         
         logger.debug(f"Updated measurement record: {measurement_id}")
         
-        # Latest レコードの再計算（更新されたレコードが最新の場合）
+        # Latest/Oldest レコードの再計算（更新されたレコードが最新・最古の場合）
         recalculate_latest_record_after_update(user_id, measurement_id, update_data)
+        recalculate_oldest_record_after_update(user_id, measurement_id, update_data)
         
         logger.info(f"Measurement updated successfully for user: {user_id}")
         return {
@@ -828,7 +987,7 @@ def delete_body_measurement(parameters: Dict[str, Any]) -> Dict[str, Any]:
         # 削除対象レコードの存在確認と取得
         response = table.get_item(
             Key={
-                'userId': f'{user_id}',
+                'userId': user_id,
                 'measurementId': f'MEASUREMENT#{measurement_id}'
             }
         )
@@ -839,22 +998,23 @@ def delete_body_measurement(parameters: Dict[str, Any]) -> Dict[str, Any]:
         target_record = response['Item']
         
         # レコードの所有権確認
-        if not target_record['userId'] == f'{user_id}':
+        if not target_record['userId'] == user_id:
             raise ValueError("この測定記録を削除する権限がありません")
         
         # レコードを削除
         table.delete_item(
             Key={
-                'userId': f'{user_id}',
+                'userId': user_id,
                 'measurementId': f'MEASUREMENT#{measurement_id}'
             }
         )
         
         logger.debug(f"Deleted measurement record: {measurement_id}")
         
-        # Latest/Oldest レコードの再計算
-        recalculate_latest_record_after_deletion(user_id, measurement_id)
-        recalculate_oldest_record_after_deletion(user_id, measurement_id)
+        # Latest/Oldest レコードの再計算（削除したレコードに含まれていた測定タイプのみ影響する）
+        deleted_types = [t for t in MEASUREMENT_TYPES if t in target_record]
+        recalculate_latest_record_after_deletion(user_id, measurement_id, deleted_types)
+        recalculate_oldest_record_after_deletion(user_id, measurement_id, deleted_types)
         
         logger.info(f"Measurement deleted successfully for user: {user_id}")
         return {
@@ -881,22 +1041,22 @@ def recalculate_latest_record_after_update(user_id: str, updated_measurement_id:
     
     Args:
         user_id: ユーザーID
-        updated_measurement_id: 更新された測定記録ID
+        updated_measurement_id: 更新された測定記録ID（測定時刻と同じ値）
         updated_data: 更新されたデータ
     """
     try:
-        # 全測定記録を取得して最新値を再計算
-        all_measurements = get_all_user_measurements(user_id)
-        regular_measurements = [
-            r for r in all_measurements 
-            if not r['measurementId'].endswith('#latest') and not r['measurementId'].endswith('#oldest')
-        ]
+        if not is_summary_record_affected(user_id, updated_measurement_id, updated_data.keys(), newest=True):
+            logger.debug(f"Skipped latest recalculation (not the latest record) for user: {user_id}")
+            return
+        
+        # 各測定タイプの最新記録のみを取得して最新値を再計算
+        latest_measurements = find_extreme_measurements(user_id, newest=True)
         
-        if not regular_measurements:
+        if not latest_measurements:
             # 測定記録がない場合、Latest レコードを削除
             table.delete_item(
                 Key={
-                    'userId': f'{user_id}',
+                    'userId': user_id,
                     'measurementId': 'MEASUREMENT#latest'
                 }
             )
@@ -906,21 +1066,14 @@ def recalculate_latest_record_after_update(user_id: str, updated_measurement_id:
         latest_values = {}
         last_update_times = {}
         
-        for measurement_type in ['weight', 'height', 'body_fat_percentage']:
-            records_with_type = [
-                r for r in regular_measurements 
-                if measurement_type in r
-            ]
-            records_with_type.sort(key=lambda x: x['measurement_time'], reverse=True)
-            
-            if records_with_type:
-                latest_values[measurement_type] = records_with_type[0][measurement_type]
-                last_update_times[f'last_{measurement_type}_update'] = records_with_type[0]['measurement_time']
+        for measurement_type, record in latest_measurements.items():
+            latest_values[measurement_type] = record[measurement_type]
+            last_update_times[f'last_{measurement_type}_update'] = record['measurement_time']
         
         # Latest レコードを更新
         if latest_values:
             latest_record = {
-                'userId': f'{user_id}',
+                'userId': user_id,
                 'measurementId': 'MEASUREMENT#latest',
                 'record_type': 'latest',
                 **latest_values,
@@ -935,27 +1088,42 @@ def recalculate_latest_record_after_update(user_id: str, updated_measurement_id:
         logger.warning(f"Error recalculating latest record after update: {str(e)}")
 
 
-def recalculate_latest_record_after_deletion(user_id: str, deleted_measurement_id: str) -> None:
+def recalculate_oldest_record_after_update(user_id: str, updated_measurement_id: str, updated_data: Dict[str, Any]) -> None:
+    """
+    測定記録更新後のOldest レコード再計算
+    
+    削除時と同様に、更新されたタイプの最古値を現在の測定記録から再計算する。
+    
+    Args:
+        user_id: ユーザーID
+        updated_measurement_id: 更新された測定記録ID（測定時刻と同じ値）
+        updated_data: 更新されたデータ
+    """
+    recalculate_oldest_record_after_deletion(user_id, updated_measurement_id, updated_data.keys())
+
+
+def recalculate_latest_record_after_deletion(user_id: str, deleted_measurement_id: str, deleted_types: Iterable[str] = MEASUREMENT_TYPES) -> None:
     """
     測定記録削除後のLatest レコード再計算
     
     Args:
         user_id: ユーザーID
-        deleted_measurement_id: 削除された測定記録ID
+        deleted_measurement_id: 削除された測定記録ID（測定時刻と同じ値）
+        deleted_types: 削除された記録に含まれていた測定タイプ
     """
     try:
-        # 残りの全測定記録を取得
-        remaining_measurements = get_all_user_measurements(user_id)
-        regular_measurements = [
-            r for r in remaining_measurements 
-            if not r['measurementId'].endswith('#latest') and not r['measurementId'].endswith('#oldest')
-        ]
+        if not is_summary_record_affected(user_id, deleted_measurement_id, deleted_types, newest=True):
+            logger.debug(f"Skipped latest recalculation (not the latest record) for user: {user_id}")
+            return
+        
+        # 各測定タイプの最新記録のみを取得
+        latest_measurements = find_extreme_measurements(user_id, newest=True)
         
-        if not regular_measurements:
+        if not latest_measurements:
             # 測定記録が全て削除された場合、Latest レコードも削除
             table.delete_item(
                 Key={
-                    'userId': f'{user_id}',
+                    'userId': user_id,
                     'measurementId': 'MEASUREMENT#latest'
                 }
             )
@@ -966,21 +1134,14 @@ def recalculate_latest_record_after_deletion(user_id: str, deleted_measurement_i
         latest_values = {}
         last_update_times = {}
         
-        for measurement_type in ['weight', 'height', 'body_fat_percentage']:
-            records_with_type = [
-                r for r in regular_measurements 
-                if measurement_type in r
-            ]
-            records_with_type.sort(key=lambda x: x['measurement_time'], reverse=True)
-            
-            if records_with_type:
-                latest_values[measurement_type] = records_with_type[0][measurement_type]
-                last_update_times[f'last_{measurement_type}_update'] = records_with_type[0]['measurement_time']
+        for measurement_type, record in latest_measurements.items():
+            latest_values[measurement_type] = record[measurement_type]
+            last_update_times[f'last_{measurement_type}_update'] = record['measurement_time']
         
         # Latest レコードを更新
         if latest_values:
             latest_record = {
-                'userId': f'{user_id}',
+                'userId': user_id,
                 'measurementId': 'MEASUREMENT#latest',
                 'record_type': 'latest',
                 **latest_values,
@@ -995,27 +1156,28 @@ def recalculate_latest_record_after_deletion(user_id: str, deleted_measurement_i
         logger.warning(f"Error recalculating latest record after deletion: {str(e)}")
 
 
-def recalculate_oldest_record_after_deletion(user_id: str, deleted_measurement_id: str) -> None:
+def recalculate_oldest_record_after_deletion(user_id: str, deleted_measurement_id: str, deleted_types: Iterable[str] = MEASUREMENT_TYPES) -> None:
     """
     測定記録削除後のOldest レコード再計算
     
     Args:
         user_id: ユーザーID
-        deleted_measurement_id: 削除された測定記録ID
+        deleted_measurement_id: 削除された測定記録ID（測定時刻と同じ値）
+        deleted_types: 削除された記録に含まれていた測定タイプ
     """
     try:
-        # 残りの全測定記録を取得
-        remaining_measurements = get_all_user_measurements(user_id)
-        regular_measurements = [
-            r for r in remaining_measurements 
-            if not r['measurementId'].endswith('#latest') and not r['measurementId'].endswith('#oldest')
-        ]
+        if not is_summary_record_affected(user_id, deleted_measurement_id, deleted_types, newest=False):
+            logger.debug(f"Skipped oldest recalculation (not the oldest record) for user: {user_id}")
+            return
         
-        if not regular_measurements:
+        # 各測定タイプの最古記録のみを取得
+        oldest_measurements = find_extreme_measurements(user_id, newest=False)
+        
+        if not oldest_measurements:
             # 測定記録が全て削除された場合、Oldest レコードも削除
             table.delete_item(
                 Key={
-                    'userId': f'{user_id}',
+                    'userId': user_id,
                     'measurementId': 'MEASUREMENT#oldest'
                 }
             )
@@ -1026,21 +1188,14 @@ def recalculate_oldest_record_after_deletion(user_id: str, deleted_measurement_i
         oldest_values = {}
         first_record_times = {}
         
-        for measurement_type in ['weight', 'height', 'body_fat_percentage']:
-            records_with_type = [
-                r for r in regular_measurements 
-                if measurement_type in r
-            ]
-            records_with_type.sort(key=lambda x: x['measurement_time'])  # 昇順ソート
-            
-            if records_with_type:
-                oldest_values[measurement_type] = records_with_type[0][measurement_type]
-                first_record_times[f'first_{measurement_type}_record'] = records_with_type[0]['measurement_time']
+        for measurement_type, record in oldest_measurements.items():
+            oldest_values[measurement_type] = record[measurement_type]
+            first_record_times[f'first_{measurement_type}_record'] = record['measurement_time']
         
         # Oldest レコードを更新
         if oldest_values:
             oldest_record = {
-                'userId': f'{user_id}',
+                'userId': user_id,
                 'measurementId': 'MEASUREMENT#oldest',
                 'record_type': 'oldest',
                 **oldest_values,
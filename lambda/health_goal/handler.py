@@ -3,9 +3,11 @@ HealthGoalLambda - 健康目標管理Lambda関数
 
 HealthManagerMCP（Healthmateエコシステム）の健康目標管理を担当。
 AgentCore Gateway（MCP）から呼び出され、DynamoDBで健康目標のCRUD操作を実行します。
+DynamoDB操作・キャッシュ・エラーハンドリングは shared.crud の共通処理を使用します。
 
 機能:
 - AddGoal: 新しい健康目標を作成（UUIDでgoalId生成）
+- AddGoals: 複数の健康目標を一括作成（BatchWriteItem）
 - UpdateGoal: 既存の健康目標を更新
 - DeleteGoal: 指定した健康目標を削除
 - GetGoals: ユーザーのすべての健康目標を取得
@@ -13,14 +15,18 @@ AgentCore Gateway（MCP）から呼び出され、DynamoDBで健康目標のCRUD
 要件: 要件3（健康目標管理）、要件11（データ永続化）、要件12（エラーハンドリング）、要件13（ロギング）
 """
 
-import json
 import os
-import uuid
 import logging
-from datetime import datetime, timezone
-from typing import Any, Dict, List, Literal, Optional
-import boto3
-from botocore.exceptions import ClientError
+from typing import Any, Dict, Literal, get_args
+
+from shared.crud import (
+    MAX_BATCH_WRITE_ITEMS,
+    CrudResource,
+    ParameterSchema,
+    handle_tool_call,
+    new_item_id,
+    utc_now_iso,
+)
 
 # ログ設定
 log_level = os.environ.get("LOG_LEVEL", "INFO")
@@ -29,29 +35,40 @@ logger.setLevel(getattr(logging, log_level.upper()))
 
 # CloudWatch Logsハンドラーが自動的に設定されるため、追加設定は不要
 
-# DynamoDBクライアント（指数バックオフ付き再試行設定）
-from botocore.config import Config
-
-config = Config(
-    retries={
-        "max_attempts": 3,
-        "mode": "standard",  # 指数バックオフ
-    }
-)
-
-dynamodb = boto3.resource("dynamodb", config=config)
 table_name = os.environ.get("GOALS_TABLE_NAME", "healthmate-goals")
-table = dynamodb.Table(table_name)
 
 # 型定義
 GoalType = Literal['longevity', 'fitness', 'weight', 'mental_health', 'other']
 GoalStatus = Literal['active', 'achieved', 'paused', 'cancelled']
 
+# AddGoalsで一度に作成できる最大件数（BatchWriteItemの上限）
+MAX_BATCH_GOALS = MAX_BATCH_WRITE_ITEMS
+
+# 更新可能なフィールド（UpdateExpressionはこの順序で構築する）
+UPDATABLE_GOAL_FIELDS = ("title", "description", "targetValue", "targetDate", "priority", "status")
+
+# ツール引数の検証スキーマ（許可値の集合・エラーメッセージはインポート時に構築）
+GOAL_ITEM_SCHEMA = ParameterSchema(
+    required=("goalType",),
+    choices={"goalType": get_args(GoalType)},
+    int_ranges={"priority": (1, 5)},
+)
+UPDATE_GOAL_SCHEMA = ParameterSchema(
+    required=("userId", "goalId"),
+    choices={"status": get_args(GoalStatus)},
+    int_ranges={"priority": (1, 5)},
+    booleans=("returnUpdated",),
+)
+DELETE_GOAL_SCHEMA = ParameterSchema(required=("userId", "goalId"), booleans=("strict",))
+
+# 健康目標テーブルの共通CRUD操作
+_goals = CrudResource(table_name, "goalId", "Goal", UPDATABLE_GOAL_FIELDS)
+
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Lambda関数のエントリーポイント
-    
+
     AgentCore Gateway（MCP）から呼び出され、健康目標のCRUD操作を実行します。
     クライアント側でJWTのsubクレームから抽出されたuserIdがパラメータとして渡されます。
 
@@ -62,75 +79,15 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Returns:
         MCP形式のレスポンス
     """
-    logger.debug(f"Received event: {json.dumps(event, default=str)}")
-
-    try:
-        # AgentCore Gateway（MCP）形式のイベントを処理
-        parameters = event.copy()
-        
-        # userIdの検証（必須）
-        if "userId" not in parameters:
-            raise ValueError("userId is required for all health goal operations")
-        
-        user_id = parameters["userId"]
-        logger.info(f"Processing request for userId: {user_id}")
-        
-        # contextからツール名を取得
-        tool_name = context.client_context.custom['bedrockAgentCoreToolName'].split('___', 1)[-1]
-        logger.debug(f"Tool name from context: {tool_name}")
-        
-        # ツールに基づいて関数を実行
-        if tool_name == "AddGoal":
-            result = add_goal(parameters)
-        elif tool_name == "UpdateGoal":
-            result = update_goal(parameters)
-        elif tool_name == "DeleteGoal":
-            result = delete_goal(parameters)
-        elif tool_name == "GetGoals":
-            result = get_goals(parameters)
-        else:
-            raise ValueError(f"Unknown operation: {tool_name}")
-        
-        logger.info(f"Operation completed successfully: {tool_name}")
-        return result
-
-    except ValueError as e:
-        # バリデーションエラー
-        error_msg = f"Validation error: {str(e)}"
-        logger.warning(error_msg)
-        return {
-            "success": False,
-            "error": error_msg,
-            "errorType": "ValidationError"
-        }
-    except ClientError as e:
-        # DynamoDBエラー
-        error_code = e.response.get("Error", {}).get("Code", "Unknown")
-        error_msg = f"Database error ({error_code}): {str(e)}"
-        logger.error(error_msg)
-        return {
-            "success": False,
-            "error": "データベースエラーが発生しました。しばらくしてから再度お試しください。",
-            "errorType": "DatabaseError",
-            "errorCode": error_code
-        }
-    except Exception as e:
-        # その他のエラー
-        error_msg = f"Unexpected error: {str(e)}"
-        logger.error(error_msg)
-        return {
-            "success": False,
-            "error": "予期しないエラーが発生しました。しばらくしてから再度お試しください。",
-            "errorType": "InternalError"
-        }
+    return handle_tool_call(event, context, TOOL_OPERATIONS, "goalId", "health goal", logger)
 
 
 def add_goal(parameters: Dict[str, Any]) -> Dict[str, Any]:
     """
     新しい健康目標を作成
-    
+
     Args:
-        parameters: userId, goalType, title, description, targetValue(optional), 
+        parameters: userId, goalType, title, description, targetValue(optional),
                    targetDate(optional), priority(optional)
 
     Returns:
@@ -141,42 +98,63 @@ def add_goal(parameters: Dict[str, Any]) -> Dict[str, Any]:
         ClientError: DynamoDB操作でエラーが発生した場合
     """
     user_id = parameters.get("userId")
-    goal_type = parameters.get("goalType")
-    title = parameters.get("title")
-    description = parameters.get("description", "")
-    target_value = parameters.get("targetValue")
-    target_date = parameters.get("targetDate")
-    priority = parameters.get("priority", 3)  # デフォルト優先度: 3
 
     # 必須パラメータの検証
     if not user_id:
         raise ValueError("userId is required")
-    if not goal_type:
-        raise ValueError("goalType is required")
-    
+
+    item = _build_goal_item(user_id, parameters, utc_now_iso())
+    goal_id = item["goalId"]
+
+    logger.debug(f"Creating goal: {goal_id} for user: {user_id}")
+
+    # DynamoDBに保存
+    _goals.put(item)
+
+    logger.debug(f"Goal created successfully: {goal_id}")
+    return {
+        "success": True,
+        "goalId": goal_id,
+        "message": "健康目標を作成しました",
+        "goal": item
+    }
+
+
+def _build_goal_item(user_id: str, goal: Dict[str, Any], now: str) -> Dict[str, Any]:
+    """
+    検証済みの健康目標アイテムを構築
+
+    Args:
+        user_id: ユーザーID
+        goal: goalType, title, description, targetValue(optional),
+              targetDate(optional), priority(optional)
+        now: createdAt/updatedAtに設定するタイムスタンプ
+
+    Returns:
+        DynamoDBに保存するアイテム（goalIdを生成済み）
+
+    Raises:
+        ValueError: パラメータが不正な場合
+    """
+    GOAL_ITEM_SCHEMA.validate(goal)
+
+    goal_type = goal["goalType"]
+    title = goal.get("title")
+    description = goal.get("description", "")
+    target_value = goal.get("targetValue")
+    target_date = goal.get("targetDate")
+    priority = goal.get("priority")
+    if priority is None:
+        priority = 3  # デフォルト優先度: 3
+
     # titleがない場合はデフォルト値を設定
     if not title:
         title = f"{goal_type.capitalize()} Goal"
-    
-    # goalTypeの検証
-    valid_goal_types = ['longevity', 'fitness', 'weight', 'mental_health', 'other']
-    if goal_type not in valid_goal_types:
-        raise ValueError(f"goalType must be one of: {', '.join(valid_goal_types)}")
-    
-    # priorityの検証
-    if not isinstance(priority, int) or priority < 1 or priority > 5:
-        raise ValueError("priority must be an integer between 1 and 5")
-
-    # UUIDでgoalIdを生成
-    goal_id = str(uuid.uuid4())
-    now = datetime.now(timezone.utc).isoformat()
 
-    logger.debug(f"Creating goal: {goal_id} for user: {user_id}")
-
-    # DynamoDBアイテムを構築
+    # DynamoDBアイテムを構築（UUIDでgoalIdを生成）
     item = {
         "userId": user_id,
-        "goalId": goal_id,
+        "goalId": new_item_id(),
         "goalType": goal_type,
         "title": title,
         "description": description,
@@ -192,22 +170,71 @@ def add_goal(parameters: Dict[str, Any]) -> Dict[str, Any]:
     if target_date:
         item["targetDate"] = target_date
 
-    try:
-        # DynamoDBに保存
-        table.put_item(Item=item)
-        
-        logger.info(f"Goal created successfully: {goal_id}")
+    return item
+
+
+def add_goals(parameters: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    複数の健康目標を一括で作成（BatchWriteItemで1リクエストにまとめて保存）
+
+    Args:
+        parameters: userId, goals (AddGoalと同じ形式の目標オブジェクトのリスト)
+
+    Returns:
+        作成された健康目標情報のリスト（一部を保存できなかった場合は保存済み・未保存の目標ID）
+
+    Raises:
+        ValueError: 必須パラメータが不足している場合、または目標データが不正な場合
+        ClientError: DynamoDB操作でエラーが発生した場合
+    """
+    user_id = parameters.get("userId")
+    goals = parameters.get("goals")
+
+    if not user_id:
+        raise ValueError("userId is required")
+    if not goals or not isinstance(goals, list):
+        raise ValueError("goals must be a non-empty list")
+    if len(goals) > MAX_BATCH_GOALS:
+        raise ValueError(f"goals must contain at most {MAX_BATCH_GOALS} items")
+
+    # すべての目標を検証してから書き込む（一部だけ保存されることを防ぐ）
+    now = utc_now_iso()
+    items = []
+    for idx, goal in enumerate(goals):
+        if not isinstance(goal, dict):
+            raise ValueError(f"Goal at index {idx} must be an object")
+        try:
+            items.append(_build_goal_item(user_id, goal, now))
+        except ValueError as e:
+            raise ValueError(f"Goal at index {idx}: {e}")
+
+    logger.debug(f"Creating {len(items)} goals for user: {user_id}")
+
+    unprocessed_ids = _goals.batch_put(user_id, items)
+
+    if unprocessed_ids:
+        # 保存済みの目標を再作成しないよう、保存できた目標と保存できなかった目標を区別して返す
+        unprocessed = set(unprocessed_ids)
+        written_items = [item for item in items if item["goalId"] not in unprocessed]
         return {
-            "success": True,
-            "goalId": goal_id,
-            "message": "健康目標を作成しました",
-            "goal": item
+            "success": False,
+            "error": f"{len(unprocessed_ids)}件の健康目標を保存できませんでした。unprocessedGoalIdsの目標のみ再度作成してください。",
+            "errorType": "DatabaseError",
+            "goalIds": [item["goalId"] for item in written_items],
+            "unprocessedGoalIds": unprocessed_ids,
+            "goals": written_items,
+            "count": len(written_items)
         }
 
-    except ClientError as e:
-        error_code = e.response.get("Error", {}).get("Code", "Unknown")
-        logger.error(f"DynamoDB error in add_goal: {error_code} - {str(e)}")
-        raise
+    goal_ids = [item["goalId"] for item in items]
+    logger.debug(f"Goals created successfully: {goal_ids}")
+    return {
+        "success": True,
+        "goalIds": goal_ids,
+        "message": f"{len(items)}件の健康目標を作成しました",
+        "goals": items,
+        "count": len(items)
+    }
 
 
 def update_goal(parameters: Dict[str, Any]) -> Dict[str, Any]:
@@ -215,121 +242,47 @@ def update_goal(parameters: Dict[str, Any]) -> Dict[str, Any]:
     既存の健康目標を更新
 
     Args:
-        parameters: userId, goalId, title(optional), description(optional), 
-                   targetValue(optional), targetDate(optional), priority(optional), status(optional)
+        parameters: userId, goalId, title(optional), description(optional),
+                   targetValue(optional), targetDate(optional), priority(optional), status(optional),
+                   returnUpdated(optional: falseの場合は更新後の目標を返さない)
 
     Returns:
         更新結果
 
     Raises:
-        ValueError: 必須パラメータが不足している場合
+        ValueError: 必須パラメータが不足している場合、または目標が存在しない場合
         ClientError: DynamoDB操作でエラーが発生した場合
     """
-    user_id = parameters.get("userId")
-    goal_id = parameters.get("goalId")
-    title = parameters.get("title")
-    description = parameters.get("description")
-    target_value = parameters.get("targetValue")
-    target_date = parameters.get("targetDate")
-    priority = parameters.get("priority")
-    status = parameters.get("status")
+    UPDATE_GOAL_SCHEMA.validate(parameters)
 
-    if not user_id:
-        raise ValueError("userId is required")
-    if not goal_id:
-        raise ValueError("goalId is required")
+    user_id = parameters["userId"]
+    goal_id = parameters["goalId"]
 
     logger.debug(f"Updating goal: {goal_id} for user: {user_id}")
 
-    # 更新式を構築
-    update_expression_parts = []
-    expression_attribute_values = {}
-
-    if title is not None:
-        update_expression_parts.append("title = :title")
-        expression_attribute_values[":title"] = title
-
-    if description is not None:
-        update_expression_parts.append("description = :description")
-        expression_attribute_values[":description"] = description
-
-    if target_value is not None:
-        update_expression_parts.append("targetValue = :targetValue")
-        expression_attribute_values[":targetValue"] = target_value
-
-    if target_date is not None:
-        update_expression_parts.append("targetDate = :targetDate")
-        expression_attribute_values[":targetDate"] = target_date
-
-    if priority is not None:
-        if not isinstance(priority, int) or priority < 1 or priority > 5:
-            raise ValueError("priority must be an integer between 1 and 5")
-        update_expression_parts.append("priority = :priority")
-        expression_attribute_values[":priority"] = priority
-
-    if status is not None:
-        valid_statuses = ['active', 'achieved', 'paused', 'cancelled']
-        if status not in valid_statuses:
-            raise ValueError(f"status must be one of: {', '.join(valid_statuses)}")
-        update_expression_parts.append("#status = :status")
-        expression_attribute_values[":status"] = status
-
-    # updatedAtは常に更新
-    now = datetime.now(timezone.utc).isoformat()
-    update_expression_parts.append("updatedAt = :updatedAt")
-    expression_attribute_values[":updatedAt"] = now
-
-    if len(update_expression_parts) == 1:  # updatedAtのみの場合
-        raise ValueError("At least one field to update is required")
-
-    update_expression = "SET " + ", ".join(update_expression_parts)
-    
-    # statusは予約語なので、ExpressionAttributeNamesを使用
-    expression_attribute_names = {}
-    if status is not None:
-        expression_attribute_names["#status"] = "status"
-
-    try:
-        # 目標が存在することを確認しながら更新
-        update_params = {
-            "Key": {"userId": user_id, "goalId": goal_id},
-            "UpdateExpression": update_expression,
-            "ExpressionAttributeValues": expression_attribute_values,
-            "ConditionExpression": "attribute_exists(userId) AND attribute_exists(goalId)",
-            "ReturnValues": "ALL_NEW",
-        }
-        
-        if expression_attribute_names:
-            update_params["ExpressionAttributeNames"] = expression_attribute_names
-
-        response = table.update_item(**update_params)
-        
-        updated_goal = response["Attributes"]
-        logger.info(f"Goal updated successfully: {goal_id}")
-        
-        return {
-            "success": True,
-            "goalId": goal_id,
-            "message": "健康目標を更新しました",
-            "goal": updated_goal
-        }
+    return_updated = parameters.get("returnUpdated") is not False
+    updated_goal = _goals.update(user_id, goal_id, parameters, return_updated)
 
-    except ClientError as e:
-        error_code = e.response.get("Error", {}).get("Code", "Unknown")
-        if error_code == "ConditionalCheckFailedException":
-            logger.warning(f"Goal not found for update: {goal_id}")
-            raise ValueError(f"Goal not found: {goal_id}")
-        else:
-            logger.error(f"DynamoDB error in update_goal: {error_code} - {str(e)}")
-            raise
+    logger.debug(f"Goal updated successfully: {goal_id}")
+    result = {
+        "success": True,
+        "goalId": goal_id,
+        "message": "健康目標を更新しました"
+    }
+    if return_updated:
+        result["goal"] = updated_goal
+    return result
 
 
 def delete_goal(parameters: Dict[str, Any]) -> Dict[str, Any]:
     """
     指定した健康目標を削除
 
+    strictがfalse（デフォルト）の場合は条件なしで削除する（冪等）。
+    trueの場合は存在確認を行い、存在しなければエラーとし、削除前の内容を返す。
+
     Args:
-        parameters: userId, goalId
+        parameters: userId, goalId, strict(optional)
 
     Returns:
         削除結果
@@ -338,42 +291,23 @@ def delete_goal(parameters: Dict[str, Any]) -> Dict[str, Any]:
         ValueError: 必須パラメータが不足している場合
         ClientError: DynamoDB操作でエラーが発生した場合
     """
-    user_id = parameters.get("userId")
-    goal_id = parameters.get("goalId")
+    DELETE_GOAL_SCHEMA.validate(parameters)
 
-    if not user_id:
-        raise ValueError("userId is required")
-    if not goal_id:
-        raise ValueError("goalId is required")
+    user_id = parameters["userId"]
+    goal_id = parameters["goalId"]
+    strict = parameters.get("strict") or False
 
     logger.debug(f"Deleting goal: {goal_id} for user: {user_id}")
 
-    try:
-        # 目標が存在することを確認しながら削除
-        response = table.delete_item(
-            Key={"userId": user_id, "goalId": goal_id},
-            ConditionExpression="attribute_exists(userId) AND attribute_exists(goalId)",
-            ReturnValues="ALL_OLD"
-        )
-        
-        deleted_goal = response.get("Attributes")
-        logger.info(f"Goal deleted successfully: {goal_id}")
-        
-        return {
-            "success": True,
-            "goalId": goal_id,
-            "message": "健康目標を削除しました",
-            "deletedGoal": deleted_goal
-        }
+    deleted_goal = _goals.delete(user_id, goal_id, strict)
 
-    except ClientError as e:
-        error_code = e.response.get("Error", {}).get("Code", "Unknown")
-        if error_code == "ConditionalCheckFailedException":
-            logger.warning(f"Goal not found for deletion: {goal_id}")
-            raise ValueError(f"Goal not found: {goal_id}")
-        else:
-            logger.error(f"DynamoDB error in delete_goal: {error_code} - {str(e)}")
-            raise
+    logger.debug(f"Goal deleted successfully: {goal_id}")
+    return {
+        "success": True,
+        "goalId": goal_id,
+        "message": "健康目標を削除しました",
+        "deletedGoal": deleted_goal
+    }
 
 
 def get_goals(parameters: Dict[str, Any]) -> Dict[str, Any]:
@@ -381,10 +315,13 @@ def get_goals(parameters: Dict[str, Any]) -> Dict[str, Any]:
     ユーザーのすべての健康目標を取得
 
     Args:
-        parameters: userId
+        parameters: userId, fields(optional: 取得する属性名のリスト),
+                   limit(optional: 1ページの最大件数), cursor(optional: 前ページのnextCursor),
+                   freshness(optional: now|recent|any 読み取り鮮度、デフォルト: now)
 
     Returns:
-        健康目標のリスト
+        健康目標のリスト（fields指定時は指定属性とキー属性のみ）
+        limit指定時に続きがある場合はnextCursorを含む
 
     Raises:
         ValueError: userIdが指定されていない場合
@@ -397,24 +334,31 @@ def get_goals(parameters: Dict[str, Any]) -> Dict[str, Any]:
 
     logger.debug(f"Retrieving goals for user: {user_id}")
 
-    try:
-        # userIdでクエリしてすべての目標を取得
-        response = table.query(
-            KeyConditionExpression="userId = :userId",
-            ExpressionAttributeValues={":userId": user_id}
-        )
-        
-        goals = response.get("Items", [])
-        logger.info(f"Retrieved {len(goals)} goals for user: {user_id}")
-        
-        return {
-            "success": True,
-            "userId": user_id,
-            "goals": goals,
-            "count": len(goals)
-        }
-
-    except ClientError as e:
-        error_code = e.response.get("Error", {}).get("Code", "Unknown")
-        logger.error(f"DynamoDB error in get_goals: {error_code} - {str(e)}")
-        raise
\ No newline at end of file
+    goals, next_cursor = _goals.list(
+        user_id,
+        fields=parameters.get("fields"),
+        limit=parameters.get("limit"),
+        cursor=parameters.get("cursor"),
+        freshness=parameters.get("freshness"),
+    )
+
+    logger.debug(f"Retrieved {len(goals)} goals for user: {user_id}")
+    result = {
+        "success": True,
+        "userId": user_id,
+        "goals": goals,
+        "count": len(goals)
+    }
+    if next_cursor:
+        result["nextCursor"] = next_cursor
+    return result
+
+
+# ツール名と処理関数の対応表（lambda_handlerでのディスパッチに使用）
+TOOL_OPERATIONS = {
+    "AddGoal": add_goal,
+    "AddGoals": add_goals,
+    "UpdateGoal": update_goal,
+    "DeleteGoal": delete_goal,
+    "GetGoals": get_goals,
+}
@@ -3,6 +3,7 @@ HealthPolicyLambda - 健康ポリシー管理Lambda関数
 
 HealthManagerMCP（Healthmateエコシステム）の健康ポリシー管理を担当。
 AgentCore Gateway（MCP）から呼び出され、DynamoDBで健康ポリシーのCRUD操作を実行します。
+DynamoDB操作・キャッシュ・エラーハンドリングは shared.crud の共通処理を使用します。
 
 機能:
 - addPolicy: 新しい健康ポリシーを作成（UUIDでpolicyId生成）
@@ -13,14 +14,11 @@ AgentCore Gateway（MCP）から呼び出され、DynamoDBで健康ポリシー
 要件: 要件4（健康ポリシー管理）、要件11（データ永続化）、要件12（エラーハンドリング）、要件13（ロギング）
 """
 
-import json
 import os
-import uuid
 import logging
-from datetime import datetime, timezone
-from typing import Any, Dict, Literal, Optional
-import boto3
-from botocore.exceptions import ClientError
+from typing import Any, Dict, Literal, get_args
+
+from shared.crud import CrudResource, ParameterSchema, handle_tool_call, new_item_id, utc_now_iso
 
 # ログ設定
 log_level = os.environ.get("LOG_LEVEL", "INFO")
@@ -29,28 +27,30 @@ logger.setLevel(getattr(logging, log_level.upper()))
 
 # CloudWatch Logsハンドラーが自動的に設定されるため、追加設定は不要
 
-# DynamoDBクライアント（指数バックオフ付き再試行設定）
-from botocore.config import Config
-
-config = Config(
-    retries={
-        "max_attempts": 3,
-        "mode": "standard",  # 指数バックオフ
-    }
-)
-
-dynamodb = boto3.resource("dynamodb", config=config)
 table_name = os.environ.get("POLICIES_TABLE_NAME", "healthmate-policies")
-table = dynamodb.Table(table_name)
 
 # 型定義
 PolicyType = Literal["diet", "exercise", "sleep", "fasting", "restriction", "other"]
 
+# 更新可能なフィールド（UpdateExpressionはこの順序で構築する）
+UPDATABLE_POLICY_FIELDS = ("title", "description", "rules", "isActive", "startDate", "endDate")
+
+# ツール引数の検証スキーマ（許可値の集合・エラーメッセージはインポート時に構築）
+ADD_POLICY_SCHEMA = ParameterSchema(
+    required=("userId", "policyType"),
+    choices={"policyType": get_args(PolicyType)},
+)
+UPDATE_POLICY_SCHEMA = ParameterSchema(required=("userId", "policyId"), booleans=("returnUpdated",))
+DELETE_POLICY_SCHEMA = ParameterSchema(required=("userId", "policyId"), booleans=("strict",))
+
+# 健康ポリシーテーブルの共通CRUD操作
+_policies = CrudResource(table_name, "policyId", "Policy", UPDATABLE_POLICY_FIELDS)
+
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Lambda関数のエントリーポイント
-    
+
     AgentCore Gateway（MCP）から呼び出され、健康ポリシーのCRUD操作を実行します。
     クライアント側でJWTのsubクレームから抽出されたuserIdがパラメータとして渡されます。
 
@@ -61,75 +61,15 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Returns:
         MCP形式のレスポンス
     """
-    logger.debug(f"Received event: {json.dumps(event, default=str)}")
-
-    try:
-        # AgentCore Gateway（MCP）形式のイベントを処理
-        parameters = event.copy()
-        
-        # userIdの検証（必須）
-        if "userId" not in parameters:
-            raise ValueError("userId is required for all health policy operations")
-        
-        user_id = parameters["userId"]
-        logger.info(f"Processing request for userId: {user_id}")
-        
-        # contextからツール名を取得
-        tool_name = context.client_context.custom['bedrockAgentCoreToolName'].split('___', 1)[-1]
-        logger.debug(f"Tool name from context: {tool_name}")
-        
-        # ツールに基づいて関数を実行
-        if tool_name == "AddPolicy":
-            result = add_policy(parameters)
-        elif tool_name == "UpdatePolicy":
-            result = update_policy(parameters)
-        elif tool_name == "DeletePolicy":
-            result = delete_policy(parameters)
-        elif tool_name == "GetPolicies":
-            result = get_policies(parameters)
-        else:
-            raise ValueError(f"Unknown operation: {tool_name}")
-        
-        logger.info(f"Operation completed successfully: {tool_name}")
-        return result
-
-    except ValueError as e:
-        # バリデーションエラー
-        error_msg = f"Validation error: {str(e)}"
-        logger.warning(error_msg)
-        return {
-            "success": False,
-            "error": error_msg,
-            "errorType": "ValidationError"
-        }
-    except ClientError as e:
-        # DynamoDBエラー
-        error_code = e.response.get("Error", {}).get("Code", "Unknown")
-        error_msg = f"Database error ({error_code}): {str(e)}"
-        logger.error(error_msg)
-        return {
-            "success": False,
-            "error": "データベースエラーが発生しました。しばらくしてから再度お試しください。",
-            "errorType": "DatabaseError",
-            "errorCode": error_code
-        }
-    except Exception as e:
-        # その他のエラー
-        error_msg = f"Unexpected error: {str(e)}"
-        logger.error(error_msg)
-        return {
-            "success": False,
-            "error": "予期しないエラーが発生しました。しばらくしてから再度お試しください。",
-            "errorType": "InternalError"
-        }
+    return handle_tool_call(event, context, TOOL_OPERATIONS, "policyId", "health policy", logger)
 
 
 def add_policy(parameters: Dict[str, Any]) -> Dict[str, Any]:
     """
     新しい健康ポリシーを作成
-    
+
     Args:
-        parameters: userId, policyType, title, description, rules, 
+        parameters: userId, policyType, title, description, rules,
                    startDate(optional), endDate(optional)
 
     Returns:
@@ -139,32 +79,23 @@ def add_policy(parameters: Dict[str, Any]) -> Dict[str, Any]:
         ValueError: 必須パラメータが不足している場合
         ClientError: DynamoDB操作でエラーが発生した場合
     """
-    user_id = parameters.get("userId")
-    policy_type = parameters.get("policyType")
+    ADD_POLICY_SCHEMA.validate(parameters)
+
+    user_id = parameters["userId"]
+    policy_type = parameters["policyType"]
     title = parameters.get("title")
     description = parameters.get("description", "")
     rules = parameters.get("rules", parameters.get("parameters", {}))  # rulesまたはparametersフィールドを使用
     start_date = parameters.get("startDate")
     end_date = parameters.get("endDate")
 
-    # 必須パラメータの検証
-    if not user_id:
-        raise ValueError("userId is required")
-    if not policy_type:
-        raise ValueError("policyType is required")
-    
     # titleがない場合はデフォルト値を設定
     if not title:
         title = f"{policy_type.capitalize()} Policy"
-    
-    # policyTypeの検証
-    valid_policy_types = ['diet', 'exercise', 'sleep', 'fasting', 'restriction', 'other']
-    if policy_type not in valid_policy_types:
-        raise ValueError(f"policyType must be one of: {', '.join(valid_policy_types)}")
 
     # UUIDでpolicyIdを生成
-    policy_id = str(uuid.uuid4())
-    now = datetime.now(timezone.utc).isoformat()
+    policy_id = new_item_id()
+    now = utc_now_iso()
 
     logger.debug(f"Creating policy: {policy_id} for user: {user_id}")
 
@@ -187,22 +118,16 @@ def add_policy(parameters: Dict[str, Any]) -> Dict[str, Any]:
     if end_date:
         item["endDate"] = end_date
 
-    try:
-        # DynamoDBに保存
-        table.put_item(Item=item)
-        
-        logger.info(f"Policy created successfully: {policy_id}")
-        return {
-            "success": True,
-            "policyId": policy_id,
-            "message": "健康ポリシーを作成しました",
-            "policy": item
-        }
+    # DynamoDBに保存
+    _policies.put(item)
 
-    except ClientError as e:
-        error_code = e.response.get("Error", {}).get("Code", "Unknown")
-        logger.error(f"DynamoDB error in add_policy: {error_code} - {str(e)}")
-        raise
+    logger.debug(f"Policy created successfully: {policy_id}")
+    return {
+        "success": True,
+        "policyId": policy_id,
+        "message": "健康ポリシーを作成しました",
+        "policy": item
+    }
 
 
 def update_policy(parameters: Dict[str, Any]) -> Dict[str, Any]:
@@ -210,107 +135,53 @@ def update_policy(parameters: Dict[str, Any]) -> Dict[str, Any]:
     既存の健康ポリシーを更新
 
     Args:
-        parameters: userId, policyId, title(optional), description(optional), 
-                   rules(optional), isActive(optional), startDate(optional), endDate(optional)
+        parameters: userId, policyId, title(optional), description(optional),
+                   rules(optional), isActive(optional), startDate(optional), endDate(optional),
+                   returnUpdated(optional: falseの場合は更新後のポリシーを返さない)
 
     Returns:
         更新結果
 
     Raises:
-        ValueError: 必須パラメータが不足している場合
+        ValueError: 必須パラメータが不足している場合、またはポリシーが存在しない場合
         ClientError: DynamoDB操作でエラーが発生した場合
     """
-    user_id = parameters.get("userId")
-    policy_id = parameters.get("policyId")
-    title = parameters.get("title")
-    description = parameters.get("description")
-    rules = parameters.get("rules")
-    is_active = parameters.get("isActive")
-    start_date = parameters.get("startDate")
-    end_date = parameters.get("endDate")
+    UPDATE_POLICY_SCHEMA.validate(parameters)
 
-    if not user_id:
-        raise ValueError("userId is required")
-    if not policy_id:
-        raise ValueError("policyId is required")
+    user_id = parameters["userId"]
+    policy_id = parameters["policyId"]
+    is_active = parameters.get("isActive")
 
     logger.debug(f"Updating policy: {policy_id} for user: {user_id}")
 
-    # 更新式を構築
-    update_expression_parts = []
-    expression_attribute_values = {}
-
-    if title is not None:
-        update_expression_parts.append("title = :title")
-        expression_attribute_values[":title"] = title
-
-    if description is not None:
-        update_expression_parts.append("description = :description")
-        expression_attribute_values[":description"] = description
-
-    if rules is not None:
-        update_expression_parts.append("rules = :rules")
-        expression_attribute_values[":rules"] = rules
-
+    values = parameters
     if is_active is not None:
-        update_expression_parts.append("isActive = :isActive")
         # ブール値を文字列に変換（GSI対応）
-        expression_attribute_values[":isActive"] = "true" if is_active else "false"
-
-    if start_date is not None:
-        update_expression_parts.append("startDate = :startDate")
-        expression_attribute_values[":startDate"] = start_date
-
-    if end_date is not None:
-        update_expression_parts.append("endDate = :endDate")
-        expression_attribute_values[":endDate"] = end_date
-
-    # updatedAtは常に更新
-    now = datetime.now(timezone.utc).isoformat()
-    update_expression_parts.append("updatedAt = :updatedAt")
-    expression_attribute_values[":updatedAt"] = now
-
-    if len(update_expression_parts) == 1:  # updatedAtのみの場合
-        raise ValueError("At least one field to update is required")
-
-    update_expression = "SET " + ", ".join(update_expression_parts)
-
-    try:
-        # ポリシーが存在することを確認しながら更新
-        response = table.update_item(
-            Key={"userId": user_id, "policyId": policy_id},
-            UpdateExpression=update_expression,
-            ExpressionAttributeValues=expression_attribute_values,
-            ConditionExpression="attribute_exists(userId) AND attribute_exists(policyId)",
-            ReturnValues="ALL_NEW",
-        )
-        
-        updated_policy = response["Attributes"]
-        logger.info(f"Policy updated successfully: {policy_id}")
-        
-        return {
-            "success": True,
-            "policyId": policy_id,
-            "message": "健康ポリシーを更新しました",
-            "policy": updated_policy
-        }
-
-    except ClientError as e:
-        error_code = e.response.get("Error", {}).get("Code", "Unknown")
-        if error_code == "ConditionalCheckFailedException":
-            logger.warning(f"Policy not found for update: {policy_id}")
-            raise ValueError(f"Policy not found: {policy_id}")
-        else:
-            logger.error(f"DynamoDB error in update_policy: {error_code} - {str(e)}")
-            raise
+        values = {**parameters, "isActive": "true" if is_active else "false"}
+
+    return_updated = parameters.get("returnUpdated") is not False
+    updated_policy = _policies.update(user_id, policy_id, values, return_updated)
+
+    logger.debug(f"Policy updated successfully: {policy_id}")
+    result = {
+        "success": True,
+        "policyId": policy_id,
+        "message": "健康ポリシーを更新しました"
+    }
+    if return_updated:
+        result["policy"] = updated_policy
+    return result
 
 
 def delete_policy(parameters: Dict[str, Any]) -> Dict[str, Any]:
     """
     指定した健康ポリシーを削除
 
+    strictがfalse（デフォルト）の場合は条件なしで削除する（冪等）。
+    trueの場合は存在確認を行い、存在しなければエラーとし、削除前の内容を返す。
+
     Args:
-        parameters: userId, policyId
+        parameters: userId, policyId, strict(optional)
 
     Returns:
         削除結果
@@ -319,42 +190,23 @@ def delete_policy(parameters: Dict[str, Any]) -> Dict[str, Any]:
         ValueError: 必須パラメータが不足している場合
         ClientError: DynamoDB操作でエラーが発生した場合
     """
-    user_id = parameters.get("userId")
-    policy_id = parameters.get("policyId")
+    DELETE_POLICY_SCHEMA.validate(parameters)
 
-    if not user_id:
-        raise ValueError("userId is required")
-    if not policy_id:
-        raise ValueError("policyId is required")
+    user_id = parameters["userId"]
+    policy_id = parameters["policyId"]
+    strict = parameters.get("strict") or False
 
     logger.debug(f"Deleting policy: {policy_id} for user: {user_id}")
 
-    try:
-        # ポリシーが存在することを確認しながら削除
-        response = table.delete_item(
-            Key={"userId": user_id, "policyId": policy_id},
-            ConditionExpression="attribute_exists(userId) AND attribute_exists(policyId)",
-            ReturnValues="ALL_OLD"
-        )
-        
-        deleted_policy = response.get("Attributes")
-        logger.info(f"Policy deleted successfully: {policy_id}")
-        
-        return {
-            "success": True,
-            "policyId": policy_id,
-            "message": "健康ポリシーを削除しました",
-            "deletedPolicy": deleted_policy
-        }
-
-    except ClientError as e:
-        error_code = e.response.get("Error", {}).get("Code", "Unknown")
-        if error_code == "ConditionalCheckFailedException":
-            logger.warning(f"Policy not found for deletion: {policy_id}")
-            raise ValueError(f"Policy not found: {policy_id}")
-        else:
-            logger.error(f"DynamoDB error in delete_policy: {error_code} - {str(e)}")
-            raise
+    deleted_policy = _policies.delete(user_id, policy_id, strict)
+
+    logger.debug(f"Policy deleted successfully: {policy_id}")
+    return {
+        "success": True,
+        "policyId": policy_id,
+        "message": "健康ポリシーを削除しました",
+        "deletedPolicy": deleted_policy
+    }
 
 
 def get_policies(parameters: Dict[str, Any]) -> Dict[str, Any]:
@@ -362,10 +214,13 @@ def get_policies(parameters: Dict[str, Any]) -> Dict[str, Any]:
     ユーザーのすべての健康ポリシーを取得
 
     Args:
-        parameters: userId
+        parameters: userId, fields(optional: 取得する属性名のリスト),
+                   limit(optional: 1ページの最大件数), cursor(optional: 前ページのnextCursor),
+                   freshness(optional: now|recent|any 読み取り鮮度、デフォルト: now)
 
     Returns:
-        健康ポリシーのリスト
+        健康ポリシーのリスト（fields指定時は指定属性とキー属性のみ）
+        limit指定時に続きがある場合はnextCursorを含む
 
     Raises:
         ValueError: userIdが指定されていない場合
@@ -378,24 +233,30 @@ def get_policies(parameters: Dict[str, Any]) -> Dict[str, Any]:
 
     logger.debug(f"Retrieving policies for user: {user_id}")
 
-    try:
-        # userIdでクエリしてすべてのポリシーを取得
-        response = table.query(
-            KeyConditionExpression="userId = :userId",
-            ExpressionAttributeValues={":userId": user_id}
-        )
-
-        policies = response.get("Items", [])
-        logger.info(f"Retrieved {len(policies)} policies for user: {user_id}")
-
-        return {
-            "success": True,
-            "userId": user_id,
-            "policies": policies,
-            "count": len(policies)
-        }
-
-    except ClientError as e:
-        error_code = e.response.get("Error", {}).get("Code", "Unknown")
-        logger.error(f"DynamoDB error in get_policies: {error_code} - {str(e)}")
-        raise
+    policies, next_cursor = _policies.list(
+        user_id,
+        fields=parameters.get("fields"),
+        limit=parameters.get("limit"),
+        cursor=parameters.get("cursor"),
+        freshness=parameters.get("freshness"),
+    )
+
+    logger.debug(f"Retrieved {len(policies)} policies for user: {user_id}")
+    result = {
+        "success": True,
+        "userId": user_id,
+        "policies": policies,
+        "count": len(policies)
+    }
+    if next_cursor:
+        result["nextCursor"] = next_cursor
+    return result
+
+
+# ツール名と処理関数の対応表（lambda_handlerでのディスパッチに使用）
+TOOL_OPERATIONS = {
+    "AddPolicy": add_policy,
+    "UpdatePolicy": update_policy,
+    "DeletePolicy": delete_policy,
+    "GetPolicies": get_policies,
+}
@@ -14,25 +14,35 @@ AgentCore Gateway（MCP）から呼び出され、DynamoDBで日記データのC
 要件: 要件1（日記作成）、要件2（データ永続化）、要件3（日記取得）、要件4（日記更新）、要件5（日記削除）、要件6（MCPツール）、要件7（データ検証）
 """
 
-import json
 import os
 import re
+import time
 import logging
-from datetime import datetime, timezone, date, timedelta
+from datetime import datetime, date, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
+from shared.crud import deserialize_item, json_dumps, send_batch_with_retries, serialize_item, utc_now_iso
+
 # ログ設定
 log_level = os.environ.get("LOG_LEVEL", "INFO")
 logger = logging.getLogger(__name__)
 logger.setLevel(getattr(logging, log_level.upper()))
 
-# CloudWatch Logsハンドラーが自動的に設定されるため、追加設定は不要
+# CloudWatch Logsハンドラーはランタイムがルートロガーに設定する
+# そのハンドラーを直接登録して伝播を止め、レコードごとのロガー階層の走査を省く
+# （ハンドラーが未設定のローカル実行・テストでは従来どおりルートロガーに伝播させる）
+for _handler in logging.getLogger().handlers:
+    logger.addHandler(_handler)
+if logger.handlers:
+    logger.propagate = False
 
 # DynamoDBクライアント（指数バックオフ付き再試行設定）
-from botocore.config import Config
-
 config = Config(
     retries={
         "max_attempts": 3,
@@ -40,9 +50,48 @@ config = Config(
     }
 )
 
-dynamodb = boto3.resource("dynamodb", config=config)
+# 低レベルクライアントを使用（リソースAPIのモデル読み込み・変換レイヤーを経由しない）
+ddb = boto3.client("dynamodb", config=config)
 table_name = os.environ.get("JOURNALS_TABLE_NAME", "healthmate-journals")
-table = dynamodb.Table(table_name)
+
+# 日付範囲クエリの式（呼び出しごとの条件オブジェクト生成・文字列化を避ける）
+_RANGE_KCE = "userId = :u AND #d BETWEEN :s AND :e"
+_EAN = {"#d": "date"}  # dateは予約語のため
+
+# 取得時はレスポンスに含める属性のみを読み取る
+_PROJ = "userId, #d, content, moodScore, tags, createdAt, updatedAt"
+
+# 1日1件・最大10000文字のため、この日数を超える範囲は1MB（Queryの1ページ）を超え得る
+# その場合は範囲を分割して並列にクエリする（DynamoDBクライアントはスレッドセーフ）
+PARALLEL_QUERY_MIN_DAYS = 100
+RANGE_QUERY_WORKERS = 4
+
+# BatchGetItemで一度に取得できる最大キー数（dates指定時の上限）
+MAX_BATCH_GET_DATES = 100
+
+# 入力検証用の正規表現（モジュール読み込み時に一度だけコンパイル）
+_TAG_RE = re.compile(r'^[A-Z][a-zA-Z0-9]*$')  # PascalCase
+
+# 未来日付チェック用の「明日」の日付キャッシュ（[明日の日付, 有効期限のエポック秒]）
+_tomorrow_cache: List[Any] = [None, 0.0]
+
+
+def _warm_up_client() -> None:
+    """
+    DynamoDBクライアントのウォームアップ（EAGER_WARM=1の場合のみ、INITフェーズで実行）
+
+    軽量なDescribeEndpointsを呼び出し、認証情報の解決・SigV4署名・エンドポイント解決・
+    TLS接続の確立を最初のリクエストの課金対象レイテンシーから外す。
+    失敗してもリクエスト処理には影響しないため、例外はログに残して無視する。
+    """
+    try:
+        ddb.describe_endpoints()
+    except Exception as e:
+        logger.warning("DynamoDB client warm-up failed: %s", e)
+
+
+if os.environ.get("EAGER_WARM") == "1":
+    _warm_up_client()
 
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -59,39 +108,33 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Returns:
         MCP形式のレスポンス
     """
-    logger.debug(f"Received event: {json.dumps(event, default=str)}")
+    # DEBUG無効時はイベント全体のJSON変換を行わない
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Received event: %s", json_dumps(event))
 
     try:
         # AgentCore Gateway（MCP）形式のイベントを処理
-        # eventには直接パラメータが含まれる
-        parameters = event.copy()
+        # eventには直接パラメータが含まれる（各処理関数は読み取りのみのためコピー不要）
+        parameters = event
         
         # userIdの検証（必須）
         if "userId" not in parameters:
             raise ValueError("userId is required for all journal operations")
         
         user_id = parameters["userId"]
-        logger.info(f"Processing request for userId: {user_id}")
+        logger.info("Processing request for userId: %s", user_id)
         
         # contextからツール名を取得
         tool_name = context.client_context.custom['bedrockAgentCoreToolName'].split('___', 1)[-1]
-        logger.debug(f"Tool name from context: {tool_name}")
+        logger.debug("Tool name from context: %s", tool_name)
         
         # ツールに基づいて関数を実行
-        if tool_name == "GetJournal":
-            result = get_journal(parameters)
-        elif tool_name == "GetJournalsInRange":
-            result = get_journals_in_range(parameters)
-        elif tool_name == "AddJournal":
-            result = add_journal(parameters)
-        elif tool_name == "UpdateJournal":
-            result = update_journal(parameters)
-        elif tool_name == "DeleteJournal":
-            result = delete_journal(parameters)
-        else:
+        operation = TOOL_OPERATIONS.get(tool_name)
+        if operation is None:
             raise ValueError(f"Unknown operation: {tool_name}")
+        result = operation(parameters)
         
-        logger.info(f"Operation completed successfully: {tool_name}")
+        logger.info("Operation completed successfully: %s", tool_name)
         return result
 
     except ValueError as e:
@@ -125,6 +168,42 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         }
 
 
+def _deserialize_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    AttributeValue形式のアイテムをPython値に変換
+
+    整数値の数値属性（moodScoreなど）はDecimalではなくintとして返す。
+    """
+    journal = deserialize_item(item)
+    for key, value in journal.items():
+        if isinstance(value, Decimal) and value == value.to_integral_value():
+            journal[key] = int(value)
+    return journal
+
+
+def _journal_key(user_id: str, date_str: str) -> Dict[str, Any]:
+    """日記テーブルのキー（userId + date）をAttributeValue形式で構築"""
+    return {"userId": {"S": user_id}, "date": {"S": date_str}}
+
+
+def _journal_response(item: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    AttributeValue形式の日記アイテムからレスポンス用のデータを構築
+
+    キー属性は必ず存在するため添字アクセスで取得する。
+    """
+    journal = _deserialize_item(item)
+    return {
+        "userId": journal["userId"],
+        "date": journal["date"],
+        "content": journal.get("content"),
+        "moodScore": journal.get("moodScore"),
+        "tags": journal.get("tags", []),
+        "createdAt": journal.get("createdAt"),
+        "updatedAt": journal.get("updatedAt")
+    }
+
+
 def get_journal(parameters: Dict[str, Any]) -> Dict[str, Any]:
     """
     特定日の日記エントリーを取得
@@ -149,34 +228,24 @@ def get_journal(parameters: Dict[str, Any]) -> Dict[str, Any]:
 
     # 日付の検証
     validate_date(date_str)
-    logger.info(f"Getting journal for user: {user_id}, date: {date_str}")
+    logger.info("Getting journal for user: %s, date: %s", user_id, date_str)
 
     try:
-        response = table.get_item(
-            Key={
-                "userId": user_id,
-                "date": date_str
-            }
+        response = ddb.get_item(
+            TableName=table_name,
+            Key=_journal_key(user_id, date_str),
+            ProjectionExpression=_PROJ,
+            ExpressionAttributeNames=_EAN,
         )
 
         if "Item" in response:
-            journal = response["Item"]
-            logger.info(f"Journal retrieved successfully: {user_id}, {date_str}")
-            
+            logger.info("Journal retrieved successfully: %s, %s", user_id, date_str)
             return {
                 "success": True,
-                "journal": {
-                    "userId": journal.get("userId"),
-                    "date": journal.get("date"),
-                    "content": journal.get("content"),
-                    "moodScore": journal.get("moodScore"),
-                    "tags": journal.get("tags", []),
-                    "createdAt": journal.get("createdAt"),
-                    "updatedAt": journal.get("updatedAt")
-                }
+                "journal": _journal_response(response["Item"])
             }
         else:
-            logger.info(f"Journal not found: {user_id}, {date_str}")
+            logger.info("Journal not found: %s, %s", user_id, date_str)
             return {
                 "success": False,
                 "message": "指定された日付の日記が見つかりません",
@@ -186,7 +255,7 @@ def get_journal(parameters: Dict[str, Any]) -> Dict[str, Any]:
 
     except ClientError as e:
         error_code = e.response.get("Error", {}).get("Code", "Unknown")
-        logger.error(f"DynamoDB error in get_journal: {error_code} - {str(e)}")
+        logger.error("DynamoDB error in get_journal: %s - %s", error_code, e)
         raise
 
 
@@ -194,8 +263,12 @@ def get_journals_in_range(parameters: Dict[str, Any]) -> Dict[str, Any]:
     """
     日付範囲の日記エントリーを取得（最大365日間）
     
+    datesが指定された場合は範囲クエリの代わりに指定日のみをBatchGetItemで取得する
+    （記録がまばらな期間の読み取りに使用）。
+    
     Args:
-        parameters: userId, startDate, endDate
+        parameters: userId, startDate, endDate,
+                   dates(optional: 取得する日付のリスト、最大100件。指定時はstartDate/endDate不要)
 
     Returns:
         日記エントリーのリスト（時系列順）
@@ -207,9 +280,12 @@ def get_journals_in_range(parameters: Dict[str, Any]) -> Dict[str, Any]:
     user_id = parameters.get("userId")
     start_date = parameters.get("startDate")
     end_date = parameters.get("endDate")
+    dates = parameters.get("dates")
 
     if not user_id:
         raise ValueError("userId is required")
+    if dates is not None:
+        return _get_journals_by_dates(user_id, dates)
     if not start_date:
         raise ValueError("startDate is required")
     if not end_date:
@@ -220,8 +296,8 @@ def get_journals_in_range(parameters: Dict[str, Any]) -> Dict[str, Any]:
     validate_date(end_date)
     
     # 日付範囲の検証
-    start_date_obj = datetime.strptime(start_date, '%Y-%m-%d').date()
-    end_date_obj = datetime.strptime(end_date, '%Y-%m-%d').date()
+    start_date_obj = date.fromisoformat(start_date)
+    end_date_obj = date.fromisoformat(end_date)
     
     if start_date_obj > end_date_obj:
         raise ValueError("startDate must be before or equal to endDate")
@@ -231,34 +307,19 @@ def get_journals_in_range(parameters: Dict[str, Any]) -> Dict[str, Any]:
     if date_range > 365:
         raise ValueError("Date range cannot exceed 365 days")
 
-    logger.info(f"Getting journals for user: {user_id}, range: {start_date} to {end_date} ({date_range} days)")
+    logger.info("Getting journals for user: %s, range: %s to %s (%s days)", user_id, start_date, end_date, date_range)
 
     try:
-        # DynamoDBクエリ（日付範囲）
-        response = table.query(
-            KeyConditionExpression=boto3.dynamodb.conditions.Key('userId').eq(user_id) & 
-                                 boto3.dynamodb.conditions.Key('date').between(start_date, end_date)
-        )
-
-        journals = response.get("Items", [])
-        
-        # 日付順でソート（時系列順）
-        journals.sort(key=lambda x: x.get("date", ""))
-        
-        logger.info(f"Retrieved {len(journals)} journals for user: {user_id}")
+        if date_range > PARALLEL_QUERY_MIN_DAYS:
+            # 長い範囲は連続する部分範囲に分割して並列にクエリし、時系列順のまま連結する
+            sub_ranges = _split_date_range(start_date_obj, end_date_obj, RANGE_QUERY_WORKERS)
+            with ThreadPoolExecutor(max_workers=len(sub_ranges)) as executor:
+                results = executor.map(lambda sub_range: _query_journal_range(user_id, *sub_range), sub_ranges)
+                journal_list = [journal for result in results for journal in result]
+        else:
+            journal_list = _query_journal_range(user_id, start_date, end_date)
         
-        # レスポンス用のデータを構築
-        journal_list = []
-        for journal in journals:
-            journal_list.append({
-                "userId": journal.get("userId"),
-                "date": journal.get("date"),
-                "content": journal.get("content"),
-                "moodScore": journal.get("moodScore"),
-                "tags": journal.get("tags", []),
-                "createdAt": journal.get("createdAt"),
-                "updatedAt": journal.get("updatedAt")
-            })
+        logger.info("Retrieved %s journals for user: %s", len(journal_list), user_id)
         
         return {
             "success": True,
@@ -273,9 +334,150 @@ def get_journals_in_range(parameters: Dict[str, Any]) -> Dict[str, Any]:
 
     except ClientError as e:
         error_code = e.response.get("Error", {}).get("Code", "Unknown")
-        logger.error(f"DynamoDB error in get_journals_in_range: {error_code} - {str(e)}")
+        logger.error("DynamoDB error in get_journals_in_range: %s - %s", error_code, e)
+        raise
+
+
+def _query_journal_range(user_id: str, start_date: str, end_date: str) -> List[Dict[str, Any]]:
+    """
+    日付範囲の日記エントリーをQueryで取得（全ページ）
+    
+    Args:
+        user_id: ユーザーID
+        start_date: 開始日（YYYY-MM-DD形式）
+        end_date: 終了日（YYYY-MM-DD形式）
+
+    Returns:
+        レスポンス用の日記エントリーのリスト（時系列順）
+
+    Raises:
+        ClientError: DynamoDB操作でエラーが発生した場合
+    """
+    query_params = {
+        "TableName": table_name,
+        "KeyConditionExpression": _RANGE_KCE,
+        "ProjectionExpression": _PROJ,
+        "ExpressionAttributeNames": _EAN,
+        "ExpressionAttributeValues": {
+            ":u": {"S": user_id},
+            ":s": {"S": start_date},
+            ":e": {"S": end_date},
+        },
+    }
+
+    # Queryはソートキー（date）の昇順で返すため、時系列順の並べ替えは不要
+    # 1MBを超える場合も1回の呼び出しで全件を返すため、LastEvaluatedKeyがなくなるまで取得する
+    # 取得したアイテムは1回の走査でレスポンス用のデータに変換する
+    journal_list = []
+    while True:
+        response = ddb.query(**query_params)
+        journal_list.extend(_journal_response(item) for item in response.get("Items", []))
+
+        last_evaluated_key = response.get("LastEvaluatedKey")
+        if not last_evaluated_key:
+            return journal_list
+        query_params["ExclusiveStartKey"] = last_evaluated_key
+
+
+def _split_date_range(start: date, end: date, parts: int) -> List[tuple]:
+    """
+    日付範囲を重複のない連続した部分範囲に分割
+    
+    Args:
+        start: 開始日
+        end: 終了日
+        parts: 分割数
+
+    Returns:
+        (開始日, 終了日)のYYYY-MM-DD文字列タプルのリスト（時系列順）
+    """
+    days = (end - start).days + 1
+    step = -(-days // parts)  # 切り上げ
+    sub_ranges = []
+    sub_start = start
+    while sub_start <= end:
+        sub_end = min(sub_start + timedelta(days=step - 1), end)
+        sub_ranges.append((sub_start.isoformat(), sub_end.isoformat()))
+        sub_start = sub_end + timedelta(days=1)
+    return sub_ranges
+
+
+def _get_journals_by_dates(user_id: str, dates: Any) -> Dict[str, Any]:
+    """
+    指定した日付の日記エントリーをBatchGetItemで取得
+    
+    未処理キーはshared.crud.send_batch_with_retriesで再取得する。
+    BatchGetItemは返却順序を保証しないため、結果は日付順に並べ替える。
+    
+    Args:
+        user_id: ユーザーID
+        dates: YYYY-MM-DD形式の日付文字列のリスト（最大100件）
+
+    Returns:
+        日記エントリーのリスト（時系列順）
+
+    Raises:
+        ValueError: datesが不正な場合、または日付の検証に失敗した場合
+        ClientError: DynamoDB操作でエラーが発生した場合
+        RuntimeError: 再試行後も未処理のキーが残った場合
+    """
+    if not dates or not isinstance(dates, list):
+        raise ValueError("dates must be a non-empty list")
+    if len(dates) > MAX_BATCH_GET_DATES:
+        raise ValueError(f"dates must contain at most {MAX_BATCH_GET_DATES} items")
+
+    for date_str in dates:
+        validate_date(date_str)
+
+    # BatchGetItemは重複キーを受け付けないため、重複を除いて日付順に並べる
+    unique_dates = sorted(set(dates))
+
+    logger.info("Getting journals for user: %s, dates: %s", user_id, len(unique_dates))
+
+    request_items = {
+        table_name: {
+            "Keys": [_journal_key(user_id, date_str) for date_str in unique_dates],
+            "ProjectionExpression": _PROJ,
+            "ExpressionAttributeNames": _EAN,
+        }
+    }
+
+    journal_list = []
+
+    def send(unprocessed: Dict[str, Any]) -> Dict[str, Any]:
+        response = ddb.batch_get_item(RequestItems=unprocessed)
+        journal_list.extend(
+            _journal_response(item) for item in response.get("Responses", {}).get(table_name, [])
+        )
+        return response
+
+    try:
+        request_items = send_batch_with_retries(send, request_items, "UnprocessedKeys")
+        if request_items:
+            unprocessed_count = len(request_items.get(table_name, {}).get("Keys", []))
+            logger.error("Unprocessed keys remain after retries: %s for user: %s", unprocessed_count, user_id)
+            raise RuntimeError(f"{unprocessed_count} journals could not be read")
+
+    except ClientError as e:
+        error_code = e.response.get("Error", {}).get("Code", "Unknown")
+        logger.error("DynamoDB error in get_journals_in_range: %s - %s", error_code, e)
         raise
 
+    journal_list.sort(key=lambda journal: journal["date"])
+
+    logger.info("Retrieved %s journals for user: %s", len(journal_list), user_id)
+
+    return {
+        "success": True,
+        "journals": journal_list,
+        "count": len(journal_list),
+        "dateRange": {
+            "startDate": unique_dates[0],
+            "endDate": unique_dates[-1],
+            "days": (date.fromisoformat(unique_dates[-1]) - date.fromisoformat(unique_dates[0])).days + 1
+        }
+    }
+
 
 def add_journal(parameters: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -305,7 +507,7 @@ def add_journal(parameters: Dict[str, Any]) -> Dict[str, Any]:
     # 日付が指定されていない場合は今日の日付を使用
     if not date_str:
         date_str = date.today().strftime('%Y-%m-%d')
-        logger.debug(f"Using current date: {date_str}")
+        logger.debug("Using current date: %s", date_str)
     else:
         validate_date(date_str)
 
@@ -319,22 +521,42 @@ def add_journal(parameters: Dict[str, Any]) -> Dict[str, Any]:
     # タグの検証
     validate_tags(tags)
 
-    logger.info(f"Adding journal for user: {user_id}, date: {date_str}")
+    logger.info("Adding journal for user: %s, date: %s", user_id, date_str)
+
+    now = utc_now_iso()
+
+    # 新規エントリー
+    item = {
+        "userId": user_id,
+        "date": date_str,
+        "content": content,
+        "createdAt": now,
+        "updatedAt": now,
+        "tags": tags
+    }
 
-    now = datetime.now(timezone.utc).isoformat()
+    # 気分スコアが提供された場合のみ追加
+    if mood_score is not None:
+        item["moodScore"] = mood_score
 
     try:
-        # 既存エントリーの確認
-        existing_response = table.get_item(
-            Key={
-                "userId": user_id,
-                "date": date_str
-            }
-        )
-        
-        if "Item" in existing_response:
-            # 既存エントリーに追記
-            existing_journal = existing_response["Item"]
+        try:
+            # 存在しない場合のみ作成（既存エントリーの事前取得を省き、1回の書き込みで完了させる）
+            ddb.put_item(
+                TableName=table_name,
+                Item=serialize_item(item),
+                ConditionExpression="attribute_not_exists(userId)",
+                ReturnValuesOnConditionCheckFailure="ALL_OLD",
+            )
+            logger.info("Creating new journal: %s, %s", user_id, date_str)
+            operation = "作成"
+
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+                raise
+
+            # 既存エントリーに追記（条件違反時に返される既存アイテムを使用）
+            existing_journal = _deserialize_item(e.response.get("Item", {}))
             existing_content = existing_journal.get("content", "")
             
             # 既存コンテンツに新しいコンテンツを追記
@@ -366,31 +588,11 @@ def add_journal(parameters: Dict[str, Any]) -> Dict[str, Any]:
             else:
                 item["tags"] = []
             
-            logger.info(f"Appending to existing journal: {user_id}, {date_str}")
+            ddb.put_item(TableName=table_name, Item=serialize_item(item))
+            logger.info("Appending to existing journal: %s, %s", user_id, date_str)
             operation = "追記"
-            
-        else:
-            # 新規エントリー作成
-            item = {
-                "userId": user_id,
-                "date": date_str,
-                "content": content,
-                "createdAt": now,
-                "updatedAt": now,
-                "tags": tags
-            }
-            
-            # 気分スコアが提供された場合のみ追加
-            if mood_score is not None:
-                item["moodScore"] = mood_score
-            
-            logger.info(f"Creating new journal: {user_id}, {date_str}")
-            operation = "作成"
-
-        # アイテムを保存
-        table.put_item(Item=item)
         
-        logger.info(f"Journal {operation} successfully: {user_id}, {date_str}")
+        logger.info("Journal %s successfully: %s, %s", operation, user_id, date_str)
         
         # レスポンス用のデータを構築
         journal_response = {
@@ -414,7 +616,7 @@ def add_journal(parameters: Dict[str, Any]) -> Dict[str, Any]:
 
     except ClientError as e:
         error_code = e.response.get("Error", {}).get("Code", "Unknown")
-        logger.error(f"DynamoDB error in add_journal: {error_code} - {str(e)}")
+        logger.error("DynamoDB error in add_journal: %s - %s", error_code, e)
         raise
 
 
@@ -458,7 +660,7 @@ def update_journal(parameters: Dict[str, Any]) -> Dict[str, Any]:
     if tags is not None:
         validate_tags(tags)
 
-    logger.info(f"Updating journal for user: {user_id}, date: {date_str}")
+    logger.info("Updating journal for user: %s, date: %s", user_id, date_str)
 
     # 更新式を構築
     update_expression_parts = []
@@ -468,12 +670,12 @@ def update_journal(parameters: Dict[str, Any]) -> Dict[str, Any]:
     if content is not None:
         update_expression_parts.append("content = :content")
         expression_attribute_values[":content"] = content
-        logger.debug(f"Updating content")
+        logger.debug("Updating content")
 
     if mood_score is not None:
         update_expression_parts.append("moodScore = :moodScore")
         expression_attribute_values[":moodScore"] = mood_score
-        logger.debug(f"Updating moodScore to: {mood_score}")
+        logger.debug("Updating moodScore to: %s", mood_score)
 
     if tags is not None:
         if tags == []:  # 空配列の場合は削除
@@ -482,10 +684,10 @@ def update_journal(parameters: Dict[str, Any]) -> Dict[str, Any]:
         else:
             update_expression_parts.append("tags = :tags")
             expression_attribute_values[":tags"] = tags
-            logger.debug(f"Updating tags to: {tags}")
+            logger.debug("Updating tags to: %s", tags)
 
     # updatedAtは常に更新
-    now = datetime.now(timezone.utc).isoformat()
+    now = utc_now_iso()
     update_expression_parts.append("updatedAt = :updatedAt")
     expression_attribute_values[":updatedAt"] = now
 
@@ -500,20 +702,18 @@ def update_journal(parameters: Dict[str, Any]) -> Dict[str, Any]:
 
     try:
         # 日記エントリーが存在することを確認しながら更新
-        response = table.update_item(
-            Key={
-                "userId": user_id,
-                "date": date_str
-            },
+        response = ddb.update_item(
+            TableName=table_name,
+            Key=_journal_key(user_id, date_str),
             UpdateExpression=update_expression,
-            ExpressionAttributeValues=expression_attribute_values if expression_attribute_values else None,
+            ExpressionAttributeValues=serialize_item(expression_attribute_values),
             ConditionExpression="attribute_exists(userId) AND attribute_exists(#date)",
             ExpressionAttributeNames={"#date": "date"},  # dateは予約語のため
             ReturnValues="ALL_NEW",
         )
         
-        updated_journal = response["Attributes"]
-        logger.info(f"Journal updated successfully: {user_id}, {date_str}")
+        updated_journal = _deserialize_item(response["Attributes"])
+        logger.info("Journal updated successfully: %s, %s", user_id, date_str)
         
         # レスポンス用のデータを構築
         journal_response = {
@@ -538,10 +738,10 @@ def update_journal(parameters: Dict[str, Any]) -> Dict[str, Any]:
     except ClientError as e:
         error_code = e.response.get("Error", {}).get("Code", "Unknown")
         if error_code == "ConditionalCheckFailedException":
-            logger.warning(f"Journal not found for update: {user_id}, {date_str}")
+            logger.warning("Journal not found for update: %s, %s", user_id, date_str)
             raise ValueError(f"Journal not found for date: {date_str}")
         else:
-            logger.error(f"DynamoDB error in update_journal: {error_code} - {str(e)}")
+            logger.error("DynamoDB error in update_journal: %s - %s", error_code, e)
             raise
 
 
@@ -569,23 +769,21 @@ def delete_journal(parameters: Dict[str, Any]) -> Dict[str, Any]:
 
     # 日付の検証
     validate_date(date_str)
-    logger.info(f"Deleting journal for user: {user_id}, date: {date_str}")
+    logger.info("Deleting journal for user: %s, date: %s", user_id, date_str)
 
     try:
         # 日記エントリーが存在することを確認しながら削除
-        response = table.delete_item(
-            Key={
-                "userId": user_id,
-                "date": date_str
-            },
+        response = ddb.delete_item(
+            TableName=table_name,
+            Key=_journal_key(user_id, date_str),
             ConditionExpression="attribute_exists(userId) AND attribute_exists(#date)",
             ExpressionAttributeNames={"#date": "date"},  # dateは予約語のため
             ReturnValues="ALL_OLD"
         )
         
         if "Attributes" in response:
-            deleted_journal = response["Attributes"]
-            logger.info(f"Journal deleted successfully: {user_id}, {date_str}")
+            deleted_journal = _deserialize_item(response["Attributes"])
+            logger.info("Journal deleted successfully: %s, %s", user_id, date_str)
             
             return {
                 "success": True,
@@ -602,7 +800,7 @@ def delete_journal(parameters: Dict[str, Any]) -> Dict[str, Any]:
             }
         else:
             # この状況は通常発生しないが、安全のため
-            logger.info(f"Journal deleted (no return data): {user_id}, {date_str}")
+            logger.info("Journal deleted (no return data): %s, %s", user_id, date_str)
             return {
                 "success": True,
                 "message": "日記を削除しました",
@@ -613,17 +811,37 @@ def delete_journal(parameters: Dict[str, Any]) -> Dict[str, Any]:
     except ClientError as e:
         error_code = e.response.get("Error", {}).get("Code", "Unknown")
         if error_code == "ConditionalCheckFailedException":
-            logger.warning(f"Journal not found for deletion: {user_id}, {date_str}")
+            logger.warning("Journal not found for deletion: %s, %s", user_id, date_str)
             raise ValueError(f"Journal not found for date: {date_str}")
         else:
-            logger.error(f"DynamoDB error in delete_journal: {error_code} - {str(e)}")
+            logger.error("DynamoDB error in delete_journal: %s - %s", error_code, e)
             raise
 
 
+def _tomorrow() -> date:
+    """
+    今日の翌日の日付を返す
+
+    日付が変わるまではコンテナ内のキャッシュを返し、呼び出しごとのdate.today()を避ける。
+
+    Returns:
+        明日の日付
+    """
+    if time.time() >= _tomorrow_cache[1]:
+        tomorrow = date.today() + timedelta(days=1)
+        _tomorrow_cache[0] = tomorrow
+        # 明日の0時（ローカル時刻、LambdaではUTC）まで有効
+        _tomorrow_cache[1] = datetime.combine(tomorrow, datetime.min.time()).timestamp()
+    return _tomorrow_cache[0]
+
+
 def validate_date(date_str: str) -> None:
     """
     日付の検証を行う
     
+    検証結果は（日付文字列, 明日の日付）をキーにキャッシュするため、
+    同じ日付の繰り返し検証は解析を省略し、日付が変わるとキャッシュキーも変わる。
+    
     Args:
         date_str: YYYY-MM-DD形式の日付文字列
         
@@ -633,26 +851,40 @@ def validate_date(date_str: str) -> None:
     if not isinstance(date_str, str):
         raise ValueError("日付は文字列で入力してください")
     
-    # 形式チェック（YYYY-MM-DD）
-    if not re.match(r'^\d{4}-\d{2}-\d{2}$', date_str):
+    _validate_date_string(date_str, _tomorrow())
+
+
+@lru_cache(maxsize=512)
+def _validate_date_string(date_str: str, tomorrow: date) -> None:
+    """
+    日付文字列の形式・妥当性・未来日付を検証（成功した結果のみキャッシュされる）
+    
+    Args:
+        date_str: YYYY-MM-DD形式の日付文字列
+        tomorrow: 未来日付チェックの基準となる明日の日付
+        
+    Raises:
+        ValueError: 無効な日付形式または値の場合
+    """
+    # 形式チェック（YYYY-MM-DD）: 正規表現・strptimeを使わず1回の走査で判定
+    if (
+        len(date_str) != 10
+        or date_str[4] != "-"
+        or date_str[7] != "-"
+        or not date_str.isascii()
+        or not (date_str[0:4] + date_str[5:7] + date_str[8:10]).isdigit()
+    ):
         raise ValueError("日付はYYYY-MM-DD形式で入力してください")
     
     try:
-        # 日付の妥当性チェック
-        date_obj = datetime.strptime(date_str, '%Y-%m-%d').date()
-        
-        # 未来の日付チェック（1日の余裕を持たせてタイムゾーンの問題を回避）
-        today_utc = date.today()
-        tomorrow_utc = today_utc + timedelta(days=1)
-        if date_obj > tomorrow_utc:
-            raise ValueError("日付は過去または今日の日付である必要があります")
-            
-    except ValueError as e:
-        # datetime.strptimeでの解析エラーをキャッチ
-        if "time data" in str(e) or "does not match format" in str(e):
-            raise ValueError("無効な日付です。正しい日付を入力してください")
-        # 既に適切なエラーメッセージの場合はそのまま再発生
-        raise
+        # 日付の妥当性チェック（存在しない月日はdate()がValueErrorを送出）
+        date_obj = date(int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10]))
+    except ValueError:
+        raise ValueError("無効な日付です。正しい日付を入力してください")
+    
+    # 未来の日付チェック（1日の余裕を持たせてタイムゾーンの問題を回避）
+    if date_obj > tomorrow:
+        raise ValueError("日付は過去または今日の日付である必要があります")
 
 
 def validate_mood_score(mood_score: Any) -> None:
@@ -709,13 +941,23 @@ def validate_tags(tags: List[str]) -> None:
     if len(tags) > 10:
         raise ValueError("タグは最大10個まで設定できます")
     
+    # 有効なタグは1回の判定で通過させ、不正なタグの場合のみ原因を判定する
+    # （PascalCase形式の正規表現は空文字・空白のみのタグも不一致となる）
     for tag in tags:
+        if isinstance(tag, str) and _TAG_RE.match(tag):
+            continue
         if not isinstance(tag, str):
             raise ValueError("タグは文字列で入力してください")
-        
         if not tag.strip():
             raise ValueError("空のタグは設定できません")
-        
-        # PascalCase形式の���ェック
-        if not re.match(r'^[A-Z][a-zA-Z0-9]*$', tag):
-            raise ValueError(f"タグ '{tag}' はPascalCase英語形式で入力してください（例: Coding, Happy）")
\ No newline at end of file
+        raise ValueError(f"タグ '{tag}' はPascalCase英語形式で入力してください（例: Coding, Happy）")
+
+
+# ツール名と処理関数の対応表（lambda_handlerでのディスパッチに使用）
+TOOL_OPERATIONS = {
+    "GetJournal": get_journal,
+    "GetJournalsInRange": get_journals_in_range,
+    "AddJournal": add_journal,
+    "UpdateJournal": update_journal,
+    "DeleteJournal": delete_journal,
+}
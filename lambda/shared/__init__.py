@@ -0,0 +1 @@
+# Lambda関数間で共有するモジュール
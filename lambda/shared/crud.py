@@ -0,0 +1,718 @@
+"""
+共通CRUDヘルパー
+
+userId（パーティションキー）とエンティティID（ソートキー）で構成されるテーブルに対する
+作成・更新・削除・一覧取得と、AgentCore Gateway（MCP）ツール呼び出しの共通処理を提供します。
+HealthGoalLambda・HealthPolicyLambdaから利用されます。
+
+すべてのLambda関数はlambdaディレクトリ全体をデプロイパッケージとしているため、
+`shared` パッケージは追加のパッケージング設定なしでインポートできます。
+"""
+
+import base64
+import binascii
+import json
+import logging
+import os
+import random
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from os import urandom
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import boto3
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+try:
+    import orjson
+except ImportError:  # orjsonを同梱していないデプロイでは標準ライブラリのjsonを使用
+    orjson = None
+
+# ログ設定
+log_level = os.environ.get("LOG_LEVEL", "INFO")
+logger = logging.getLogger(__name__)
+logger.setLevel(getattr(logging, log_level.upper()))
+
+# DynamoDBクライアント（アダプティブ再試行・タイムアウト設定）
+config = Config(
+    retries={
+        "max_attempts": 5,
+        "mode": "adaptive",  # 指数バックオフ + クライアント側のレート制御
+    },
+    connect_timeout=1.0,  # ハングした接続でLambdaの実行時間を消費しないよう短めに設定
+    read_timeout=3.0,
+    tcp_keepalive=True,  # ウォーム呼び出し間でTLS接続を再利用
+    max_pool_connections=10,
+)
+
+# 一覧取得結果のコンテナ内キャッシュ設定
+# ウォーム状態のコンテナで同一ユーザーの読み取りが続く場合にDynamoDBへの往復を省く
+CACHE_TTL_SECONDS = 30
+CACHE_MAX_ENTRIES = 256
+
+# 読み取り鮮度（freshness）ごとのキャッシュ許容経過秒数
+# now: キャッシュを使わず強い整合性で読み取る / recent: 既定のTTL / any: 多少古くてもDynamoDBを呼ばない
+# 他コンテナでの書き込みを取りこぼさないよう、既定はnowとし、キャッシュの利用は呼び出し側が明示する
+READ_FRESHNESS_MAX_AGE_SECONDS = {"now": None, "recent": CACHE_TTL_SECONDS, "any": 60}
+DEFAULT_READ_FRESHNESS = "now"
+CACHE_RETENTION_SECONDS = 60
+
+# BatchWriteItemで一度に書き込める最大件数
+MAX_BATCH_WRITE_ITEMS = 25
+
+# BatchWriteItem/BatchGetItemの未処理分の再試行設定（指数バックオフ + ジッター）
+BATCH_RETRY_MAX_ATTEMPTS = 5
+BATCH_RETRY_BASE_DELAY_SECONDS = 0.05
+BATCH_RETRY_MAX_DELAY_SECONDS = 1.0
+
+# limit指定時に1ページで返す最大件数
+MAX_PAGE_SIZE = 100
+
+# 書き込み結果を使わない操作でレスポンスを最小化するためのパラメータ
+MINIMAL_WRITE_RESPONSE = {
+    "ReturnValues": "NONE",
+    "ReturnConsumedCapacity": "NONE",
+    "ReturnItemCollectionMetrics": "NONE",
+}
+
+# DynamoDBの予約語のため、ExpressionAttributeNamesで置き換える属性名
+RESERVED_ATTRIBUTE_NAMES = frozenset({"status"})
+
+if orjson is not None:
+    def json_dumps(obj: Any) -> str:
+        """ログ・カーソル用にJSON文字列化（変換できない値はstrで出力）"""
+        return orjson.dumps(obj, default=str).decode("utf-8")
+
+    _json_loads = orjson.loads
+else:
+    def json_dumps(obj: Any) -> str:
+        """ログ・カーソル用にJSON文字列化（変換できない値はstrで出力）"""
+        return json.dumps(obj, default=str, ensure_ascii=False, separators=(",", ":"))
+
+    _json_loads = json.loads
+
+# 低レベルクライアント用の属性値変換（リソースAPIの変換レイヤーを経由しない）
+# 属性ごとのメソッド参照の解決を避けるため、バインド済みメソッドを保持する
+_serialize_value = TypeSerializer().serialize
+_deserialize_value = TypeDeserializer().deserialize
+
+
+@lru_cache(maxsize=1)
+def get_client():
+    """
+    DynamoDBクライアントを取得（初回呼び出し時に生成してキャッシュ）
+
+    コールドスタート時のINITフェーズでboto3のサービスモデル読み込みを行わないよう、
+    クライアントの生成を最初のDynamoDB操作まで遅延させる。
+
+    Returns:
+        DynamoDB低レベルクライアント
+    """
+    return boto3.client("dynamodb", config=config)
+
+
+def serialize_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Python値の辞書をDynamoDB AttributeValue形式に変換"""
+    return {key: _serialize_value(value) for key, value in item.items()}
+
+
+def deserialize_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """DynamoDB AttributeValue形式の辞書をPython値に変換"""
+    return {key: _deserialize_value(value) for key, value in item.items()}
+
+
+def send_batch_with_retries(
+    send: Callable[[Dict[str, Any]], Dict[str, Any]],
+    request_items: Dict[str, Any],
+    unprocessed_key: str,
+) -> Dict[str, Any]:
+    """
+    BatchWriteItem/BatchGetItemのリクエストを未処理分がなくなるまで再送
+
+    スロットリング時は未処理分のみを指数バックオフ（フルジッター）で再送する。
+    最後の試行の後は待機しない。
+
+    Args:
+        send: RequestItemsを送信してレスポンスを返す関数
+        request_items: 最初に送信するRequestItems
+        unprocessed_key: 未処理分を表すレスポンスのキー（UnprocessedItems / UnprocessedKeys）
+
+    Returns:
+        再試行後も残った未処理分のRequestItems（すべて処理された場合は空）
+    """
+    for attempt in range(BATCH_RETRY_MAX_ATTEMPTS):
+        request_items = send(request_items).get(unprocessed_key) or {}
+        if not request_items or attempt == BATCH_RETRY_MAX_ATTEMPTS - 1:
+            break
+
+        delay = min(BATCH_RETRY_MAX_DELAY_SECONDS, BATCH_RETRY_BASE_DELAY_SECONDS * 2 ** attempt)
+        time.sleep(random.uniform(0, delay))
+    return request_items
+
+
+def new_item_id() -> str:
+    """
+    UUID v4形式のエンティティIDを生成
+
+    uuid.UUIDオブジェクトの生成・文字列化を経由せず、乱数バイト列から直接
+    既存データと同じ形式（xxxxxxxx-xxxx-4xxx-yxxx-xxxxxxxxxxxx）の文字列を組み立てる。
+    """
+    raw = bytearray(urandom(16))
+    raw[6] = (raw[6] & 0x0F) | 0x40  # バージョン4
+    raw[8] = (raw[8] & 0x3F) | 0x80  # RFC 4122バリアント
+    h = raw.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+def utc_now_iso() -> str:
+    """
+    現在時刻（UTC）をISO 8601形式で取得（1回の書き込みにつき1回だけ呼び出す）
+
+    既存データと同じ形式（+00:00、マイクロ秒付き）を time.gmtime と書式文字列で直接組み立て、
+    タイムゾーン付きdatetimeのisoformat()を経由しない。
+    """
+    t = time.time()
+    g = time.gmtime(t)
+    us = int((t - int(t)) * 1_000_000)
+    return "%04d-%02d-%02dT%02d:%02d:%02d.%06d+00:00" % (
+        g.tm_year, g.tm_mon, g.tm_mday, g.tm_hour, g.tm_min, g.tm_sec, us
+    )
+
+
+def build_projection(fields: Any, key_attributes: tuple) -> tuple:
+    """
+    ProjectionExpressionと対応するExpressionAttributeNamesを構築
+
+    予約語（statusなど）と衝突しないよう、すべての属性名をプレースホルダーで指定する。
+
+    Args:
+        fields: 取得する属性名のリスト
+        key_attributes: 常に取得するキー属性
+
+    Returns:
+        (ProjectionExpression, ExpressionAttributeNames)
+
+    Raises:
+        ValueError: fieldsが空でない文字列のリストでない場合
+    """
+    if not isinstance(fields, list) or not fields or not all(isinstance(f, str) and f for f in fields):
+        raise ValueError("fields must be a non-empty array of attribute names")
+
+    names = {}
+    for attribute in dict.fromkeys((*key_attributes, *fields)):
+        names[f"#p{len(names)}"] = attribute
+    return ", ".join(names), names
+
+
+@lru_cache(maxsize=128)
+def build_update_expression(fields: tuple) -> tuple:
+    """
+    更新するフィールドの組み合わせからUpdateExpressionを構築（組み合わせごとにキャッシュ）
+
+    値のプレースホルダーは ":<フィールド名>"、updatedAtは常に更新対象に含める。
+    返却するExpressionAttributeNamesはキャッシュ共有されるため変更しないこと。
+
+    Args:
+        fields: 更新するフィールド名（定義順）
+
+    Returns:
+        (UpdateExpression, ExpressionAttributeNames)
+    """
+    parts = []
+    names = {}
+    for field in fields:
+        if field in RESERVED_ATTRIBUTE_NAMES:
+            names[f"#{field}"] = field
+            parts.append(f"#{field} = :{field}")
+        else:
+            parts.append(f"{field} = :{field}")
+    parts.append("updatedAt = :updatedAt")
+    return "SET " + ", ".join(parts), names
+
+
+def encode_cursor(last_evaluated_key: Dict[str, Any]) -> str:
+    """LastEvaluatedKeyをクライアントに返すカーソル文字列に変換"""
+    return base64.urlsafe_b64encode(json_dumps(last_evaluated_key).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: Any, user_id: str) -> Dict[str, Any]:
+    """
+    カーソル文字列をExclusiveStartKeyに変換
+
+    Args:
+        cursor: 前ページのレスポンスで返されたnextCursor
+        user_id: リクエストしたユーザーID（他ユーザーのカーソルは受け付けない）
+
+    Returns:
+        ExclusiveStartKey
+
+    Raises:
+        ValueError: カーソルが不正な場合
+    """
+    try:
+        start_key = _json_loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (AttributeError, UnicodeError, binascii.Error, ValueError):
+        raise ValueError("cursor is invalid")
+
+    if not isinstance(start_key, dict) or start_key.get("userId") != {"S": user_id}:
+        raise ValueError("cursor is invalid")
+    return start_key
+
+
+def _error_code(error: ClientError) -> str:
+    """ClientErrorからエラーコードを取得"""
+    return error.response.get("Error", {}).get("Code", "Unknown")
+
+
+class ParameterSchema:
+    """
+    ツール引数の宣言的な検証スキーマ
+
+    インポート時に一度だけ構築し、許可値の集合とエラーメッセージを事前に生成しておく。
+    検証は必須項目 → 列挙値 → 整数範囲 → 真偽値の順に行い、最初の違反でValueErrorを送出する。
+    値がNoneの任意項目は検証しない。
+    """
+
+    def __init__(
+        self,
+        required: tuple = (),
+        choices: Optional[Dict[str, tuple]] = None,
+        int_ranges: Optional[Dict[str, Tuple[int, int]]] = None,
+        booleans: tuple = (),
+    ):
+        """
+        Args:
+            required: 必須の引数名（空文字・空リストも未指定として扱う）
+            choices: 引数名と許可される文字列値
+            int_ranges: 引数名と許可される整数の範囲（最小値, 最大値）
+            booleans: 真偽値でなければならない引数名
+        """
+        self.required = tuple((field, f"{field} is required") for field in required)
+        self.choices = tuple(
+            (field, frozenset(values), f"{field} must be one of: {', '.join(values)}")
+            for field, values in (choices or {}).items()
+        )
+        self.int_ranges = tuple(
+            (field, frozenset(range(low, high + 1)), f"{field} must be an integer between {low} and {high}")
+            for field, (low, high) in (int_ranges or {}).items()
+        )
+        self.booleans = tuple((field, f"{field} must be a boolean") for field in booleans)
+
+    def validate(self, parameters: Dict[str, Any]) -> None:
+        """
+        引数を検証
+
+        Args:
+            parameters: ツール引数
+
+        Raises:
+            ValueError: 引数がスキーマに違反している場合
+        """
+        get = parameters.get
+        for field, message in self.required:
+            if not get(field):
+                raise ValueError(message)
+        for field, allowed, message in self.choices:
+            value = get(field)
+            if value is not None and (not isinstance(value, str) or value not in allowed):
+                raise ValueError(message)
+        for field, allowed, message in self.int_ranges:
+            value = get(field)
+            if value is not None and (not isinstance(value, int) or value not in allowed):
+                raise ValueError(message)
+        for field, message in self.booleans:
+            value = get(field)
+            if value is not None and not isinstance(value, bool):
+                raise ValueError(message)
+
+
+class CrudResource:
+    """
+    userId + エンティティIDをキーとするテーブルの共通CRUD操作
+
+    入力値の検証とレスポンスの組み立ては各Lambda関数が担当し、
+    このクラスはDynamoDB操作・コンテナ内キャッシュ・ページングのみを扱う。
+    """
+
+    def __init__(self, table_name: str, id_field: str, entity_name: str, updatable_fields: tuple):
+        """
+        Args:
+            table_name: DynamoDBテーブル名
+            id_field: ソートキー（エンティティID）の属性名（例: goalId）
+            entity_name: エラーメッセージ・ログに使用するエンティティ名（例: Goal）
+            updatable_fields: 更新可能なフィールド（UpdateExpressionはこの順序で構築する）
+        """
+        self.table_name = table_name
+        self.id_field = id_field
+        self.entity_name = entity_name
+        self.updatable_fields = updatable_fields
+        self.key_attributes = ("userId", id_field)
+        # 一覧取得結果のキャッシュ（userId → (items, 保存時刻)）
+        self.cache: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def get_cached(self, user_id: str, max_age: float = CACHE_TTL_SECONDS) -> Optional[List[Dict[str, Any]]]:
+        """キャッシュから保存後max_age秒以内の一覧を取得（存在しない・古すぎる場合はNone）"""
+        entry = self.cache.get(user_id)
+        if entry is None:
+            return None
+
+        items, stored_at = entry
+        age = time.monotonic() - stored_at
+        if age >= CACHE_RETENTION_SECONDS:
+            self.cache.pop(user_id, None)
+            return None
+        if age >= max_age:
+            return None
+
+        self.cache.move_to_end(user_id)
+        return list(items)
+
+    def put_cached(self, user_id: str, items: List[Dict[str, Any]]) -> None:
+        """一覧をキャッシュに保存（上限を超えた場合は最も古いエントリを削除）"""
+        self.cache[user_id] = (list(items), time.monotonic())
+        self.cache.move_to_end(user_id)
+        while len(self.cache) > CACHE_MAX_ENTRIES:
+            self.cache.popitem(last=False)
+
+    def invalidate(self, user_id: str) -> None:
+        """書き込み後にユーザーのキャッシュを破棄"""
+        self.cache.pop(user_id, None)
+
+    def _key(self, user_id: str, entity_id: str) -> Dict[str, Any]:
+        """キー属性をAttributeValue形式で構築"""
+        return serialize_item({"userId": user_id, self.id_field: entity_id})
+
+    def _log_client_error(self, operation: str, error: ClientError) -> None:
+        """DynamoDBエラーをログに出力"""
+        logger.error(f"DynamoDB error in {operation} ({self.entity_name}): {_error_code(error)} - {str(error)}")
+
+    def put(self, item: Dict[str, Any]) -> None:
+        """
+        アイテムを保存
+
+        Args:
+            item: 保存するアイテム（キー属性を含む）
+
+        Raises:
+            ClientError: DynamoDB操作でエラーが発生した場合
+        """
+        try:
+            get_client().put_item(TableName=self.table_name, Item=serialize_item(item), **MINIMAL_WRITE_RESPONSE)
+        except ClientError as e:
+            self._log_client_error("put", e)
+            raise
+        self.invalidate(item["userId"])
+
+    def batch_put(self, user_id: str, items: List[Dict[str, Any]]) -> List[str]:
+        """
+        同一ユーザーの複数アイテムをBatchWriteItemで保存
+
+        未処理アイテムは指数バックオフ（フルジッター）で再送する。
+
+        Args:
+            user_id: ユーザーID
+            items: 保存するアイテム（MAX_BATCH_WRITE_ITEMS件以下）
+
+        Returns:
+            再試行後も書き込めなかったアイテムのIDのリスト（すべて書き込めた場合は空）
+
+        Raises:
+            ClientError: DynamoDB操作でエラーが発生した場合
+        """
+        request_items = {
+            self.table_name: [{"PutRequest": {"Item": serialize_item(item)}} for item in items]
+        }
+
+        try:
+            request_items = send_batch_with_retries(
+                lambda unprocessed: get_client().batch_write_item(RequestItems=unprocessed),
+                request_items,
+                "UnprocessedItems",
+            )
+        except ClientError as e:
+            self._log_client_error("batch_put", e)
+            raise
+        finally:
+            # 一部のみ書き込まれた場合もキャッシュに古い一覧を残さない
+            self.invalidate(user_id)
+
+        unprocessed_ids = [
+            request["PutRequest"]["Item"][self.id_field]["S"]
+            for request in request_items.get(self.table_name, [])
+        ]
+        if unprocessed_ids:
+            logger.error(f"Unprocessed items remain after retries: {unprocessed_ids} for user: {user_id}")
+        return unprocessed_ids
+
+    def update(
+        self,
+        user_id: str,
+        entity_id: str,
+        values: Dict[str, Any],
+        return_updated: bool = True,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        既存アイテムを更新（updatedAtは常に更新）
+
+        Args:
+            user_id: ユーザーID
+            entity_id: エンティティID
+            values: 更新するフィールドと値（検証・変換済み、値がNoneのフィールドは無視）
+            return_updated: Falseの場合は更新後のアイテムを取得しない
+
+        Returns:
+            更新後のアイテム（return_updatedがFalseの場合はNone）
+
+        Raises:
+            ValueError: 更新フィールドがない場合、またはアイテムが存在しない場合
+            ClientError: DynamoDB操作でエラーが発生した場合
+        """
+        fields = tuple(field for field in self.updatable_fields if values.get(field) is not None)
+        if not fields:
+            raise ValueError("At least one field to update is required")
+
+        # 更新式はフィールドの組み合わせごとにキャッシュ済みのものを使用
+        update_expression, expression_attribute_names = build_update_expression(fields)
+        expression_attribute_values = {f":{field}": values[field] for field in fields}
+
+        # updatedAtは常に更新（検証を通過した場合のみタイムスタンプを生成）
+        expression_attribute_values[":updatedAt"] = utc_now_iso()
+
+        update_params = {
+            "TableName": self.table_name,
+            "Key": self._key(user_id, entity_id),
+            "UpdateExpression": update_expression,
+            "ExpressionAttributeValues": serialize_item(expression_attribute_values),
+            # アイテムが存在することを確認しながら更新
+            "ConditionExpression": f"attribute_exists(userId) AND attribute_exists({self.id_field})",
+        }
+        if return_updated:
+            update_params["ReturnValues"] = "ALL_NEW"
+        else:
+            update_params.update(MINIMAL_WRITE_RESPONSE)
+        if expression_attribute_names:
+            update_params["ExpressionAttributeNames"] = expression_attribute_names
+
+        try:
+            response = get_client().update_item(**update_params)
+        except ClientError as e:
+            if _error_code(e) == "ConditionalCheckFailedException":
+                logger.warning(f"{self.entity_name} not found for update: {entity_id}")
+                raise ValueError(f"{self.entity_name} not found: {entity_id}")
+            self._log_client_error("update", e)
+            raise
+
+        self.invalidate(user_id)
+        return deserialize_item(response["Attributes"]) if return_updated else None
+
+    def delete(self, user_id: str, entity_id: str, strict: bool) -> Optional[Dict[str, Any]]:
+        """
+        アイテムを削除
+
+        Args:
+            user_id: ユーザーID
+            entity_id: エンティティID
+            strict: Trueの場合は存在確認を行い、削除前の内容を返す。
+                    Falseの場合は条件なしで削除する（冪等）
+
+        Returns:
+            削除前のアイテム（strictでない場合はNone）
+
+        Raises:
+            ValueError: strictでアイテムが存在しない場合
+            ClientError: DynamoDB操作でエラーが発生した場合
+        """
+        key = self._key(user_id, entity_id)
+
+        try:
+            if strict:
+                response = get_client().delete_item(
+                    TableName=self.table_name,
+                    Key=key,
+                    ConditionExpression=f"attribute_exists(userId) AND attribute_exists({self.id_field})",
+                    ReturnValues="ALL_OLD"
+                )
+                deleted_item = deserialize_item(response["Attributes"]) if "Attributes" in response else None
+            else:
+                # 条件評価・削除前データの返却を省略した冪等な削除
+                get_client().delete_item(TableName=self.table_name, Key=key, **MINIMAL_WRITE_RESPONSE)
+                deleted_item = None
+        except ClientError as e:
+            if _error_code(e) == "ConditionalCheckFailedException":
+                logger.warning(f"{self.entity_name} not found for deletion: {entity_id}")
+                raise ValueError(f"{self.entity_name} not found: {entity_id}")
+            self._log_client_error("delete", e)
+            raise
+
+        self.invalidate(user_id)
+        return deleted_item
+
+    def list(
+        self,
+        user_id: str,
+        fields: Any = None,
+        limit: Any = None,
+        cursor: Any = None,
+        freshness: Any = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        ユーザーのアイテム一覧を取得
+
+        Args:
+            user_id: ユーザーID
+            fields: 取得する属性名のリスト（指定時は指定属性とキー属性のみ）
+            limit: 1ページの最大件数（未指定時は全件取得）
+            cursor: 前ページのnextCursor
+            freshness: 読み取り鮮度（now|recent|any、未指定時はnow）
+
+        Returns:
+            (アイテムのリスト, 次ページのカーソル（続きがない場合はNone）)
+
+        Raises:
+            ValueError: fields/limit/cursor/freshnessが不正な場合
+            ClientError: DynamoDB操作でエラーが発生した場合
+        """
+        if limit is not None and (not isinstance(limit, int) or limit < 1 or limit > MAX_PAGE_SIZE):
+            raise ValueError(f"limit must be an integer between 1 and {MAX_PAGE_SIZE}")
+        if freshness is None:
+            freshness = DEFAULT_READ_FRESHNESS
+        if not isinstance(freshness, str) or freshness not in READ_FRESHNESS_MAX_AGE_SECONDS:
+            raise ValueError(f"freshness must be one of: {', '.join(READ_FRESHNESS_MAX_AGE_SECONDS)}")
+        max_age = READ_FRESHNESS_MAX_AGE_SECONDS[freshness]
+
+        query_params = {
+            "TableName": self.table_name,
+            "KeyConditionExpression": "userId = :userId",
+            "ExpressionAttributeValues": {":userId": {"S": user_id}},
+            # 結果整合性の読み取りを明示（nowの場合のみ強い整合性で読み取る）
+            "ConsistentRead": max_age is None,
+        }
+
+        if fields is not None:
+            # 必要な属性のみを取得してレスポンスサイズを削減
+            query_params["ProjectionExpression"], query_params["ExpressionAttributeNames"] = (
+                build_projection(fields, self.key_attributes)
+            )
+
+        if limit is not None:
+            query_params["Limit"] = limit
+        if cursor is not None:
+            query_params["ExclusiveStartKey"] = decode_cursor(cursor, user_id)
+
+        # 全件取得（fields/limit/cursor未指定）の場合のみキャッシュを使用
+        use_cache = fields is None and limit is None and cursor is None
+        if use_cache and max_age is not None:
+            cached_items = self.get_cached(user_id, max_age)
+            if cached_items is not None:
+                logger.debug(f"Returning cached {self.entity_name} items for user: {user_id}")
+                return cached_items, None
+
+        try:
+            items = []
+            while True:
+                response = get_client().query(**query_params)
+                items.extend(deserialize_item(item) for item in response.get("Items", []))
+
+                last_evaluated_key = response.get("LastEvaluatedKey")
+                # limit指定時は1ページのみ返し、未指定時は1MBを超える分も含めて全件取得する
+                if limit is not None or not last_evaluated_key:
+                    break
+                query_params["ExclusiveStartKey"] = last_evaluated_key
+        except ClientError as e:
+            self._log_client_error("list", e)
+            raise
+
+        if use_cache:
+            self.put_cached(user_id, items)
+
+        next_cursor = encode_cursor(last_evaluated_key) if limit is not None and last_evaluated_key else None
+        return items, next_cursor
+
+
+def handle_tool_call(
+    event: Dict[str, Any],
+    context: Any,
+    operations: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]],
+    id_field: str,
+    resource_label: str,
+    handler_logger: logging.Logger,
+) -> Dict[str, Any]:
+    """
+    AgentCore Gateway（MCP）からのツール呼び出しを処理し、MCP形式のレスポンスを返す
+
+    Args:
+        event: AgentCore Gatewayからのイベント（MCPツール呼び出し）
+        context: Lambda実行コンテキスト
+        operations: ツール名と処理関数の対応表
+        id_field: 構造化ログに含めるエンティティIDの属性名
+        resource_label: エラーメッセージに使用するリソース名（例: health goal）
+        handler_logger: 呼び出し元Lambda関数のロガー
+
+    Returns:
+        MCP形式のレスポンス
+    """
+    # イベント全体のJSON化はDEBUG有効時のみ行う（INFOでは引数名のみを構造化ログに含める）
+    if handler_logger.isEnabledFor(logging.DEBUG):
+        handler_logger.debug(f"Received event: {json_dumps(event)}")
+
+    try:
+        # AgentCore Gateway（MCP）形式のイベントを処理（読み取りのみのためコピー不要）
+        parameters = event
+
+        # userIdの検証（必須）
+        if "userId" not in parameters:
+            raise ValueError(f"userId is required for all {resource_label} operations")
+
+        # 1回の呼び出しにつき1行の構造化ログを出力するためのコンテキスト
+        log_context = {"userId": parameters["userId"]}
+
+        # contextからツール名を取得
+        tool_name = context.client_context.custom['bedrockAgentCoreToolName'].split('___', 1)[-1]
+        log_context["operation"] = tool_name
+        log_context["parameters"] = list(parameters)
+
+        # ツールに基づいて関数を実行
+        operation = operations.get(tool_name)
+        if operation is None:
+            raise ValueError(f"Unknown operation: {tool_name}")
+        result = operation(parameters)
+
+        log_context["success"] = result.get("success")
+        if id_field in result:
+            log_context[id_field] = result[id_field]
+        if "count" in result:
+            log_context["count"] = result["count"]
+        handler_logger.info(json_dumps(log_context))
+        return result
+
+    except ValueError as e:
+        # バリデーションエラー
+        error_msg = f"Validation error: {str(e)}"
+        handler_logger.warning(error_msg)
+        return {
+            "success": False,
+            "error": error_msg,
+            "errorType": "ValidationError"
+        }
+    except ClientError as e:
+        # DynamoDBエラー
+        error_code = _error_code(e)
+        error_msg = f"Database error ({error_code}): {str(e)}"
+        handler_logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "データベースエラーが発生しました。しばらくしてから再度お試しください。",
+            "errorType": "DatabaseError",
+            "errorCode": error_code
+        }
+    except Exception as e:
+        # その他のエラー
+        error_msg = f"Unexpected error: {str(e)}"
+        handler_logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "予期しないエラーが発生しました。しばらくしてから再度お試しください。",
+            "errorType": "InternalError"
+        }
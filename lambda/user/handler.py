@@ -15,32 +15,87 @@ AgentCore Gateway（MCP）から呼び出され、DynamoDBでユーザー情報
 import json
 import os
 import re
+import time
 import logging
-from datetime import datetime, timezone, date
-from typing import Any, Dict
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Dict, Optional
 import boto3
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
 from botocore.exceptions import ClientError
 
+from shared.crud import utc_now_iso
+
 # ログ設定
 log_level = os.environ.get("LOG_LEVEL", "INFO")
 logger = logging.getLogger(__name__)
-logger.setLevel(getattr(logging, log_level.upper()))
+# 不明なレベル名の場合はINFOとする（起動時に例外で失敗させない）
+logger.setLevel(logging.getLevelNamesMapping().get(log_level.upper(), logging.INFO))
 
 # CloudWatch Logsハンドラーが自動的に設定されるため、追加設定は不要
 
 # DynamoDBクライアント（指数バックオフ付き再試行設定）
+# 1リクエストあたりの処理時間はboto3の署名・リクエスト変換（CPU律速）が大半を占めるため、
+# 関数のメモリは1 vCPUが割り当てられる1769MBで構成する（cdk_stack.pyのUserLambda）。
+# 1024/1769/2048MBの選択はAWS Lambda Power TuningでAddUser/UpdateUserのp50/p95を計測して見直す。
 from botocore.config import Config
 
+# 再試行は最小限にとどめて早期に失敗させ、再試行の判断は上流（Gateway/クライアント）に委ねる
+# （Lambda・上流それぞれの再試行が重なるとスロットリング時に呼び出しが増幅するため）
 config = Config(
     retries={
-        "max_attempts": 3,
-        "mode": "standard",  # 指数バックオフ
-    }
+        "max_attempts": 2,
+        "mode": "adaptive",  # 指数バックオフ + クライアント側のレート制御
+    },
+    connect_timeout=1.0,  # ハングした接続でLambdaの実行時間を消費しないよう短めに設定
+    read_timeout=2.0,
+    tcp_keepalive=True,  # ウォーム呼び出し間でTLS接続を再利用
+    max_pool_connections=10,
 )
 
-dynamodb = boto3.resource("dynamodb", config=config)
+# モジュールスコープで保持し、ウォーム呼び出し間で接続プールを再利用する
+# 低レベルクライアントを使用（リソースAPIのモデル読み込み・変換レイヤーを経由しない）
+ddb = boto3.client("dynamodb", config=config)
 table_name = os.environ.get("USERS_TABLE_NAME", "healthmate-users")
-table = dynamodb.Table(table_name)
+
+# 文字列以外の属性値の変換（ユーザー情報は文字列属性が中心のため、文字列は直接変換する）
+_serialize_value = TypeSerializer().serialize
+_deserialize_value = TypeDeserializer().deserialize
+
+# スロットリングを示すDynamoDBのエラーコード（Throttledとして再試行までの目安を返す）
+THROTTLING_ERROR_CODES = frozenset({
+    "ProvisionedThroughputExceededException",
+    "ThrottlingException",
+    "RequestLimitExceeded",
+})
+THROTTLE_RETRY_AFTER_SECONDS = 1
+
+# エラーレスポンスの固定部分（呼び出しごとに可変フィールドを追加したコピーを返す）
+_THROTTLED_RESPONSE = {
+    "success": False,
+    "error": "リクエストが集中しています。しばらくしてから再度お試しください。",
+    "errorType": "Throttled",
+}
+_DATABASE_ERROR_RESPONSE = {
+    "success": False,
+    "error": "データベースエラーが発生しました。しばらくしてから再度お試しください。",
+    "errorType": "DatabaseError",
+}
+_INTERNAL_ERROR_RESPONSE = {
+    "success": False,
+    "error": "予期しないエラーが発生しました。しばらくしてから再度お試しください。",
+    "errorType": "InternalError",
+}
+
+# get_user結果のコンテナ内キャッシュ（userId → (ユーザー情報, 保存時刻)）
+# 同一コンテナ内の書き込み時に破棄し、他コンテナでの更新による古さはTTLで制限する
+USER_CACHE_TTL_SECONDS = 30
+USER_CACHE_MAX_ENTRIES = 256
+_user_cache: "OrderedDict[str, tuple]" = OrderedDict()
+
+# 生年月日の検証（正規表現はモジュール読み込み時に一度だけコンパイル）
+_DOB_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')  # YYYY-MM-DD
+_MIN_YEAR = 1900
 
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -57,35 +112,33 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Returns:
         MCP形式のレスポンス
     """
-    logger.debug(f"Received event: {json.dumps(event, default=str)}")
+    # DEBUG無効時はイベント全体のJSON変換を行わない
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Received event: %s", json.dumps(event, default=str))
 
     try:
         # AgentCore Gateway（MCP）形式のイベントを処理
-        # eventには直接パラメータが含まれる
-        parameters = event.copy()
+        # eventには直接パラメータが含まれる（各処理関数は読み取りのみのためコピー不要）
+        parameters = event
         
         # userIdの検証（必須）
         if "userId" not in parameters:
             raise ValueError("userId is required for all user operations")
         
         user_id = parameters["userId"]
-        logger.info(f"Processing request for userId: {user_id}")
+        logger.info("Processing request for userId: %s", user_id)
         
         # contextからツール名を取得
         tool_name = context.client_context.custom['bedrockAgentCoreToolName'].split('___', 1)[-1]
-        logger.debug(f"Tool name from context: {tool_name}")
+        logger.debug("Tool name from context: %s", tool_name)
         
         # ツールに基づいて関数を実行
-        if tool_name == "AddUser":
-            result = add_user(parameters)
-        elif tool_name == "UpdateUser":
-            result = update_user(parameters)
-        elif tool_name == "GetUser":
-            result = get_user(parameters)
-        else:
+        operation = TOOL_OPERATIONS.get(tool_name)
+        if operation is None:
             raise ValueError(f"Unknown operation: {tool_name}")
+        result = operation(parameters)
         
-        logger.info(f"Operation completed successfully: {tool_name}")
+        logger.info("Operation completed successfully: %s", tool_name)
         return result
 
     except ValueError as e:
@@ -101,22 +154,83 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         # DynamoDBエラー
         error_code = e.response.get("Error", {}).get("Code", "Unknown")
         error_msg = f"Database error ({error_code}): {str(e)}"
+        if error_code in THROTTLING_ERROR_CODES:
+            # スロットリングは再試行の目安を返し、上流のバックオフに任せる
+            logger.warning(error_msg)
+            return {**_THROTTLED_RESPONSE, "errorCode": error_code, "retryAfter": THROTTLE_RETRY_AFTER_SECONDS}
         logger.error(error_msg)
-        return {
-            "success": False,
-            "error": "データベースエラーが発生しました。しばらくしてから再度お試しください。",
-            "errorType": "DatabaseError",
-            "errorCode": error_code
-        }
+        return {**_DATABASE_ERROR_RESPONSE, "errorCode": error_code}
     except Exception as e:
         # その他のエラー
         error_msg = f"Unexpected error: {str(e)}"
         logger.error(error_msg)
-        return {
-            "success": False,
-            "error": "予期しないエラーが発生しました。しばらくしてから再度お試しください。",
-            "errorType": "InternalError"
-        }
+        return dict(_INTERNAL_ERROR_RESPONSE)
+
+
+def _to_attribute_value(value: Any) -> Dict[str, Any]:
+    """Python値をDynamoDB AttributeValue形式に変換"""
+    if isinstance(value, str):
+        return {"S": value}
+    return _serialize_value(value)
+
+
+def _marshal(values: Dict[str, Any]) -> Dict[str, Any]:
+    """Python値の辞書（アイテム・式の属性値）をAttributeValue形式に変換"""
+    return {key: _to_attribute_value(value) for key, value in values.items()}
+
+
+def _unmarshal(item: Dict[str, Any]) -> Dict[str, Any]:
+    """AttributeValue形式のアイテムをPython値に変換"""
+    return {
+        key: value["S"] if "S" in value else _deserialize_value(value)
+        for key, value in item.items()
+    }
+
+
+def _user_key(user_id: str) -> Dict[str, Any]:
+    """ユーザーテーブルのキーをAttributeValue形式で構築"""
+    return {"userId": {"S": user_id}}
+
+
+def _get_cached_user(user_id: str) -> Optional[Dict[str, Any]]:
+    """キャッシュからTTL以内のユーザー情報を取得（存在しない・期限切れの場合はNone）"""
+    entry = _user_cache.get(user_id)
+    if entry is None:
+        return None
+
+    user, stored_at = entry
+    if time.monotonic() - stored_at >= USER_CACHE_TTL_SECONDS:
+        _user_cache.pop(user_id, None)
+        return None
+
+    _user_cache.move_to_end(user_id)
+    return dict(user)
+
+
+def _put_cached_user(user_id: str, user: Dict[str, Any]) -> None:
+    """ユーザー情報をキャッシュに保存（上限を超えた場合は最も古いエントリを削除）"""
+    _user_cache[user_id] = (dict(user), time.monotonic())
+    _user_cache.move_to_end(user_id)
+    while len(_user_cache) > USER_CACHE_MAX_ENTRIES:
+        _user_cache.popitem(last=False)
+
+
+def _user_view(user: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    ユーザーアイテムからレスポンス用のユーザー情報を構築
+
+    生年月日は存在する場合のみ含める（後方互換性を維持）。
+    """
+    user_response = {
+        "userId": user["userId"],
+        "username": user.get("username"),
+        "email": user.get("email", ""),
+        "createdAt": user.get("createdAt"),
+        "lastLoginAt": user.get("lastLoginAt"),
+    }
+    if "dateOfBirth" in user:
+        user_response["dateOfBirth"] = user["dateOfBirth"]
+    return user_response
 
 
 def add_user(parameters: Dict[str, Any]) -> Dict[str, Any]:
@@ -148,52 +262,63 @@ def add_user(parameters: Dict[str, Any]) -> Dict[str, Any]:
     # 生年月日のバリデーション（提供された場合のみ）
     if date_of_birth is not None:
         validate_date_of_birth(date_of_birth)
-        logger.debug(f"Date of birth validated: {date_of_birth}")
+        logger.debug("Date of birth validated: %s", date_of_birth)
 
-    logger.info(f"Adding/updating user: {user_id}, username: {username}")
+    logger.info("Adding/updating user: %s, username: %s", user_id, username)
 
-    now = datetime.now(timezone.utc).isoformat()
+    now = utc_now_iso()
 
     # DynamoDBにupsert（存在しない場合は作成、存在する場合は更新）
-    item = {
-        "userId": user_id,
-        "username": username,
-        "email": email,
-        "createdAt": now,
-        "lastLoginAt": now,
+    # 1回のUpdateItemで書き込み、createdAtはif_not_existsで既存の値を保持する
+    update_expression = (
+        "SET username = :username, email = :email, "
+        "createdAt = if_not_exists(createdAt, :now), lastLoginAt = :now"
+    )
+    expression_attribute_values = {
+        ":username": username,
+        ":email": email,
+        ":now": now,
     }
 
-    # 生年月日が提供された場合のみ追加
+    # 生年月日が提供された場合のみ設定（未指定の場合は置き換え時と同様に既存の値を削除）
     if date_of_birth is not None:
-        item["dateOfBirth"] = date_of_birth
+        update_expression += ", dateOfBirth = :dateOfBirth"
+        expression_attribute_values[":dateOfBirth"] = date_of_birth
+    else:
+        update_expression += " REMOVE dateOfBirth"
 
     try:
-        # 既存ユーザーの確認
-        existing_response = table.get_item(Key={"userId": user_id})
+        # 更新前の値から新規作成か更新かを判定する（既存確認のための読み取りは不要）
+        response = ddb.update_item(
+            TableName=table_name,
+            Key=_user_key(user_id),
+            UpdateExpression=update_expression,
+            ExpressionAttributeValues=_marshal(expression_attribute_values),
+            ReturnValues="ALL_OLD",
+        )
+        _user_cache.pop(user_id, None)
+        existing_item = _unmarshal(response.get("Attributes", {}))
         
-        if "Item" in existing_response:
-            # 既存ユーザーの場合は更新
-            existing_item = existing_response["Item"]
-            item["createdAt"] = existing_item.get("createdAt", now)  # 作成日時は保持
-            logger.info(f"Updating existing user: {user_id}")
+        if existing_item:
+            # 既存ユーザーの場合は作成日時を保持
+            created_at = existing_item.get("createdAt", now)
+            logger.info("Updated existing user: %s", user_id)
             operation = "updated"
         else:
             # 新規ユーザーの場合
-            logger.info(f"Creating new user: {user_id}")
+            created_at = now
+            logger.info("Created new user: %s", user_id)
             operation = "created"
 
-        # アイテムを保存
-        table.put_item(Item=item)
-        
-        logger.info(f"User {operation} successfully: {user_id}")
+        logger.info("User %s successfully: %s", operation, user_id)
         
         # レスポンス用のユーザー情報を構築
         user_response = {
             "userId": user_id,
             "username": username,
             "email": email,
-            "createdAt": item["createdAt"],
-            "lastLoginAt": item["lastLoginAt"]
+            "createdAt": created_at,
+            "lastLoginAt": now
         }
         
         # 生年月日が存在する場合のみレスポンスに含める
@@ -236,7 +361,7 @@ def update_user(parameters: Dict[str, Any]) -> Dict[str, Any]:
     if not user_id:
         raise ValueError("userId is required")
 
-    logger.info(f"Updating user: {user_id}")
+    logger.info("Updating user: %s", user_id)
 
     # 更新式を構築
     update_expression_parts = []
@@ -246,12 +371,12 @@ def update_user(parameters: Dict[str, Any]) -> Dict[str, Any]:
     if username is not None:
         update_expression_parts.append("username = :username")
         expression_attribute_values[":username"] = username
-        logger.debug(f"Updating username to: {username}")
+        logger.debug("Updating username to: %s", username)
 
     if email is not None:
         update_expression_parts.append("email = :email")
         expression_attribute_values[":email"] = email
-        logger.debug(f"Updating email to: {email}")
+        logger.debug("Updating email to: %s", email)
 
     # 生年月日の処理
     if date_of_birth is not None:
@@ -263,18 +388,14 @@ def update_user(parameters: Dict[str, Any]) -> Dict[str, Any]:
             validate_date_of_birth(date_of_birth)
             update_expression_parts.append("dateOfBirth = :dateOfBirth")
             expression_attribute_values[":dateOfBirth"] = date_of_birth
-            logger.debug(f"Updating dateOfBirth to: {date_of_birth}")
+            logger.debug("Updating dateOfBirth to: %s", date_of_birth)
 
-    if last_login_at is not None:
-        update_expression_parts.append("lastLoginAt = :lastLoginAt")
-        expression_attribute_values[":lastLoginAt"] = last_login_at
-        logger.debug(f"Updating lastLoginAt to: {last_login_at}")
-    else:
-        # lastLoginAtが指定されていない場合は現在時刻を設定
-        now = datetime.now(timezone.utc).isoformat()
-        update_expression_parts.append("lastLoginAt = :lastLoginAt")
-        expression_attribute_values[":lastLoginAt"] = now
-        logger.debug(f"Setting lastLoginAt to current time: {now}")
+    # lastLoginAtが指定されていない場合のみ現在時刻を生成して設定
+    if last_login_at is None:
+        last_login_at = utc_now_iso()
+    update_expression_parts.append("lastLoginAt = :lastLoginAt")
+    expression_attribute_values[":lastLoginAt"] = last_login_at
+    logger.debug("Updating lastLoginAt to: %s", last_login_at)
 
     # 更新対象フィールドがない場合はエラー
     if not update_expression_parts and not remove_expression_parts:
@@ -291,35 +412,24 @@ def update_user(parameters: Dict[str, Any]) -> Dict[str, Any]:
 
     try:
         # ユーザーが存在することを確認しながら更新
-        response = table.update_item(
-            Key={"userId": user_id},
+        # （lastLoginAtは常に設定されるため、式の属性値が空になることはない）
+        response = ddb.update_item(
+            TableName=table_name,
+            Key=_user_key(user_id),
             UpdateExpression=update_expression,
-            ExpressionAttributeValues=expression_attribute_values if expression_attribute_values else None,
+            ExpressionAttributeValues=_marshal(expression_attribute_values),
             ConditionExpression="attribute_exists(userId)",  # ユーザーが存在することを確認
             ReturnValues="ALL_NEW",
         )
+        _user_cache.pop(user_id, None)
         
-        updated_user = response["Attributes"]
-        logger.info(f"User updated successfully: {user_id}")
-        
-        # レスポンス用のユーザー情報を構築
-        user_response = {
-            "userId": updated_user.get("userId"),
-            "username": updated_user.get("username"),
-            "email": updated_user.get("email", ""),
-            "createdAt": updated_user.get("createdAt"),
-            "lastLoginAt": updated_user.get("lastLoginAt")
-        }
-        
-        # 生年月日が存在する場合のみレスポンスに含める
-        if "dateOfBirth" in updated_user:
-            user_response["dateOfBirth"] = updated_user["dateOfBirth"]
+        logger.info("User updated successfully: %s", user_id)
         
         return {
             "success": True,
             "userId": user_id,
             "message": "ユーザー情報を更新しました",
-            "user": user_response
+            "user": _user_view(_unmarshal(response["Attributes"]))
         }
 
     except ClientError as e:
@@ -351,37 +461,31 @@ def get_user(parameters: Dict[str, Any]) -> Dict[str, Any]:
     if not user_id:
         raise ValueError("userId is required")
 
-    logger.info(f"Retrieving user: {user_id}")
+    logger.info("Retrieving user: %s", user_id)
+
+    # 同一コンテナでTTL以内に取得済みの場合はDynamoDBを呼び出さない
+    cached_user = _get_cached_user(user_id)
+    if cached_user is not None:
+        logger.debug("User served from cache: %s", user_id)
+        return {
+            "success": True,
+            "user": cached_user
+        }
 
     try:
-        response = table.get_item(Key={"userId": user_id})
+        response = ddb.get_item(TableName=table_name, Key=_user_key(user_id))
 
         if "Item" in response:
-            user = response["Item"]
-            logger.info(f"User retrieved successfully: {user_id}")
-            
-            # レスポンス用のユーザー情報を構築
-            user_response = {
-                "userId": user.get("userId"),
-                "username": user.get("username"),
-                "email": user.get("email", ""),
-                "createdAt": user.get("createdAt"),
-                "lastLoginAt": user.get("lastLoginAt"),
-            }
-            
-            # 生年月日が存在する場合のみレスポンスに含める（後方互換性を維持）
-            if "dateOfBirth" in user:
-                user_response["dateOfBirth"] = user["dateOfBirth"]
-                logger.debug(f"Including dateOfBirth in response: {user['dateOfBirth']}")
-            else:
-                logger.debug(f"No dateOfBirth found for user: {user_id}")
+            logger.info("User retrieved successfully: %s", user_id)
             
+            user = _user_view(_unmarshal(response["Item"]))
+            _put_cached_user(user_id, user)
             return {
                 "success": True,
-                "user": user_response
+                "user": user
             }
         else:
-            logger.info(f"User not found: {user_id}")
+            logger.info("User not found: %s", user_id)
             return {
                 "success": False,
                 "message": "ユーザーが見つかりません",
@@ -408,24 +512,27 @@ def validate_date_of_birth(date_of_birth: str) -> None:
         raise ValueError("生年月日は文字列で入力してください")
     
     # 形式チェック（YYYY-MM-DD）
-    if not re.match(r'^\d{4}-\d{2}-\d{2}$', date_of_birth):
+    if not _DOB_RE.match(date_of_birth):
         raise ValueError("生年月日はYYYY-MM-DD形式で入力してください")
     
     try:
-        # 日付の妥当性チェック
-        birth_date = datetime.strptime(date_of_birth, '%Y-%m-%d').date()
-        
-        # 未来の日付チェック
-        if birth_date > date.today():
-            raise ValueError("生年月日は過去の日付である必要があります")
-        
-        # 非現実的な過去の日付チェック（1900年以前）
-        if birth_date.year < 1900:
-            raise ValueError("生年月日は1900年以降の日付を入力してください")
-            
-    except ValueError as e:
-        # datetime.strptimeでの解析エラーをキャッチ
-        if "time data" in str(e) or "does not match format" in str(e):
-            raise ValueError("無効な日付です。正しい日付を入力してください")
-        # 既に適切なエラーメッセージの場合はそのまま再発生
-        raise
+        # 日付の妥当性チェック（C実装のfromisoformatで解析）
+        birth_date = date.fromisoformat(date_of_birth)
+    except ValueError:
+        raise ValueError("無効な日付です。正しい日付を入力してください")
+    
+    # 未来の日付チェック
+    if birth_date > date.today():
+        raise ValueError("生年月日は過去の日付である必要があります")
+    
+    # 非現実的な過去の日付チェック（1900年以前）
+    if birth_date.year < _MIN_YEAR:
+        raise ValueError("生年月日は1900年以降の日付を入力してください")
+
+
+# ツール名と処理関数の対応表（lambda_handlerでのディスパッチに使用）
+TOOL_OPERATIONS = {
+    "AddUser": add_user,
+    "UpdateUser": update_user,
+    "GetUser": get_user,
+}
@@ -2,22 +2,24 @@
 ActivityLambda関数のユニットテスト（MCP形式対応）
 """
 
+import copy
 import json
 import os
+import uuid
+from functools import lru_cache
+from types import SimpleNamespace
 import pytest
 from unittest.mock import Mock, patch
 from moto import mock_aws
 import boto3
 from botocore.exceptions import ClientError
 
-# Lambda関数をインポート
-import sys
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../lambda"))
+# Lambda関数をインポート（lambdaディレクトリはpytest.iniのpythonpathで追加される）
 
 from activity.handler import lambda_handler, add_activities, update_activity, update_activities, delete_activity, get_activities, get_activities_in_range
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def aws_credentials():
     """Mocked AWS Credentials for moto."""
     os.environ['AWS_ACCESS_KEY_ID'] = 'testing'
@@ -27,10 +29,15 @@ def aws_credentials():
     os.environ['AWS_DEFAULT_REGION'] = 'us-west-2'
 
 
-@pytest.fixture
-def dynamodb_table(aws_credentials):
-    """DynamoDBテーブルのモック"""
-    with mock_aws():
+@pytest.fixture(scope="module")
+def activities_table(aws_credentials):
+    """
+    DynamoDBテーブルのモック（モジュール内の全テストで共有）
+
+    テーブル作成はモジュールごとに1回だけ行い、ハンドラーのtableを差し替える。
+    pytest-xdistで並列実行した場合もワーカーごとに独立したモックになる。
+    """
+    with mock_aws(), pytest.MonkeyPatch.context() as mp:
         dynamodb = boto3.resource('dynamodb', region_name='us-west-2')
         
         # テーブル作成
@@ -60,65 +67,199 @@ def dynamodb_table(aws_credentials):
         )
         
         # 環境変数を設定
-        os.environ['ACTIVITIES_TABLE_NAME'] = 'healthmate-activities'
+        mp.setenv('ACTIVITIES_TABLE_NAME', 'healthmate-activities')
+        
+        # インポート時に作成されたテーブル参照をモックのテーブルに差し替える
+        mp.setattr("activity.handler.table", table)
         
         yield table
 
 
+@pytest.fixture
+def dynamodb_table(activities_table):
+    """テストごとのDynamoDBテーブル（テスト終了時に書き込んだアイテムを削除して分離する）"""
+    yield activities_table
+
+    keys = activities_table.scan(
+        ProjectionExpression="userId, #date",
+        ExpressionAttributeNames={"#date": "date"},
+    )["Items"]
+    with activities_table.batch_writer() as batch:
+        for key in keys:
+            batch.delete_item(Key=key)
+
+
+# テストで使う日付（活動を記録する日と、期間取得テスト用の連続した日付）
+TEST_DATE = "2025-12-14"
+RANGE_DATES = ("2025-12-14", "2025-12-15", "2025-12-16")
+
+# テストで共通に使う活動データ
+WAKE_UP_ACTIVITY = {
+    "time": "08:00",
+    "activityType": "wakeUp",
+    "description": "起床",
+    "items": []
+}
+
+# テストで共通に使うツール引数（add_activitiesは引数を書き換えるため、payload()でコピーして使う）
+PAYLOADS = {
+    "wake_up": {
+        "userId": "user123",
+        "date": TEST_DATE,
+        "activities": [WAKE_UP_ACTIVITY]
+    },
+    "wake_up_and_exercise": {
+        "userId": "user123",
+        "date": TEST_DATE,
+        "activities": [
+            WAKE_UP_ACTIVITY,
+            {
+                "time": "08:30",
+                "activityType": "exercise",
+                "description": "運動",
+                "items": ["ジョギング30分", "筋トレ20分"]
+            }
+        ]
+    },
+    "wake_up_and_bowel_movement": {
+        "userId": "user123",
+        "date": TEST_DATE,
+        "activities": [
+            WAKE_UP_ACTIVITY,
+            {
+                "time": "13:00",
+                "activityType": "bowelMovement",
+                "description": "排便",
+                "items": ["うんこが出た"]
+            }
+        ]
+    },
+    "wake_up_and_lunch": {
+        "userId": "user123",
+        "date": TEST_DATE,
+        "activities": [
+            WAKE_UP_ACTIVITY,
+            {
+                "time": "12:00",
+                "activityType": "meal",
+                "description": "昼食",
+                "items": []
+            }
+        ]
+    },
+    "lunch": {
+        "userId": "user123",
+        "date": TEST_DATE,
+        "activities": [
+            {
+                "time": "12:00",
+                "activityType": "meal",
+                "description": "昼食",
+                "items": ["サラダ", "チキン"]
+            }
+        ]
+    },
+    "early_wake_up_and_exercise": {
+        "userId": "user123",
+        "date": TEST_DATE,
+        "activities": [
+            {
+                "time": "07:30",
+                "activityType": "wakeUp",
+                "description": "早起き",
+                "items": []
+            },
+            {
+                "time": "08:00",
+                "activityType": "exercise",
+                "description": "朝の運動",
+                "items": ["ストレッチ"]
+            }
+        ]
+    },
+}
+
+
+def payload(name):
+    """PAYLOADSから指定したツール引数のディープコピーを返す"""
+    return copy.deepcopy(PAYLOADS[name])
+
+
+@lru_cache(maxsize=None)
+def tool_context(tool_name):
+    """
+    AgentCore Gatewayから渡されるLambda実行コンテキストを作成する（ツール名ごとに1回だけ構築）
+
+    Args:
+        tool_name: MCPツール名（例: AddActivities）
+
+    Returns:
+        client_context.customにゲートウェイのツール名を持つコンテキスト
+    """
+    custom = {"bedrockAgentCoreToolName": f"ActivityManagement___{tool_name}"}
+    return SimpleNamespace(client_context=SimpleNamespace(custom=custom))
+
+
+def seed_activities(table, user_id, dates):
+    """
+    複数日分の活動レコードをBatchWriteItemでまとめて投入する
+
+    Args:
+        table: 投入先のテーブル
+        user_id: ユーザーID
+        dates: 活動を1件ずつ記録する日付（YYYY-MM-DD）のリスト
+    """
+    with table.batch_writer() as batch:
+        for date in dates:
+            batch.put_item(Item={
+                "userId": user_id,
+                "date": date,
+                "activities": [{**WAKE_UP_ACTIVITY, "activityId": str(uuid.uuid4())}]
+            })
+
+
+def stored_activities(table, user_id, date):
+    """
+    テーブルに保存されている指定日の活動リストを直接読み取る
+
+    事後条件の確認のためだけにハンドラー（get_activities）を呼び出さないようにする。
+
+    Args:
+        table: 読み取り元のテーブル
+        user_id: ユーザーID
+        date: 日付（YYYY-MM-DD）
+
+    Returns:
+        保存されている活動のリスト（レコードがない場合は空リスト）
+    """
+    item = table.get_item(Key={"userId": user_id, "date": date}).get("Item")
+    return item["activities"] if item else []
+
+
 class TestActivityLambdaHandler:
     """lambda_handler関数のテスト"""
 
     def test_add_activities_success(self, dynamodb_table):
         """addActivities: 正常系"""
-        event = {
-            "userId": "user123",
-            "date": "2025-12-14",
-            "activities": [
-                {
-                    "time": "08:00",
-                    "activityType": "wakeUp",
-                    "description": "起床",
-                    "items": []
-                },
-                {
-                    "time": "08:30",
-                    "activityType": "exercise",
-                    "description": "運動",
-                    "items": ["ジョギング30分", "筋トレ20分"]
-                }
-            ]
-        }
-
-        result = lambda_handler(event, None)
+        result = lambda_handler(payload("wake_up_and_exercise"), tool_context("AddActivities"))
 
         assert result["success"] is True
-        assert result["date"] == "2025-12-14"
+        assert result["date"] == TEST_DATE
         assert result["addedCount"] == 2
 
     def test_get_activities_success(self, dynamodb_table):
         """getActivities: 正常系"""
         # まず活動を追加
-        add_event = {
-            "userId": "user123",
-            "date": "2025-12-14",
-            "activities": [
-                {
-                    "time": "08:00",
-                    "activityType": "wakeUp",
-                    "description": "起床",
-                    "items": []
-                }
-            ]
-        }
-        lambda_handler(add_event, None)
+        add_event = payload("wake_up")
+        lambda_handler(add_event, tool_context("AddActivities"))
 
         # 取得
         get_event = {
             "userId": "user123",
-            "date": "2025-12-14"
+            "date": TEST_DATE
         }
 
-        result = lambda_handler(get_event, None)
+        result = lambda_handler(get_event, tool_context("GetActivities"))
 
         assert result["success"] is True
         assert result["count"] == 1
@@ -128,11 +269,11 @@ class TestActivityLambdaHandler:
     def test_missing_user_id(self, dynamodb_table):
         """userIdが欠落: エラー"""
         event = {
-            "date": "2025-12-14",
+            "date": TEST_DATE,
             "activities": []
         }
 
-        result = lambda_handler(event, None)
+        result = lambda_handler(event, tool_context("AddActivities"))
 
         assert result["success"] is False
         assert result["errorType"] == "ValidationError"
@@ -144,26 +285,7 @@ class TestAddActivities:
 
     def test_add_activities_to_new_date(self, dynamodb_table):
         """新しい日付に活動を追加"""
-        parameters = {
-            "userId": "user123",
-            "date": "2025-12-14",
-            "activities": [
-                {
-                    "time": "08:00",
-                    "activityType": "wakeUp",
-                    "description": "起床",
-                    "items": []
-                },
-                {
-                    "time": "13:00",
-                    "activityType": "bowelMovement",
-                    "description": "排便",
-                    "items": ["うんこが出た"]
-                }
-            ]
-        }
-
-        result = add_activities(parameters)
+        result = add_activities(payload("wake_up_and_bowel_movement"))
 
         assert result["success"] is True
         assert result["addedCount"] == 2
@@ -171,72 +293,53 @@ class TestAddActivities:
     def test_add_activities_to_existing_date(self, dynamodb_table):
         """既存の日付に活動を追加"""
         # 最初の活動を追加
-        add_activities({
-            "userId": "user123",
-            "date": "2025-12-14",
-            "activities": [
-                {
-                    "time": "08:00",
-                    "activityType": "wakeUp",
-                    "description": "起床",
-                    "items": []
-                }
-            ]
-        })
+        add_activities(payload("wake_up"))
 
         # 追加の活動を追加
-        parameters = {
-            "userId": "user123",
-            "date": "2025-12-14",
-            "activities": [
-                {
-                    "time": "12:00",
-                    "activityType": "meal",
-                    "description": "昼食",
-                    "items": ["サラダ", "チキン"]
-                }
-            ]
-        }
-
-        result = add_activities(parameters)
+        result = add_activities(payload("lunch"))
 
         assert result["success"] is True
         assert result["addedCount"] == 1
 
         # 合計2つの活動があることを確認
-        get_result = get_activities({
-            "userId": "user123",
-            "date": "2025-12-14"
-        })
-        assert get_result["count"] == 2
+        assert len(stored_activities(dynamodb_table, "user123", TEST_DATE)) == 2
 
-    def test_add_activities_missing_required_fields(self, dynamodb_table):
-        """必須フィールドが欠落: エラー"""
-        parameters = {
-            "userId": "user123",
-            "date": "2025-12-14",
-            "activities": [
+    @pytest.mark.parametrize(
+        "parameters, message",
+        [
+            (
                 {
-                    "time": "08:00",
-                    # activityTypeが欠落
-                    "description": "起床",
-                    "items": []
-                }
-            ]
-        }
-
-        with pytest.raises(ValueError, match="Activity at index 0 must have activityType"):
-            add_activities(parameters)
-
-    def test_add_activities_empty_list(self, dynamodb_table):
-        """空の活動リスト: エラー"""
-        parameters = {
-            "userId": "user123",
-            "date": "2025-12-14",
-            "activities": []
-        }
-
-        with pytest.raises(ValueError, match="activities must be a non-empty list"):
+                    "userId": "user123",
+                    "date": TEST_DATE,
+                    "activities": [
+                        {
+                            "time": "08:00",
+                            # activityTypeが欠落
+                            "description": "起床",
+                            "items": []
+                        }
+                    ]
+                },
+                "Activity at index 0 must have activityType",
+            ),
+            (
+                {"userId": "user123", "date": TEST_DATE, "activities": []},
+                "activities must be a non-empty list",
+            ),
+            (
+                {"date": TEST_DATE, "activities": [{"time": "08:00"}]},
+                "userId is required",
+            ),
+            (
+                {"userId": "user123", "activities": [{"time": "08:00"}]},
+                "date is required",
+            ),
+        ],
+        ids=["missing_required_fields", "empty_list", "missing_user_id", "missing_date"],
+    )
+    def test_add_activities_invalid_parameters(self, dynamodb_table, parameters, message):
+        """不正なパラメータ: エラー"""
+        with pytest.raises(ValueError, match=message):
             add_activities(parameters)
 
 
@@ -246,23 +349,13 @@ class TestUpdateActivity:
     def test_update_activity_success(self, dynamodb_table):
         """活動更新: 正常系"""
         # まず活動を追加
-        add_activities({
-            "userId": "user123",
-            "date": "2025-12-14",
-            "activities": [
-                {
-                    "time": "08:00",
-                    "activityType": "wakeUp",
-                    "description": "起床",
-                    "items": []
-                }
-            ]
-        })
+        activity_id = add_activities(payload("wake_up"))["addedActivityIds"][0]
 
         # 更新
         parameters = {
             "userId": "user123",
-            "date": "2025-12-14",
+            "date": TEST_DATE,
+            "activityId": activity_id,
             "time": "08:00",
             "description": "早起き",
             "items": ["気分良好"]
@@ -278,12 +371,13 @@ class TestUpdateActivity:
         """存在しない活動を更新: エラー"""
         parameters = {
             "userId": "user123",
-            "date": "2025-12-14",
+            "date": TEST_DATE,
+            "activityId": str(uuid.uuid4()),
             "time": "08:00",
             "description": "更新"
         }
 
-        with pytest.raises(ValueError, match="No activities found for date"):
+        with pytest.raises(ValueError, match="No activities found"):
             update_activity(parameters)
 
 
@@ -293,51 +387,18 @@ class TestUpdateActivities:
     def test_update_activities_replace_all(self, dynamodb_table):
         """全活動の置き換え: 正常系"""
         # まず活動を追加
-        add_activities({
-            "userId": "user123",
-            "date": "2025-12-14",
-            "activities": [
-                {
-                    "time": "08:00",
-                    "activityType": "wakeUp",
-                    "description": "起床",
-                    "items": []
-                }
-            ]
-        })
+        add_activities(payload("wake_up"))
 
         # 全置き換え
-        parameters = {
-            "userId": "user123",
-            "date": "2025-12-14",
-            "activities": [
-                {
-                    "time": "07:30",
-                    "activityType": "wakeUp",
-                    "description": "早起き",
-                    "items": []
-                },
-                {
-                    "time": "08:00",
-                    "activityType": "exercise",
-                    "description": "朝の運動",
-                    "items": ["ストレッチ"]
-                }
-            ]
-        }
-
-        result = update_activities(parameters)
+        result = update_activities(payload("early_wake_up_and_exercise"))
 
         assert result["success"] is True
         assert result["updatedCount"] == 2
 
         # 置き換えられたことを確認
-        get_result = get_activities({
-            "userId": "user123",
-            "date": "2025-12-14"
-        })
-        assert get_result["count"] == 2
-        assert get_result["activities"][0]["time"] == "07:30"
+        activities = stored_activities(dynamodb_table, "user123", TEST_DATE)
+        assert len(activities) == 2
+        assert activities[0]["time"] == "07:30"
 
 
 class TestDeleteActivity:
@@ -346,30 +407,13 @@ class TestDeleteActivity:
     def test_delete_activity_success(self, dynamodb_table):
         """活動削除: 正常系"""
         # まず活動を追加
-        add_activities({
-            "userId": "user123",
-            "date": "2025-12-14",
-            "activities": [
-                {
-                    "time": "08:00",
-                    "activityType": "wakeUp",
-                    "description": "起床",
-                    "items": []
-                },
-                {
-                    "time": "12:00",
-                    "activityType": "meal",
-                    "description": "昼食",
-                    "items": []
-                }
-            ]
-        })
+        result = add_activities(payload("wake_up_and_lunch"))
 
         # 削除
         parameters = {
             "userId": "user123",
-            "date": "2025-12-14",
-            "time": "08:00"
+            "date": TEST_DATE,
+            "activityId": result["addedActivityIds"][0]
         }
 
         result = delete_activity(parameters)
@@ -380,24 +424,13 @@ class TestDeleteActivity:
     def test_delete_last_activity(self, dynamodb_table):
         """最後の活動を削除（レコード自体が削除される）"""
         # 活動を1つ追加
-        add_activities({
-            "userId": "user123",
-            "date": "2025-12-14",
-            "activities": [
-                {
-                    "time": "08:00",
-                    "activityType": "wakeUp",
-                    "description": "起床",
-                    "items": []
-                }
-            ]
-        })
+        activity_id = add_activities(payload("wake_up"))["addedActivityIds"][0]
 
         # 削除
         parameters = {
             "userId": "user123",
-            "date": "2025-12-14",
-            "time": "08:00"
+            "date": TEST_DATE,
+            "activityId": activity_id
         }
 
         result = delete_activity(parameters)
@@ -412,22 +445,11 @@ class TestGetActivities:
     def test_get_activities_with_data(self, dynamodb_table):
         """活動が存在する場合"""
         # 活動を追加
-        add_activities({
-            "userId": "user123",
-            "date": "2025-12-14",
-            "activities": [
-                {
-                    "time": "08:00",
-                    "activityType": "wakeUp",
-                    "description": "起床",
-                    "items": []
-                }
-            ]
-        })
+        add_activities(payload("wake_up"))
 
         parameters = {
             "userId": "user123",
-            "date": "2025-12-14"
+            "date": TEST_DATE
         }
 
         result = get_activities(parameters)
@@ -440,7 +462,7 @@ class TestGetActivities:
         """活動が存在しない場合"""
         parameters = {
             "userId": "user123",
-            "date": "2025-12-14"
+            "date": TEST_DATE
         }
 
         result = get_activities(parameters)
@@ -456,35 +478,12 @@ class TestGetActivitiesInRange:
     def test_get_activities_in_range_success(self, dynamodb_table):
         """期間内の活動取得: 正常系"""
         # 複数日の活動を追加
-        add_activities({
-            "userId": "user123",
-            "date": "2025-12-14",
-            "activities": [
-                {
-                    "time": "08:00",
-                    "activityType": "wakeUp",
-                    "description": "起床",
-                    "items": []
-                }
-            ]
-        })
-        add_activities({
-            "userId": "user123",
-            "date": "2025-12-15",
-            "activities": [
-                {
-                    "time": "08:30",
-                    "activityType": "wakeUp",
-                    "description": "起床",
-                    "items": []
-                }
-            ]
-        })
+        seed_activities(dynamodb_table, "user123", RANGE_DATES[:2])
 
         parameters = {
             "userId": "user123",
-            "startDate": "2025-12-14",
-            "endDate": "2025-12-15"
+            "startDate": RANGE_DATES[0],
+            "endDate": RANGE_DATES[1]
         }
 
         result = get_activities_in_range(parameters)
@@ -493,24 +492,34 @@ class TestGetActivitiesInRange:
         assert result["totalDays"] == 2
         assert result["totalActivities"] == 2
 
-    def test_get_activities_in_range_invalid_date_format(self, dynamodb_table):
-        """無効な日付形式: エラー"""
-        parameters = {
-            "userId": "user123",
-            "startDate": "invalid-date",
-            "endDate": "2025-12-15"
-        }
+    def test_get_activities_in_range_sorted_by_date(self, dynamodb_table):
+        """期間内の活動は日付の昇順で返される"""
+        seed_activities(dynamodb_table, "user123", RANGE_DATES[::-1])
 
-        with pytest.raises(ValueError, match="Invalid date format"):
-            get_activities_in_range(parameters)
+        result = get_activities_in_range({
+            "userId": "user123",
+            "startDate": RANGE_DATES[0],
+            "endDate": RANGE_DATES[-1]
+        })
 
-    def test_get_activities_in_range_too_long(self, dynamodb_table):
-        """期間が長すぎる: エラー"""
+        assert [day["date"] for day in result["dailyActivities"]] == list(RANGE_DATES)
+
+    @pytest.mark.parametrize(
+        "start_date, end_date, message",
+        [
+            ("invalid-date", "2025-12-15", "Invalid date format"),
+            ("2024-01-01", "2025-12-31", "Date range cannot exceed 365 days"),  # 365日を超える
+            ("2025-12-15", TEST_DATE, "startDate must be before or equal to endDate"),
+        ],
+        ids=["invalid_date_format", "too_long", "reversed"],
+    )
+    def test_get_activities_in_range_invalid_range(self, dynamodb_table, start_date, end_date, message):
+        """不正な期間: エラー"""
         parameters = {
             "userId": "user123",
-            "startDate": "2024-01-01",
-            "endDate": "2025-12-31"  # 365日を超える
+            "startDate": start_date,
+            "endDate": end_date
         }
 
-        with pytest.raises(ValueError, match="Date range cannot exceed 365 days"):
-            get_activities_in_range(parameters)
\ No newline at end of file
+        with pytest.raises(ValueError, match=message):
+            get_activities_in_range(parameters)
@@ -0,0 +1,239 @@
+"""
+BodyMeasurementLambda関数のユニットテスト（MCP形式対応）
+"""
+
+import os
+from decimal import Decimal
+import pytest
+from unittest.mock import patch
+from moto import mock_aws
+import boto3
+
+# Lambda関数をインポート（lambdaディレクトリはpytest.iniのpythonpathで追加される）
+
+from body_measurement.handler import add_body_measurement, update_body_measurement, delete_body_measurement, table_name
+
+
+@pytest.fixture(scope="module")
+def aws_credentials():
+    """Mocked AWS Credentials for moto."""
+    os.environ['AWS_ACCESS_KEY_ID'] = 'testing'
+    os.environ['AWS_SECRET_ACCESS_KEY'] = 'testing'
+    os.environ['AWS_SECURITY_TOKEN'] = 'testing'
+    os.environ['AWS_SESSION_TOKEN'] = 'testing'
+    os.environ['AWS_DEFAULT_REGION'] = 'us-west-2'
+
+
+@pytest.fixture(scope="module")
+def measurements_table(aws_credentials):
+    """
+    DynamoDBテーブルのモック（モジュール内の全テストで共有）
+
+    テーブル作成はモジュールごとに1回だけ行い、ハンドラーのテーブル・クライアントを差し替える。
+    """
+    with mock_aws(), pytest.MonkeyPatch.context() as mp:
+        dynamodb = boto3.resource('dynamodb', region_name='us-west-2')
+
+        # テーブル作成（Latest/Oldest レコード用のLSIを含む）
+        table = dynamodb.create_table(
+            TableName=table_name,
+            KeySchema=[
+                {
+                    'AttributeName': 'userId',
+                    'KeyType': 'HASH'
+                },
+                {
+                    'AttributeName': 'measurementId',
+                    'KeyType': 'RANGE'
+                }
+            ],
+            AttributeDefinitions=[
+                {
+                    'AttributeName': 'userId',
+                    'AttributeType': 'S'
+                },
+                {
+                    'AttributeName': 'measurementId',
+                    'AttributeType': 'S'
+                },
+                {
+                    'AttributeName': 'record_type',
+                    'AttributeType': 'S'
+                }
+            ],
+            LocalSecondaryIndexes=[
+                {
+                    'IndexName': 'RecordTypeIndex',
+                    'KeySchema': [
+                        {
+                            'AttributeName': 'userId',
+                            'KeyType': 'HASH'
+                        },
+                        {
+                            'AttributeName': 'record_type',
+                            'KeyType': 'RANGE'
+                        }
+                    ],
+                    'Projection': {'ProjectionType': 'ALL'}
+                }
+            ],
+            BillingMode='PAY_PER_REQUEST'
+        )
+
+        # インポート時に作成されたテーブル参照・クライアントをモック環境のものに差し替える
+        mp.setattr("body_measurement.handler.table", table)
+        mp.setattr("body_measurement.handler.dynamodb_client", boto3.client('dynamodb', region_name='us-west-2'))
+
+        yield table
+
+
+@pytest.fixture
+def dynamodb_table(measurements_table):
+    """テストごとのDynamoDBテーブル（テスト終了時に書き込んだアイテムを削除して分離する）"""
+    yield measurements_table
+
+    keys = measurements_table.scan(ProjectionExpression="userId, measurementId")["Items"]
+    with measurements_table.batch_writer() as batch:
+        for key in keys:
+            batch.delete_item(Key=key)
+
+
+# 最古・中間・最新の測定時刻（measurement_idと同じ値）
+OLDEST_TIME = "2025-01-01T07:00:00+00:00"
+MIDDLE_TIME = "2025-01-02T07:00:00+00:00"
+LATEST_TIME = "2025-01-03T07:00:00+00:00"
+
+
+@pytest.fixture
+def three_measurements(dynamodb_table):
+    """
+    最古・中間・最新の3件の測定記録を追加する
+
+    最古: 体重60.0・身長170.0 / 中間: 体重61.0 / 最新: 体重62.0・体脂肪率20.0
+    """
+    add_body_measurement({"userId": "user123", "weight": 60.0, "height": 170.0, "measurement_time": OLDEST_TIME})
+    add_body_measurement({"userId": "user123", "weight": 61.0, "measurement_time": MIDDLE_TIME})
+    add_body_measurement({"userId": "user123", "weight": 62.0, "body_fat_percentage": 20.0, "measurement_time": LATEST_TIME})
+    return dynamodb_table
+
+
+def summary_record(table, record_type):
+    """
+    Latest/Oldest レコードを直接読み取る
+
+    Args:
+        table: 読み取り元のテーブル
+        record_type: latest または oldest
+
+    Returns:
+        レコード（存在しない場合はNone）
+    """
+    return table.get_item(Key={"userId": "user123", "measurementId": f"MEASUREMENT#{record_type}"}).get("Item")
+
+
+class TestSummaryRecordsAfterDeletion:
+    """測定記録削除後のLatest/Oldest レコードのテスト"""
+
+    def test_delete_latest_measurement(self, three_measurements):
+        """最新の記録を削除: Latestは中間の記録から再計算される"""
+        delete_body_measurement({"userId": "user123", "measurement_id": LATEST_TIME})
+
+        latest = summary_record(three_measurements, "latest")
+        assert latest["weight"] == Decimal("61.0")
+        assert latest["last_weight_update"] == MIDDLE_TIME
+        assert latest["height"] == Decimal("170.0")
+        assert "body_fat_percentage" not in latest
+
+        oldest = summary_record(three_measurements, "oldest")
+        assert oldest["weight"] == Decimal("60.0")
+        assert oldest["first_weight_record"] == OLDEST_TIME
+        assert "body_fat_percentage" not in oldest
+
+    def test_delete_oldest_measurement(self, three_measurements):
+        """最古の記録を削除: Oldestは中間の記録から再計算される"""
+        delete_body_measurement({"userId": "user123", "measurement_id": OLDEST_TIME})
+
+        oldest = summary_record(three_measurements, "oldest")
+        assert oldest["weight"] == Decimal("61.0")
+        assert oldest["first_weight_record"] == MIDDLE_TIME
+        assert oldest["body_fat_percentage"] == Decimal("20.0")
+        assert "height" not in oldest
+
+        latest = summary_record(three_measurements, "latest")
+        assert latest["weight"] == Decimal("62.0")
+        assert latest["last_weight_update"] == LATEST_TIME
+        assert "height" not in latest
+
+    def test_delete_middle_measurement_skips_recalculation(self, three_measurements):
+        """中間の記録を削除: Latest/Oldestに影響しないため再計算しない"""
+        latest_before = summary_record(three_measurements, "latest")
+        oldest_before = summary_record(three_measurements, "oldest")
+
+        with patch("body_measurement.handler.find_extreme_measurements") as find_extremes:
+            delete_body_measurement({"userId": "user123", "measurement_id": MIDDLE_TIME})
+
+        find_extremes.assert_not_called()
+        assert summary_record(three_measurements, "latest") == latest_before
+        assert summary_record(three_measurements, "oldest") == oldest_before
+
+    def test_delete_only_measurement_removes_summary_records(self, dynamodb_table):
+        """唯一の記録を削除: Latest/Oldest レコードも削除される"""
+        add_body_measurement({"userId": "user123", "weight": 60.0, "measurement_time": OLDEST_TIME})
+
+        delete_body_measurement({"userId": "user123", "measurement_id": OLDEST_TIME})
+
+        assert summary_record(dynamodb_table, "latest") is None
+        assert summary_record(dynamodb_table, "oldest") is None
+
+
+class TestSummaryRecordsAfterUpdate:
+    """測定記録更新後のLatest/Oldest レコードのテスト"""
+
+    def test_update_latest_measurement(self, three_measurements):
+        """最新の記録を更新: Latestに反映される"""
+        update_body_measurement({"userId": "user123", "measurement_id": LATEST_TIME, "weight": 70.0})
+
+        latest = summary_record(three_measurements, "latest")
+        assert latest["weight"] == Decimal("70.0")
+        assert latest["last_weight_update"] == LATEST_TIME
+        assert latest["body_fat_percentage"] == Decimal("20.0")
+
+        assert summary_record(three_measurements, "oldest")["weight"] == Decimal("60.0")
+
+    def test_update_oldest_measurement(self, three_measurements):
+        """最古の記録を更新: Oldestに反映され、Latestは変わらない"""
+        update_body_measurement({"userId": "user123", "measurement_id": OLDEST_TIME, "weight": 55.0})
+
+        oldest = summary_record(three_measurements, "oldest")
+        assert oldest["weight"] == Decimal("55.0")
+        assert oldest["first_weight_record"] == OLDEST_TIME
+        assert oldest["height"] == Decimal("170.0")
+
+        latest = summary_record(three_measurements, "latest")
+        assert latest["weight"] == Decimal("62.0")
+        assert latest["last_weight_update"] == LATEST_TIME
+
+    def test_update_middle_measurement_skips_recalculation(self, three_measurements):
+        """中間の記録を更新: Latest/Oldestに影響しないため再計算しない"""
+        latest_before = summary_record(three_measurements, "latest")
+        oldest_before = summary_record(three_measurements, "oldest")
+
+        with patch("body_measurement.handler.find_extreme_measurements") as find_extremes:
+            update_body_measurement({"userId": "user123", "measurement_id": MIDDLE_TIME, "weight": 65.0})
+
+        find_extremes.assert_not_called()
+        assert summary_record(three_measurements, "latest") == latest_before
+        assert summary_record(three_measurements, "oldest") == oldest_before
+
+    def test_recalculation_pages_past_records_without_the_type(self, dynamodb_table):
+        """対象タイプを含まない記録が1ページを超えて続く場合も、次のページから最新値を探す"""
+        add_body_measurement({"userId": "user123", "weight": 60.0, "height": 170.0, "measurement_time": OLDEST_TIME})
+        for hour in range(10, 22):
+            add_body_measurement({"userId": "user123", "weight": 61.0, "measurement_time": f"2025-01-02T{hour}:00:00+00:00"})
+
+        update_body_measurement({"userId": "user123", "measurement_id": OLDEST_TIME, "height": 171.0})
+
+        latest = summary_record(dynamodb_table, "latest")
+        assert latest["height"] == Decimal("171.0")
+        assert latest["last_height_update"] == OLDEST_TIME
+        assert latest["last_weight_update"] == "2025-01-02T21:00:00+00:00"
@@ -4,17 +4,18 @@ HealthGoalLambda関数のユニットテスト（MCP形式対応）
 
 import json
 import os
+import uuid
 import pytest
 from unittest.mock import Mock, patch
 from moto import mock_aws
 import boto3
 from botocore.exceptions import ClientError
 
-# Lambda関数をインポート
-import sys
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../lambda"))
+# Lambda関数をインポート（lambdaディレクトリはpytest.iniのpythonpathで追加される）
 
-from health_goal.handler import lambda_handler, add_goal, update_goal, delete_goal, get_goals
+from health_goal.handler import lambda_handler, add_goal, add_goals, update_goal, delete_goal, get_goals
+from health_goal.handler import _goals
+from shared.crud import BATCH_RETRY_MAX_ATTEMPTS, get_client
 
 
 @pytest.fixture
@@ -62,6 +63,9 @@ def dynamodb_table(aws_credentials):
         # 環境変数を設定
         os.environ['GOALS_TABLE_NAME'] = 'healthmate-goals'
         
+        # テスト間でコンテナ内キャッシュを共有しない
+        _goals.cache.clear()
+        
         yield table
 
 
@@ -146,6 +150,14 @@ class TestAddGoal:
         assert result["goal"]["priority"] == 1
         assert result["goal"]["status"] == "active"
 
+    def test_add_goal_id_is_uuid4(self, dynamodb_table):
+        """goalIdはUUID v4形式"""
+        result = add_goal({"userId": "user123", "goalType": "fitness"})
+
+        parsed = uuid.UUID(result["goalId"])
+        assert parsed.version == 4
+        assert str(parsed) == result["goalId"]
+
     def test_add_goal_missing_user_id(self, dynamodb_table):
         """userIdが欠落: エラー"""
         parameters = {
@@ -202,6 +214,95 @@ class TestAddGoal:
             add_goal(parameters)
 
 
+class TestAddGoals:
+    """add_goals関数のテスト"""
+
+    def test_add_goals_success(self, dynamodb_table):
+        """複数の目標を一括作成"""
+        parameters = {
+            "userId": "user123",
+            "goals": [
+                {"goalType": "fitness", "title": "アスリート体型になる", "priority": 1},
+                {"goalType": "weight", "title": "体重60kg", "targetValue": "60kg"}
+            ]
+        }
+
+        result = add_goals(parameters)
+
+        assert result["success"] is True
+        assert result["count"] == 2
+        assert len(result["goalIds"]) == 2
+
+        goals = get_goals({"userId": "user123"})
+        assert goals["count"] == 2
+
+    def test_add_goals_partial_write_reports_ids(self, dynamodb_table):
+        """再試行後も未処理の目標が残る場合: 保存済み・未保存の目標IDを返す"""
+        client = get_client()
+        real_batch_write_item = client.batch_write_item
+
+        def batch_write_first_only(RequestItems):
+            # 初回は先頭の目標のみ書き込み、残りは再送されても常に未処理として返す
+            (table_name, requests), = RequestItems.items()
+            if batch_write.call_count == 1:
+                real_batch_write_item(RequestItems={table_name: requests[:1]})
+                requests = requests[1:]
+            return {"UnprocessedItems": {table_name: requests}}
+
+        parameters = {
+            "userId": "user123",
+            "goals": [
+                {"goalType": "fitness", "title": "アスリート体型になる"},
+                {"goalType": "weight", "title": "体重60kg"}
+            ]
+        }
+
+        with patch.object(client, "batch_write_item", side_effect=batch_write_first_only) as batch_write, \
+                patch("shared.crud.time.sleep") as sleep:
+            result = add_goals(parameters)
+
+        assert result["success"] is False
+        assert result["errorType"] == "DatabaseError"
+        assert result["count"] == 1
+        assert len(result["goalIds"]) == 1
+        assert len(result["unprocessedGoalIds"]) == 1
+        # 最後の試行の後は待機しない
+        assert sleep.call_count == batch_write.call_count - 1 == BATCH_RETRY_MAX_ATTEMPTS - 1
+
+        goals = get_goals({"userId": "user123"})
+        assert [goal["goalId"] for goal in goals["goals"]] == result["goalIds"]
+
+    def test_add_goals_invalid_goal_writes_nothing(self, dynamodb_table):
+        """不正な目標を含む場合: エラーとなり何も保存されない"""
+        parameters = {
+            "userId": "user123",
+            "goals": [
+                {"goalType": "fitness", "title": "アスリート体型になる"},
+                {"goalType": "invalid_type", "title": "テスト目標"}
+            ]
+        }
+
+        with pytest.raises(ValueError, match="Goal at index 1"):
+            add_goals(parameters)
+
+        assert get_goals({"userId": "user123"})["count"] == 0
+
+    def test_add_goals_too_many(self, dynamodb_table):
+        """上限を超える件数: エラー"""
+        parameters = {
+            "userId": "user123",
+            "goals": [{"goalType": "fitness"} for _ in range(26)]
+        }
+
+        with pytest.raises(ValueError, match="at most 25"):
+            add_goals(parameters)
+
+    def test_add_goals_empty(self, dynamodb_table):
+        """空のリスト: エラー"""
+        with pytest.raises(ValueError, match="goals must be a non-empty list"):
+            add_goals({"userId": "user123", "goals": []})
+
+
 class TestUpdateGoal:
     """update_goal関数のテスト"""
 
@@ -229,6 +330,21 @@ class TestUpdateGoal:
         assert result["goal"]["title"] == "更新されたタイトル"
         assert result["goal"]["status"] == "paused"
 
+    def test_update_goal_without_returning_item(self, dynamodb_table):
+        """returnUpdated=false: 更新後の目標を返さない"""
+        goal_id = add_goal({"userId": "user123", "goalType": "fitness"})["goalId"]
+
+        result = update_goal({
+            "userId": "user123",
+            "goalId": goal_id,
+            "title": "更新されたタイトル",
+            "returnUpdated": False
+        })
+
+        assert result["success"] is True
+        assert "goal" not in result
+        assert get_goals({"userId": "user123"})["goals"][0]["title"] == "更新されたタイトル"
+
     def test_update_nonexistent_goal(self, dynamodb_table):
         """存在しない目標を更新: エラー"""
         parameters = {
@@ -266,15 +382,28 @@ class TestDeleteGoal:
         assert result["goalId"] == goal_id
 
     def test_delete_nonexistent_goal(self, dynamodb_table):
-        """存在しない目標を削除: エラー"""
+        """存在しない目標をstrictで削除: エラー"""
         parameters = {
             "userId": "user123",
-            "goalId": "nonexistent-goal-id"
+            "goalId": "nonexistent-goal-id",
+            "strict": True
         }
 
         with pytest.raises(ValueError, match="Goal not found"):
             delete_goal(parameters)
 
+    def test_delete_nonexistent_goal_non_strict(self, dynamodb_table):
+        """存在しない目標を削除（デフォルト）: 冪等に成功"""
+        parameters = {
+            "userId": "user123",
+            "goalId": "nonexistent-goal-id"
+        }
+
+        result = delete_goal(parameters)
+
+        assert result["success"] is True
+        assert result["deletedGoal"] is None
+
 
 class TestGetGoals:
     """get_goals関数のテスト"""
@@ -315,6 +444,123 @@ class TestGetGoals:
         assert result["count"] == 0
         assert len(result["goals"]) == 0
 
+    def test_get_goals_with_fields(self, dynamodb_table):
+        """fields指定: 指定属性とキー属性のみ取得"""
+        add_goal({
+            "userId": "user123",
+            "goalType": "fitness",
+            "title": "フィットネス目標",
+            "description": "詳細な説明"
+        })
+
+        parameters = {
+            "userId": "user123",
+            "fields": ["title", "status"]
+        }
+
+        result = get_goals(parameters)
+
+        assert result["success"] is True
+        assert result["count"] == 1
+        goal = result["goals"][0]
+        assert set(goal.keys()) == {"userId", "goalId", "title", "status"}
+        assert goal["status"] == "active"
+
+    def test_get_goals_invalid_fields(self, dynamodb_table):
+        """fieldsが不正: エラー"""
+        parameters = {
+            "userId": "user123",
+            "fields": "title"
+        }
+
+        with pytest.raises(ValueError, match="fields must be a non-empty array"):
+            get_goals(parameters)
+
+    def test_get_goals_with_limit_and_cursor(self, dynamodb_table):
+        """limit/cursor指定: ページ単位で全件取得"""
+        for goal_type in ["fitness", "weight", "longevity"]:
+            add_goal({
+                "userId": "user123",
+                "goalType": goal_type
+            })
+
+        first_page = get_goals({"userId": "user123", "limit": 2})
+
+        assert first_page["count"] == 2
+        assert "nextCursor" in first_page
+
+        second_page = get_goals({
+            "userId": "user123",
+            "limit": 2,
+            "cursor": first_page["nextCursor"]
+        })
+
+        assert second_page["count"] == 1
+        assert "nextCursor" not in second_page
+        goal_ids = {g["goalId"] for g in first_page["goals"] + second_page["goals"]}
+        assert len(goal_ids) == 3
+
+    def test_get_goals_invalid_limit(self, dynamodb_table):
+        """limitが範囲外: エラー"""
+        with pytest.raises(ValueError, match="limit must be an integer"):
+            get_goals({"userId": "user123", "limit": 0})
+
+    def test_get_goals_cursor_of_other_user(self, dynamodb_table):
+        """他ユーザーのカーソル: エラー"""
+        add_goal({"userId": "other", "goalType": "fitness"})
+        add_goal({"userId": "other", "goalType": "weight"})
+        other_page = get_goals({"userId": "other", "limit": 1})
+
+        with pytest.raises(ValueError, match="cursor is invalid"):
+            get_goals({"userId": "user123", "cursor": other_page["nextCursor"]})
+
+        with pytest.raises(ValueError, match="cursor is invalid"):
+            get_goals({"userId": "user123", "cursor": "not-a-cursor"})
+
+    def test_get_goals_uses_cache(self, dynamodb_table):
+        """freshness=recent: 2回目以降の取得はキャッシュから返す"""
+        add_goal({"userId": "user123", "goalType": "fitness"})
+        assert get_goals({"userId": "user123", "freshness": "recent"})["count"] == 1
+
+        # ハンドラーを経由しない書き込みはキャッシュに反映されない
+        dynamodb_table.put_item(Item={"userId": "user123", "goalId": "external"})
+
+        assert get_goals({"userId": "user123", "freshness": "recent"})["count"] == 1
+
+    def test_get_goals_default_reads_latest(self, dynamodb_table):
+        """freshness未指定: キャッシュを使わず他コンテナでの書き込みも取得する"""
+        add_goal({"userId": "user123", "goalType": "fitness"})
+        assert get_goals({"userId": "user123"})["count"] == 1
+
+        dynamodb_table.put_item(Item={"userId": "user123", "goalId": "external"})
+
+        assert get_goals({"userId": "user123"})["count"] == 2
+
+    def test_get_goals_freshness_now_bypasses_cache(self, dynamodb_table):
+        """freshness=now: キャッシュを使わずDynamoDBから取得"""
+        add_goal({"userId": "user123", "goalType": "fitness"})
+        assert get_goals({"userId": "user123"})["count"] == 1
+
+        dynamodb_table.put_item(Item={"userId": "user123", "goalId": "external"})
+
+        assert get_goals({"userId": "user123", "freshness": "any"})["count"] == 1
+        assert get_goals({"userId": "user123", "freshness": "now"})["count"] == 2
+
+    def test_get_goals_invalid_freshness(self, dynamodb_table):
+        """無効なfreshness: エラー"""
+        with pytest.raises(ValueError, match="freshness must be one of"):
+            get_goals({"userId": "user123", "freshness": "stale"})
+
+    def test_get_goals_cache_invalidated_on_write(self, dynamodb_table):
+        """書き込み後はキャッシュを破棄して再取得する"""
+        assert get_goals({"userId": "user123", "freshness": "recent"})["count"] == 0
+
+        result = add_goal({"userId": "user123", "goalType": "fitness"})
+        assert get_goals({"userId": "user123", "freshness": "recent"})["count"] == 1
+
+        delete_goal({"userId": "user123", "goalId": result["goalId"]})
+        assert get_goals({"userId": "user123", "freshness": "recent"})["count"] == 0
+
     def test_get_goals_missing_user_id(self, dynamodb_table):
         """userIdが欠落: エラー"""
         parameters = {}
@@ -10,11 +10,10 @@ from moto import mock_aws
 import boto3
 from botocore.exceptions import ClientError
 
-# Lambda関数をインポート
-import sys
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../lambda"))
+# Lambda関数をインポート（lambdaディレクトリはpytest.iniのpythonpathで追加される）
 
 from health_policy.handler import lambda_handler, add_policy, update_policy, delete_policy, get_policies
+from health_policy.handler import _policies
 
 
 @pytest.fixture
@@ -62,6 +61,9 @@ def dynamodb_table(aws_credentials):
         # 環境変数を設定
         os.environ['POLICIES_TABLE_NAME'] = 'healthmate-policies'
         
+        # テスト間でコンテナ内キャッシュを共有しない
+        _policies.cache.clear()
+        
         yield table
 
 
@@ -214,6 +216,16 @@ class TestAddPolicy:
         with pytest.raises(ValueError, match="policyType must be one of"):
             add_policy(parameters)
 
+    def test_add_policy_non_string_policy_type(self, dynamodb_table):
+        """文字列でないpolicyType: バリデーションエラー"""
+        parameters = {
+            "userId": "user123",
+            "policyType": 1
+        }
+
+        with pytest.raises(ValueError, match="policyType must be one of"):
+            add_policy(parameters)
+
 
 class TestUpdatePolicy:
     """update_policy関数のテスト"""
@@ -279,15 +291,28 @@ class TestDeletePolicy:
         assert result["policyId"] == policy_id
 
     def test_delete_nonexistent_policy(self, dynamodb_table):
-        """存在しないポリシーを削除: エラー"""
+        """存在しないポリシーをstrictで削除: エラー"""
         parameters = {
             "userId": "user123",
-            "policyId": "nonexistent-policy-id"
+            "policyId": "nonexistent-policy-id",
+            "strict": True
         }
 
         with pytest.raises(ValueError, match="Policy not found"):
             delete_policy(parameters)
 
+    def test_delete_nonexistent_policy_non_strict(self, dynamodb_table):
+        """存在しないポリシーを削除（デフォルト）: 冪等に成功"""
+        parameters = {
+            "userId": "user123",
+            "policyId": "nonexistent-policy-id"
+        }
+
+        result = delete_policy(parameters)
+
+        assert result["success"] is True
+        assert result["deletedPolicy"] is None
+
 
 class TestGetPolicies:
     """get_policies関数のテスト"""
@@ -328,6 +353,27 @@ class TestGetPolicies:
         assert result["count"] == 0
         assert len(result["policies"]) == 0
 
+    def test_get_policies_with_fields(self, dynamodb_table):
+        """fields指定: 指定属性とキー属性のみ取得"""
+        add_policy({
+            "userId": "user123",
+            "policyType": "fasting",
+            "title": "ファスティングポリシー",
+            "rules": {"fastingHours": 16}
+        })
+
+        parameters = {
+            "userId": "user123",
+            "fields": ["title", "isActive"]
+        }
+
+        result = get_policies(parameters)
+
+        assert result["success"] is True
+        assert result["count"] == 1
+        policy = result["policies"][0]
+        assert set(policy.keys()) == {"userId", "policyId", "title", "isActive"}
+
     def test_get_policies_missing_user_id(self, dynamodb_table):
         """userIdが欠落: エラー"""
         parameters = {}
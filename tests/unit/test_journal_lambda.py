@@ -0,0 +1,264 @@
+"""
+JournalLambda関数のユニットテスト（MCP形式対応）
+"""
+
+import os
+from datetime import date, timedelta
+import pytest
+from unittest.mock import patch
+from moto import mock_aws
+import boto3
+
+# Lambda関数をインポート（lambdaディレクトリはpytest.iniのpythonpathで追加される）
+
+import journal.handler as handler
+from journal.handler import add_journal, get_journals_in_range, table_name
+from shared.crud import BATCH_RETRY_MAX_ATTEMPTS
+
+
+@pytest.fixture(scope="module")
+def aws_credentials():
+    """Mocked AWS Credentials for moto."""
+    os.environ['AWS_ACCESS_KEY_ID'] = 'testing'
+    os.environ['AWS_SECRET_ACCESS_KEY'] = 'testing'
+    os.environ['AWS_SECURITY_TOKEN'] = 'testing'
+    os.environ['AWS_SESSION_TOKEN'] = 'testing'
+    os.environ['AWS_DEFAULT_REGION'] = 'us-west-2'
+
+
+@pytest.fixture(scope="module")
+def journals_table(aws_credentials):
+    """
+    DynamoDBテーブルのモック（モジュール内の全テストで共有）
+
+    テーブル作成はモジュールごとに1回だけ行い、ハンドラーのクライアントを差し替える。
+    """
+    with mock_aws(), pytest.MonkeyPatch.context() as mp:
+        dynamodb = boto3.resource('dynamodb', region_name='us-west-2')
+
+        # テーブル作成
+        table = dynamodb.create_table(
+            TableName=table_name,
+            KeySchema=[
+                {
+                    'AttributeName': 'userId',
+                    'KeyType': 'HASH'
+                },
+                {
+                    'AttributeName': 'date',
+                    'KeyType': 'RANGE'
+                }
+            ],
+            AttributeDefinitions=[
+                {
+                    'AttributeName': 'userId',
+                    'AttributeType': 'S'
+                },
+                {
+                    'AttributeName': 'date',
+                    'AttributeType': 'S'
+                }
+            ],
+            BillingMode='PAY_PER_REQUEST'
+        )
+
+        # インポート時に作成されたクライアントをモック環境のクライアントに差し替える
+        mp.setattr("journal.handler.ddb", boto3.client('dynamodb', region_name='us-west-2'))
+
+        yield table
+
+
+@pytest.fixture
+def dynamodb_table(journals_table):
+    """テストごとのDynamoDBテーブル（テスト終了時に書き込んだアイテムを削除して分離する）"""
+    yield journals_table
+
+    keys = journals_table.scan(
+        ProjectionExpression="userId, #date",
+        ExpressionAttributeNames={"#date": "date"},
+    )["Items"]
+    with journals_table.batch_writer() as batch:
+        for key in keys:
+            batch.delete_item(Key=key)
+
+
+def seed_journals(table, user_id, dates):
+    """
+    複数日分の日記をBatchWriteItemでまとめて投入する
+
+    Args:
+        table: 投入先のテーブル
+        user_id: ユーザーID
+        dates: 日記を1件ずつ記録する日付（YYYY-MM-DD）のリスト
+    """
+    with table.batch_writer() as batch:
+        for date_str in dates:
+            batch.put_item(Item={
+                "userId": user_id,
+                "date": date_str,
+                "content": f"{date_str}の日記",
+                "moodScore": 3,
+                "tags": [],
+                "createdAt": f"{date_str}T21:00:00+00:00",
+                "updatedAt": f"{date_str}T21:00:00+00:00"
+            })
+
+
+def stored_journal(table, user_id, date_str):
+    """
+    テーブルに保存されている指定日の日記を直接読み取る
+
+    Args:
+        table: 読み取り元のテーブル
+        user_id: ユーザーID
+        date_str: 日付（YYYY-MM-DD）
+
+    Returns:
+        保存されているアイテム（存在しない場合はNone）
+    """
+    return table.get_item(Key={"userId": user_id, "date": date_str}).get("Item")
+
+
+class TestAddJournal:
+    """add_journal関数のテスト"""
+
+    def test_add_journal_creates_entry(self, dynamodb_table):
+        """日記作成: 正常系"""
+        result = add_journal({
+            "userId": "user123",
+            "date": "2024-01-02",
+            "content": "朝のランニング",
+            "moodScore": 4,
+            "tags": ["Exercise"]
+        })
+
+        assert result["success"] is True
+        assert result["message"] == "日記を作成しました"
+        assert result["journal"]["content"] == "朝のランニング"
+        assert result["journal"]["moodScore"] == 4
+        assert result["journal"]["createdAt"] == result["journal"]["updatedAt"]
+
+        item = stored_journal(dynamodb_table, "user123", "2024-01-02")
+        assert item["content"] == "朝のランニング"
+        assert item["tags"] == ["Exercise"]
+
+    def test_add_journal_appends_to_existing_entry(self, dynamodb_table):
+        """既存の日記に追記: コンテンツを連結し、作成日時・気分スコア・タグを保持"""
+        seed_journals(dynamodb_table, "user123", ["2024-01-02"])
+        dynamodb_table.update_item(
+            Key={"userId": "user123", "date": "2024-01-02"},
+            UpdateExpression="SET tags = :tags",
+            ExpressionAttributeValues={":tags": ["Happy"]}
+        )
+
+        result = add_journal({
+            "userId": "user123",
+            "date": "2024-01-02",
+            "content": "夜の散歩"
+        })
+
+        assert result["success"] is True
+        assert result["message"] == "日記を追記しました"
+        assert result["journal"]["content"] == "2024-01-02の日記\n\n夜の散歩"
+        assert result["journal"]["createdAt"] == "2024-01-02T21:00:00+00:00"
+        assert result["journal"]["moodScore"] == 3
+        assert result["journal"]["tags"] == ["Happy"]
+
+        item = stored_journal(dynamodb_table, "user123", "2024-01-02")
+        assert item["content"] == "2024-01-02の日記\n\n夜の散歩"
+        assert item["createdAt"] == "2024-01-02T21:00:00+00:00"
+        assert item["updatedAt"] != item["createdAt"]
+        assert item["moodScore"] == 3
+        assert item["tags"] == ["Happy"]
+
+
+class TestGetJournalsInRange:
+    """get_journals_in_range関数（startDate/endDate指定）のテスト"""
+
+    def test_long_range_split_in_order_without_duplicates(self, dynamodb_table):
+        """100日を超える範囲: 部分範囲に分割して取得し、時系列順・重複なしで返す"""
+        start = date(2024, 1, 1)
+        end = date(2024, 6, 30)
+        # 部分範囲の境界をまたぐよう、範囲全体に3日おきに日記を記録する
+        dates = [(start + timedelta(days=offset)).isoformat() for offset in range(0, (end - start).days + 1, 3)]
+        dates.append(end.isoformat())
+        seed_journals(dynamodb_table, "user123", dates)
+        seed_journals(dynamodb_table, "user123", ["2023-12-31", "2024-07-01"])
+
+        result = get_journals_in_range({
+            "userId": "user123",
+            "startDate": start.isoformat(),
+            "endDate": end.isoformat()
+        })
+
+        assert result["success"] is True
+        assert result["dateRange"]["days"] == 182
+        assert [journal["date"] for journal in result["journals"]] == dates
+        assert result["count"] == len(dates)
+
+
+class TestGetJournalsByDates:
+    """get_journals_in_range関数（dates指定）のテスト"""
+
+    def test_dates_deduplicated_and_sorted(self, dynamodb_table):
+        """重複した日付は1件にまとめ、日付順に返す"""
+        seed_journals(dynamodb_table, "user123", ["2024-01-02", "2024-02-01", "2024-03-05"])
+
+        result = get_journals_in_range({
+            "userId": "user123",
+            "dates": ["2024-03-05", "2024-01-02", "2024-01-03", "2024-01-02"]
+        })
+
+        assert result["success"] is True
+        assert [journal["date"] for journal in result["journals"]] == ["2024-01-02", "2024-03-05"]
+        assert result["count"] == 2
+        assert result["journals"][0]["moodScore"] == 3
+        assert result["dateRange"] == {"startDate": "2024-01-02", "endDate": "2024-03-05", "days": 64}
+
+    def test_dates_too_many(self, dynamodb_table):
+        """上限を超える件数: エラー"""
+        with pytest.raises(ValueError, match="at most 100"):
+            get_journals_in_range({"userId": "user123", "dates": ["2024-01-01"] * 101})
+
+    @pytest.mark.parametrize("dates", [[], "2024-01-01"])
+    def test_dates_not_a_list(self, dynamodb_table, dates):
+        """空または配列でないdates: エラー"""
+        with pytest.raises(ValueError, match="dates must be a non-empty list"):
+            get_journals_in_range({"userId": "user123", "dates": dates})
+
+    def test_unprocessed_keys_retried(self, dynamodb_table):
+        """未処理キーは再取得し、すべての日記を返す"""
+        dates = ["2024-01-01", "2024-01-02", "2024-01-03"]
+        seed_journals(dynamodb_table, "user123", dates)
+
+        real_batch_get_item = handler.ddb.batch_get_item
+
+        def batch_get_first_only(RequestItems):
+            # 初回は先頭のキーのみ取得し、残りを未処理として返す
+            if batch_get.call_count > 1:
+                return real_batch_get_item(RequestItems=RequestItems)
+            request = RequestItems[table_name]
+            response = real_batch_get_item(RequestItems={table_name: {**request, "Keys": request["Keys"][:1]}})
+            response["UnprocessedKeys"] = {table_name: {**request, "Keys": request["Keys"][1:]}}
+            return response
+
+        with patch.object(handler.ddb, "batch_get_item", side_effect=batch_get_first_only) as batch_get, \
+                patch("shared.crud.time.sleep") as sleep:
+            result = get_journals_in_range({"userId": "user123", "dates": dates})
+
+        assert batch_get.call_count == 2
+        assert sleep.call_count == 1
+        assert [journal["date"] for journal in result["journals"]] == dates
+
+    def test_unprocessed_keys_remaining(self, dynamodb_table):
+        """再試行後も未処理キーが残る場合: エラー（最後の試行の後は待機しない）"""
+        def batch_get_nothing(RequestItems):
+            return {"Responses": {table_name: []}, "UnprocessedKeys": RequestItems}
+
+        with patch.object(handler.ddb, "batch_get_item", side_effect=batch_get_nothing) as batch_get, \
+                patch("shared.crud.time.sleep") as sleep:
+            with pytest.raises(RuntimeError, match="1 journals could not be read"):
+                get_journals_in_range({"userId": "user123", "dates": ["2024-01-01"]})
+
+        assert batch_get.call_count == BATCH_RETRY_MAX_ATTEMPTS
+        assert sleep.call_count == BATCH_RETRY_MAX_ATTEMPTS - 1
@@ -4,20 +4,21 @@ UserLambda関数のユニットテスト（MCP形式対応）
 
 import json
 import os
+from functools import lru_cache
+from types import SimpleNamespace
 import pytest
 from unittest.mock import Mock, patch
 from moto import mock_aws
 import boto3
 from botocore.exceptions import ClientError
 
-# Lambda関数をインポート
-import sys
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../lambda"))
+# Lambda関数をインポート（lambdaディレクトリはpytest.iniのpythonpathで追加される）
 
+import user.handler as handler
 from user.handler import lambda_handler, add_user, update_user, get_user
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def aws_credentials():
     """Mocked AWS Credentials for moto."""
     os.environ['AWS_ACCESS_KEY_ID'] = 'testing'
@@ -27,10 +28,14 @@ def aws_credentials():
     os.environ['AWS_DEFAULT_REGION'] = 'us-west-2'
 
 
-@pytest.fixture
-def dynamodb_table(aws_credentials):
-    """DynamoDBテーブルのモック"""
-    with mock_aws():
+@pytest.fixture(scope="module")
+def users_table(aws_credentials):
+    """
+    DynamoDBテーブルのモック（モジュール内の全テストで共有）
+
+    テーブル作成はモジュールごとに1回だけ行い、ハンドラーのクライアントを差し替える。
+    """
+    with mock_aws(), pytest.MonkeyPatch.context() as mp:
         dynamodb = boto3.resource('dynamodb', region_name='us-west-2')
         
         # テーブル作成
@@ -52,11 +57,41 @@ def dynamodb_table(aws_credentials):
         )
         
         # 環境変数を設定
-        os.environ['USERS_TABLE_NAME'] = 'healthmate-users'
+        mp.setenv('USERS_TABLE_NAME', 'healthmate-users')
+        
+        # インポート時に作成されたクライアントをモック環境のクライアントに差し替える
+        mp.setattr("user.handler.ddb", boto3.client('dynamodb', region_name='us-west-2'))
         
         yield table
 
 
+@pytest.fixture
+def dynamodb_table(users_table):
+    """テストごとのDynamoDBテーブル（テスト終了時に書き込んだアイテムとキャッシュを削除して分離する）"""
+    yield users_table
+
+    keys = users_table.scan(ProjectionExpression="userId")["Items"]
+    with users_table.batch_writer() as batch:
+        for key in keys:
+            batch.delete_item(Key=key)
+    handler._user_cache.clear()
+
+
+@lru_cache(maxsize=None)
+def tool_context(tool_name):
+    """
+    AgentCore Gatewayから渡されるLambda実行コンテキストを作成する（ツール名ごとに1回だけ構築）
+
+    Args:
+        tool_name: MCPツール名（例: AddUser）
+
+    Returns:
+        client_context.customにゲートウェイのツール名を持つコンテキスト
+    """
+    custom = {"bedrockAgentCoreToolName": f"UserManagement___{tool_name}"}
+    return SimpleNamespace(client_context=SimpleNamespace(custom=custom))
+
+
 class TestUserLambdaHandler:
     """lambda_handler関数のテスト"""
 
@@ -68,7 +103,7 @@ class TestUserLambdaHandler:
             "email": "taro@example.com"
         }
 
-        result = lambda_handler(event, None)
+        result = lambda_handler(event, tool_context("AddUser"))
 
         assert result["success"] is True
         assert result["userId"] == "user123"
@@ -82,7 +117,7 @@ class TestUserLambdaHandler:
             "username": "太郎",
             "email": "taro@example.com"
         }
-        lambda_handler(add_event, None)
+        lambda_handler(add_event, tool_context("AddUser"))
 
         # 更新
         update_event = {
@@ -90,11 +125,12 @@ class TestUserLambdaHandler:
             "username": "太郎2"
         }
 
-        result = lambda_handler(update_event, None)
+        result = lambda_handler(update_event, tool_context("UpdateUser"))
 
         assert result["success"] is True
         assert result["userId"] == "user123"
-        assert "ユーザー情報をupdatedしました" in result["message"]
+        assert result["message"] == "ユーザー情報を更新しました"
+        assert result["user"]["username"] == "太郎2"
 
     def test_get_user_success(self, dynamodb_table):
         """getUser: 正常系"""
@@ -104,14 +140,14 @@ class TestUserLambdaHandler:
             "username": "太郎",
             "email": "taro@example.com"
         }
-        lambda_handler(add_event, None)
+        lambda_handler(add_event, tool_context("AddUser"))
 
         # 取得
         get_event = {
             "userId": "user123"
         }
 
-        result = lambda_handler(get_event, None)
+        result = lambda_handler(get_event, tool_context("GetUser"))
 
         assert result["success"] is True
         assert result["user"]["userId"] == "user123"
@@ -124,7 +160,7 @@ class TestUserLambdaHandler:
             "email": "taro@example.com"
         }
 
-        result = lambda_handler(event, None)
+        result = lambda_handler(event, tool_context("AddUser"))
 
         assert result["success"] is False
         assert result["errorType"] == "ValidationError"
@@ -169,6 +205,28 @@ class TestAddUser:
         with pytest.raises(ValueError, match="username is required"):
             add_user(parameters)
 
+    def test_add_user_again_replaces_existing_user(self, dynamodb_table):
+        """既存ユーザーを再登録: createdAtを保持し、指定されなかった生年月日は削除する"""
+        created = add_user({
+            "userId": "user123",
+            "username": "太郎",
+            "dateOfBirth": "1990-01-01"
+        })
+
+        result = add_user({
+            "userId": "user123",
+            "username": "太郎2"
+        })
+
+        assert result["message"] == "ユーザー情報をupdatedしました"
+        assert result["user"]["createdAt"] == created["user"]["createdAt"]
+        assert "dateOfBirth" not in result["user"]
+
+        item = dynamodb_table.get_item(Key={"userId": "user123"})["Item"]
+        assert item["username"] == "太郎2"
+        assert item["createdAt"] == created["user"]["createdAt"]
+        assert "dateOfBirth" not in item
+
     def test_add_user_without_email(self, dynamodb_table):
         """emailなし: 正常系（emailはオプション）"""
         parameters = {
@@ -289,4 +347,36 @@ class TestGetUser:
         parameters = {}
 
         with pytest.raises(ValueError, match="userId is required"):
-            get_user(parameters)
\ No newline at end of file
+            get_user(parameters)
+
+    def test_get_user_served_from_cache(self, dynamodb_table):
+        """TTL以内の再取得: DynamoDBを呼び出さずキャッシュから返す"""
+        add_user({"userId": "user123", "username": "太郎"})
+        get_user({"userId": "user123"})
+
+        with patch.object(handler.ddb, "get_item") as get_item:
+            result = get_user({"userId": "user123"})
+
+        get_item.assert_not_called()
+        assert result["user"]["username"] == "太郎"
+
+    def test_get_user_cache_invalidated_on_write(self, dynamodb_table):
+        """更新後の取得: キャッシュを破棄して更新後の値を返す"""
+        add_user({"userId": "user123", "username": "太郎"})
+        get_user({"userId": "user123"})
+
+        update_user({"userId": "user123", "username": "太郎2"})
+
+        assert get_user({"userId": "user123"})["user"]["username"] == "太郎2"
+
+    def test_get_user_cache_expires(self, dynamodb_table):
+        """TTLを過ぎたキャッシュは使わない"""
+        add_user({"userId": "user123", "username": "太郎"})
+        get_user({"userId": "user123"})
+
+        with patch.object(handler, "USER_CACHE_TTL_SECONDS", 0), \
+                patch.object(handler.ddb, "get_item", wraps=handler.ddb.get_item) as get_item:
+            result = get_user({"userId": "user123"})
+
+        get_item.assert_called_once()
+        assert result["user"]["username"] == "太郎"